@@ -10,6 +10,8 @@ from app.models.movie import Movie
 from app.models.director import Director
 from app.models.genre import Genre
 from app.models.rating import MovieRating
+from app.models.ranking import MovieRanking, GenreRanking, LeaderboardState
+from app.models.rollup import RatingRollup
 
 # this is the Alembic Config object
 config = context.config
@@ -58,8 +60,8 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    configuration = config.get_section(config.config_ini_section)
-    configuration["sqlalchemy.url"] = "postgresql://app_user:app_pass@db:5432/app_db"
+    configuration = config.get_section(config.config_ini_section, {})
+    configuration["sqlalchemy.url"] = environ.get('DATABASE_URL', 'postgresql://app_user:app_pass@db:5432/app_db')
 
     connectable = engine_from_config(
         configuration,
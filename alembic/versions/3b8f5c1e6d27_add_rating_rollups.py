@@ -0,0 +1,76 @@
+"""add_rating_rollups
+
+Revision ID: 3b8f5c1e6d27
+Revises: e7b4d2a9c813
+Create Date: 2026-10-18 13:05:31.772946
+
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8f5c1e6d27'
+down_revision: Union[str, None] = 'e7b4d2a9c813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'movie_rating_rollups',
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('granularity', sa.String(length=4), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('ratings_count', sa.Integer(), nullable=False),
+        sa.Column('ratings_sum', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('movie_id', 'granularity', 'bucket_start')
+    )
+    op.create_index(
+        'ix_movie_rating_rollups_window', 'movie_rating_rollups',
+        ['granularity', 'bucket_start', 'movie_id']
+    )
+
+    # Backfill recent ratings the way the live writer and the retention job leave them:
+    # hourly buckets from the start of the day the hourly retention reaches back to
+    # (so short trending windows stay hour-granular), daily buckets before that
+    hourly_hours = int(os.getenv('RATING_ROLLUP_HOURLY_RETENTION_HOURS', '168'))
+    daily_days = int(os.getenv('RATING_ROLLUP_DAILY_RETENTION_DAYS', '90'))
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # created_at holds naive UTC timestamps
+        now = "timezone('utc', now())"
+        hour, day = "date_trunc('hour', created_at)", "date_trunc('day', created_at)"
+        hourly_from = f"date_trunc('day', {now} - interval '{hourly_hours} hours')"
+        daily_from = f"date_trunc('day', {now} - interval '{daily_days} days')"
+    elif dialect == 'sqlite':
+        # Same text format SQLAlchemy stores DateTime in, so bucket keys match
+        hour = "strftime('%Y-%m-%d %H:00:00.000000', created_at)"
+        day = "strftime('%Y-%m-%d 00:00:00.000000', created_at)"
+        hourly_from = f"strftime('%Y-%m-%d 00:00:00.000000', 'now', '-{hourly_hours} hours')"
+        daily_from = f"strftime('%Y-%m-%d 00:00:00.000000', 'now', '-{daily_days} days')"
+    else:
+        # No portable date truncation; trending then starts from new ratings
+        return
+    for granularity, bucket, window in (
+        ('hour', hour, f"created_at >= {hourly_from}"),
+        ('day', day, f"created_at >= {daily_from} AND created_at < {hourly_from}"),
+    ):
+        op.execute(
+            f"""
+            INSERT INTO movie_rating_rollups (movie_id, granularity, bucket_start, ratings_count, ratings_sum)
+            SELECT movie_id, '{granularity}', {bucket}, COUNT(id), SUM(score)
+            FROM movie_ratings
+            WHERE {window}
+            GROUP BY movie_id, {bucket}
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_movie_rating_rollups_window', table_name='movie_rating_rollups')
+    op.drop_table('movie_rating_rollups')
@@ -0,0 +1,43 @@
+"""add_rating_aggregates_to_movies
+
+Revision ID: 5f1c2d8e9a40
+Revises: 2ac0c55ab98a
+Create Date: 2026-10-18 09:12:44.105231
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1c2d8e9a40'
+down_revision: Union[str, None] = '2ac0c55ab98a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('movies', sa.Column('ratings_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('movies', sa.Column('ratings_sum', sa.BigInteger(), nullable=False, server_default='0'))
+
+    # Backfill from existing ratings
+    op.execute(
+        """
+        UPDATE movies
+        SET ratings_count = stats.ratings_count,
+            ratings_sum = stats.ratings_sum
+        FROM (
+            SELECT movie_id, COUNT(id) AS ratings_count, COALESCE(SUM(score), 0) AS ratings_sum
+            FROM movie_ratings
+            GROUP BY movie_id
+        ) AS stats
+        WHERE movies.id = stats.movie_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('movies', 'ratings_sum')
+    op.drop_column('movies', 'ratings_count')
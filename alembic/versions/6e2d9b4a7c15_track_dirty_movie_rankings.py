@@ -0,0 +1,44 @@
+"""track_dirty_movie_rankings
+
+Revision ID: 6e2d9b4a7c15
+Revises: 9a6c3f0d5b18
+Create Date: 2026-10-18 16:41:08.274519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2d9b4a7c15'
+down_revision: Union[str, None] = '9a6c3f0d5b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'movies',
+        sa.Column('ranking_dirty', sa.Boolean(), server_default=sa.false(), nullable=False)
+    )
+    op.create_index(
+        'ix_movies_ranking_dirty', 'movies', ['id'],
+        postgresql_where=sa.text('ranking_dirty'), sqlite_where=sa.text('ranking_dirty')
+    )
+
+    # Rankings are now refreshed from the dirty flags instead of a rating id watermark
+    with op.batch_alter_table('leaderboard_state') as batch_op:
+        batch_op.drop_column('last_rating_id')
+    # Force a full rebuild on the next refresh
+    op.execute("UPDATE leaderboard_state SET global_mean = NULL")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('leaderboard_state') as batch_op:
+        batch_op.add_column(sa.Column('last_rating_id', sa.Integer(), server_default='0', nullable=False))
+    op.execute("UPDATE leaderboard_state SET global_mean = NULL")
+
+    op.drop_index('ix_movies_ranking_dirty', table_name='movies')
+    op.drop_column('movies', 'ranking_dirty')
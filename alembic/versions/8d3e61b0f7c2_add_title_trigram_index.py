@@ -0,0 +1,39 @@
+"""add_title_trigram_index
+
+Revision ID: 8d3e61b0f7c2
+Revises: 5f1c2d8e9a40
+Create Date: 2026-10-18 10:03:27.582913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3e61b0f7c2'
+down_revision: Union[str, None] = '5f1c2d8e9a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # pg_trgm GIN index lets ILIKE '%term%' on title use an index scan.
+    # Other backends run the same ILIKE as a scan.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_movies_title_trgm',
+        'movies',
+        ['title'],
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'}
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_movies_title_trgm', table_name='movies')
@@ -0,0 +1,28 @@
+"""add_director_and_genre_lookup_indexes
+
+Revision ID: 9a6c3f0d5b18
+Revises: 3b8f5c1e6d27
+Create Date: 2026-10-18 14:02:17.591604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a6c3f0d5b18'
+down_revision: Union[str, None] = '3b8f5c1e6d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_movies_director_id', 'movies', ['director_id'])
+    op.create_index('ix_movie_genres_genre_id', 'movie_genres', ['genre_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_movie_genres_genre_id', table_name='movie_genres')
+    op.drop_index('ix_movies_director_id', table_name='movies')
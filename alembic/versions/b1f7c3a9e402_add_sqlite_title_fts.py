@@ -0,0 +1,53 @@
+"""add_sqlite_title_fts
+
+Revision ID: b1f7c3a9e402
+Revises: 6e2d9b4a7c15
+Create Date: 2026-10-18 18:12:44.906131
+
+"""
+import sqlite3
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1f7c3a9e402'
+down_revision: Union[str, None] = '6e2d9b4a7c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SQLite counterpart of ix_movies_title_trgm: an FTS5 trigram table (SQLite 3.34+)
+    # plus the triggers that keep it current, then indexed from the existing rows
+    if op.get_bind().dialect.name != 'sqlite' or sqlite3.sqlite_version_info < (3, 34, 0):
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE movies_title_fts "
+        "USING fts5(title, content='movies', content_rowid='id', tokenize='trigram')"
+    )
+    op.execute(
+        "CREATE TRIGGER movies_title_fts_ai AFTER INSERT ON movies BEGIN "
+        "INSERT INTO movies_title_fts (rowid, title) VALUES (new.id, new.title); END"
+    )
+    op.execute(
+        "CREATE TRIGGER movies_title_fts_ad AFTER DELETE ON movies BEGIN "
+        "INSERT INTO movies_title_fts (movies_title_fts, rowid, title) VALUES ('delete', old.id, old.title); END"
+    )
+    op.execute(
+        "CREATE TRIGGER movies_title_fts_au AFTER UPDATE OF title ON movies BEGIN "
+        "INSERT INTO movies_title_fts (movies_title_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+        "INSERT INTO movies_title_fts (rowid, title) VALUES (new.id, new.title); END"
+    )
+    op.execute("INSERT INTO movies_title_fts (movies_title_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TRIGGER IF EXISTS movies_title_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS movies_title_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS movies_title_fts_ai")
+    op.execute("DROP TABLE IF EXISTS movies_title_fts")
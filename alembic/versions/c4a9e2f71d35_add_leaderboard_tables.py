@@ -0,0 +1,73 @@
+"""add_leaderboard_tables
+
+Revision ID: c4a9e2f71d35
+Revises: 8d3e61b0f7c2
+Create Date: 2026-10-18 11:41:09.264718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a9e2f71d35'
+down_revision: Union[str, None] = '8d3e61b0f7c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'movie_rankings',
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('release_year', sa.Integer(), nullable=False),
+        sa.Column('bayesian_score', sa.Float(), nullable=False),
+        sa.Column('average_rating', sa.Float(), nullable=False),
+        sa.Column('ratings_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('movie_id')
+    )
+    op.create_index(
+        'ix_movie_rankings_score', 'movie_rankings',
+        [sa.text('bayesian_score DESC'), 'movie_id'],
+        postgresql_include=['average_rating', 'ratings_count', 'release_year']
+    )
+    op.create_index(
+        'ix_movie_rankings_year_score', 'movie_rankings',
+        ['release_year', sa.text('bayesian_score DESC'), 'movie_id'],
+        postgresql_include=['average_rating', 'ratings_count']
+    )
+
+    op.create_table(
+        'movie_genre_rankings',
+        sa.Column('genre_id', sa.Integer(), nullable=False),
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('bayesian_score', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['genre_id'], ['genres.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('genre_id', 'movie_id')
+    )
+    op.create_index(
+        'ix_movie_genre_rankings_score', 'movie_genre_rankings',
+        ['genre_id', sa.text('bayesian_score DESC'), 'movie_id']
+    )
+
+    op.create_table(
+        'leaderboard_state',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('last_rating_id', sa.Integer(), nullable=False),
+        sa.Column('global_mean', sa.Float(), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('leaderboard_state')
+    op.drop_index('ix_movie_genre_rankings_score', table_name='movie_genre_rankings')
+    op.drop_table('movie_genre_rankings')
+    op.drop_index('ix_movie_rankings_year_score', table_name='movie_rankings')
+    op.drop_index('ix_movie_rankings_score', table_name='movie_rankings')
+    op.drop_table('movie_rankings')
@@ -0,0 +1,49 @@
+"""add_rating_histogram_to_movies
+
+Revision ID: e7b4d2a9c813
+Revises: c4a9e2f71d35
+Create Date: 2026-10-18 12:27:53.480117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b4d2a9c813'
+down_revision: Union[str, None] = 'c4a9e2f71d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SCORES = range(1, 11)
+
+
+def upgrade() -> None:
+    for score in SCORES:
+        op.add_column('movies', sa.Column(f'rating_hist_{score}', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from existing ratings
+    assignments = ",\n            ".join(f"rating_hist_{s} = stats.hist_{s}" for s in SCORES)
+    buckets = ",\n                   ".join(
+        f"SUM(CASE WHEN score = {s} THEN 1 ELSE 0 END) AS hist_{s}" for s in SCORES
+    )
+    op.execute(
+        f"""
+        UPDATE movies
+        SET {assignments}
+        FROM (
+            SELECT movie_id,
+                   {buckets}
+            FROM movie_ratings
+            GROUP BY movie_id
+        ) AS stats
+        WHERE movies.id = stats.movie_id
+        """
+    )
+
+
+def downgrade() -> None:
+    for score in reversed(SCORES):
+        op.drop_column('movies', f'rating_hist_{score}')
@@ -0,0 +1,18 @@
+"""
+Cache - caches for hot read paths (in-process or shared between workers)
+"""
+
+from app.cache.backend import CacheBackend
+from app.cache.lru_cache import TTLCache
+from app.cache.shared_cache import SharedCache
+from app.cache.caches import CACHES, make_cache, movie_detail_cache, movie_count_cache
+
+__all__ = [
+    "CacheBackend",
+    "TTLCache",
+    "SharedCache",
+    "CACHES",
+    "make_cache",
+    "movie_detail_cache",
+    "movie_count_cache"
+]
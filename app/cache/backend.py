@@ -0,0 +1,58 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+
+class CacheBackend(ABC):
+    """
+    Cache for hot read paths (see TTLCache and SharedCache).
+
+    Every invalidation bumps a generation counter; get_or_set only stores a
+    freshly loaded value if no invalidation happened while it was loading, so
+    a slow reader cannot put back data that a concurrent write just replaced.
+
+    With read replicas, a read right after a write can still see the old
+    rows. Backends given a `hold` therefore refuse to re-fill an invalidated
+    key (or, after clear(), any key) for that many seconds.
+    """
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value, or None on a miss or expired entry"""
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        """Store a value; skipped if `generation` is given and no longer current"""
+
+    @abstractmethod
+    def generation(self) -> int:
+        """Current invalidation generation"""
+
+    @abstractmethod
+    def invalidate_many(self, keys: Iterable[Hashable]):
+        """Drop the given keys everywhere the cache is visible"""
+
+    @abstractmethod
+    def clear(self):
+        """Drop every entry"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """hits / misses / evictions counters and size"""
+
+    async def aget(self, key: Hashable) -> Optional[Any]:
+        """get() for async handlers; backends that do I/O override it to stay off the event loop"""
+        return self.get(key)
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value or load, store and return it"""
+        value = self.get(key)
+        if value is not None:
+            return value
+        generation = self.generation()
+        value = loader()
+        if value is not None:
+            self.set(key, value, generation=generation)
+        return value
+
+    def invalidate(self, key: Hashable):
+        self.invalidate_many((key,))
@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+from app.cache.backend import CacheBackend
+from app.cache.lru_cache import TTLCache
+from app.cache.shared_cache import SharedCache
+from app.db.replicas import DATABASE_REPLICA_URLS, DB_REPLICA_MAX_LAG
+
+MOVIE_CACHE_SIZE = int(os.getenv("MOVIE_CACHE_SIZE", "10000"))
+MOVIE_CACHE_TTL = float(os.getenv("MOVIE_CACHE_TTL", "60"))
+MOVIE_COUNT_CACHE_TTL = float(os.getenv("MOVIE_COUNT_CACHE_TTL", "30"))
+
+# local: per-process LRU; shared: one store for every worker on the host
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local").lower()
+CACHE_PATH = os.getenv(
+    "CACHE_PATH",
+    os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(), "movie_rating_cache.sqlite3")
+)
+# Replica reads may lag: invalidated keys are not re-filled until replicas have caught up
+CACHE_INVALIDATION_HOLD = DB_REPLICA_MAX_LAG if DATABASE_REPLICA_URLS else 0.0
+
+
+def make_cache(namespace: str, maxsize: int, ttl: float) -> CacheBackend:
+    """Cache of the configured CACHE_BACKEND"""
+    if CACHE_BACKEND == "shared":
+        return SharedCache(namespace, maxsize=maxsize, ttl=ttl, path=CACHE_PATH, hold=CACHE_INVALIDATION_HOLD)
+    if CACHE_BACKEND != "local":
+        raise ValueError(f"Invalid CACHE_BACKEND: {CACHE_BACKEND} (expected local or shared)")
+    return TTLCache(maxsize=maxsize, ttl=ttl, hold=CACHE_INVALIDATION_HOLD)
+
+
+# Movie detail documents and their versions ({"data", "version"}) keyed by movie id
+movie_detail_cache = make_cache("movie_detail", maxsize=MOVIE_CACHE_SIZE, ttl=MOVIE_CACHE_TTL)
+
+# Exact listing totals keyed by (title, release_year, genre)
+movie_count_cache = make_cache("movie_count", maxsize=1024, ttl=MOVIE_COUNT_CACHE_TTL)
+
+CACHES = {
+    "movie_detail": movie_detail_cache,
+    "movie_count": movie_count_cache,
+}
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+from app.cache.backend import CacheBackend
+
+# Placeholder left by an invalidation while the key is held
+_HELD = object()
+
+
+class TTLCache(CacheBackend):
+    """
+    Bounded, thread-safe LRU cache whose entries also expire after `ttl` seconds.
+    Lives in the process: with several workers each one has its own copy.
+    Invalidated keys are not re-filled for `hold` seconds (see CacheBackend).
+    """
+
+    def __init__(self, maxsize: int, ttl: float, hold: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hold = hold
+        self._held_until = 0.0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._stats["misses"] += 1
+                return None
+            if value is _HELD:
+                self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            now = time.monotonic()
+            if now < self._held_until:
+                return
+            entry = self._data.get(key)
+            if entry is not None and entry[0] is _HELD and entry[1] > now:
+                return
+            self._data[key] = (value, now + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def invalidate_many(self, keys: Iterable[Hashable]):
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self.hold:
+                    self._data[key] = (_HELD, time.monotonic() + self.hold)
+                else:
+                    self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+            self._held_until = time.monotonic() + self.hold
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._stats, size=len(self._data), maxsize=self.maxsize)
@@ -0,0 +1,248 @@
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.cache.backend import CacheBackend
+
+logger = logging.getLogger("movie_rating")
+
+# Keys per DELETE statement when invalidating many entries
+INVALIDATE_BATCH_SIZE = 500
+
+# Bumped when the tables change; a file with another version is rebuilt (it only holds cached data)
+SCHEMA_VERSION = 2
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value BLOB,
+        stored_at REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        PRIMARY KEY (namespace, key)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_cache_entries_stored ON cache_entries (namespace, stored_at)",
+    """
+    CREATE TABLE IF NOT EXISTS cache_generations (
+        namespace TEXT PRIMARY KEY,
+        generation INTEGER NOT NULL,
+        held_until REAL NOT NULL DEFAULT 0
+    )
+    """,
+)
+
+
+class SharedCache(CacheBackend):
+    """
+    Cache shared by every worker process on the host, kept in a SQLite file
+    (on /dev/shm when available, so it lives in shared memory).
+
+    All workers read and write the same entries, so an invalidation made by
+    one worker is seen by all of them at once; the generation counter that
+    guards get_or_set is shared too. Entries are evicted oldest first once
+    `maxsize` is exceeded (reads stay read-only, so workers do not contend on
+    the write lock for hits). hits / misses / evictions are counted per process.
+    With a `hold`, invalidated keys stay as NULL rows that block re-filling
+    until they expire.
+
+    Values are pickled: the file must only be writable by the app's user.
+    Cache errors are logged and treated as misses; writes never fail because of them.
+    """
+
+    def __init__(self, namespace: str, maxsize: int, ttl: float, path: str, hold: float = 0.0):
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hold = hold
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread and process (connections must not cross a fork)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Cached data can always be reloaded; no need to wait for the disk
+            conn.execute("PRAGMA synchronous=OFF")
+            self._ensure_schema(conn)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _ensure_schema(conn: sqlite3.Connection):
+        if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another worker may have rebuilt it while we waited for the lock
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS cache_entries")
+                conn.execute("DROP TABLE IF EXISTS cache_generations")
+                for statement in _SCHEMA:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _count(self, counter: str, n: int = 1):
+        with self._lock:
+            self._stats[counter] += n
+
+    @staticmethod
+    def _key(key: Hashable) -> str:
+        # Keys are ids or tuples of plain values, whose repr is stable
+        return repr(key)
+
+    def _current_generation(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute(
+            "SELECT generation FROM cache_generations WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _bump_generation(self, conn: sqlite3.Connection, held_until: float = 0.0):
+        conn.execute(
+            "INSERT INTO cache_generations (namespace, generation, held_until) VALUES (?, 1, ?) "
+            "ON CONFLICT (namespace) DO UPDATE SET generation = generation + 1, "
+            "held_until = MAX(held_until, excluded.held_until)",
+            (self.namespace, held_until)
+        )
+
+    def _held(self, conn: sqlite3.Connection, key: str, now: float) -> bool:
+        """Whether an invalidation still blocks re-filling `key`"""
+        return conn.execute(
+            "SELECT 1 FROM cache_generations WHERE namespace = ? AND held_until > ? "
+            "UNION ALL SELECT 1 FROM cache_entries "
+            "WHERE namespace = ? AND key = ? AND value IS NULL AND expires_at > ?",
+            (self.namespace, now, self.namespace, key, now)
+        ).fetchone() is not None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, self._key(key))
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache read failed ({self.namespace}): {e}")
+            row = None
+        if row is None or row[0] is None or row[1] <= time.time():
+            self._count("misses")
+            return None
+        self._count("hits")
+        return pickle.loads(row[0])
+
+    async def aget(self, key: Hashable) -> Optional[Any]:
+        # A file read that can wait on the write lock (up to the busy timeout): keep it off the event loop
+        return await run_in_threadpool(self.get, key)
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        now = time.time()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if generation is not None and generation != self._current_generation(conn):
+                    conn.execute("ROLLBACK")
+                    return
+                if self.hold and self._held(conn, self._key(key), now):
+                    conn.execute("ROLLBACK")
+                    return
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, value, stored_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.namespace, self._key(key), blob, now, now + self.ttl)
+                )
+                evicted = self._evict(conn)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache write failed ({self.namespace}): {e}")
+            return
+        if evicted:
+            self._count("evictions", evicted)
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        """Delete the oldest entries beyond maxsize; returns how many"""
+        size = conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        excess = size - self.maxsize
+        if excess <= 0:
+            return 0
+        return conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+            "SELECT key FROM cache_entries WHERE namespace = ? ORDER BY stored_at LIMIT ?)",
+            (self.namespace, self.namespace, excess)
+        ).rowcount
+
+    def generation(self) -> int:
+        try:
+            return self._current_generation(self._connection())
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache read failed ({self.namespace}): {e}")
+            # Never matches a real generation, so the loaded value is not stored
+            return -1
+
+    def invalidate_many(self, keys: Iterable[Hashable]):
+        self._invalidate([self._key(key) for key in keys])
+
+    def clear(self):
+        self._invalidate(None)
+
+    def _invalidate(self, keys: Optional[List[str]]):
+        """Drop `keys` (None: everything) and bump the generation, atomically"""
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                held_until = time.time() + self.hold if self.hold else 0.0
+                if keys is None:
+                    conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+                elif self.hold:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO cache_entries (namespace, key, value, stored_at, expires_at) "
+                        "VALUES (?, ?, NULL, ?, ?)",
+                        [(self.namespace, key, held_until, held_until) for key in keys]
+                    )
+                else:
+                    for i in range(0, len(keys), INVALIDATE_BATCH_SIZE):
+                        batch = keys[i:i + INVALIDATE_BATCH_SIZE]
+                        conn.execute(
+                            f"DELETE FROM cache_entries WHERE namespace = ? AND key IN ({', '.join('?' * len(batch))})",
+                            (self.namespace, *batch)
+                        )
+                self._bump_generation(conn, held_until if keys is None else 0.0)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            # Entries then expire with their TTL
+            logger.error(f"Shared cache invalidation failed ({self.namespace}): {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        try:
+            size = self._connection().execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+        except sqlite3.Error:
+            size = None
+        with self._lock:
+            return dict(self._stats, size=size, maxsize=self.maxsize)
@@ -5,9 +5,13 @@ Controllers - API Route handlers
 from app.controllers.director_controller import router as director_router
 from app.controllers.genre_controller import router as genre_router
 from app.controllers.movie_controller import router as movie_router
+from app.controllers.rating_controller import router as rating_router
+from app.controllers.internal_controller import router as internal_router
 
 __all__ = [
     "director_router",
     "genre_router",
-    "movie_router"
+    "movie_router",
+    "rating_router",
+    "internal_router"
 ]
@@ -1,114 +1,134 @@
-﻿from typing import Dict, Any
-from fastapi import APIRouter, Depends, Query, status
+﻿from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, status
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.controllers.responses import not_modified, success
+from app.db.database import DbSession, get_session, run_db
+from app.db.replicas import get_read_session
 from app.services.director_service import DirectorService
+from app.schemas.response.base_schema import PaginatedResponse, SuccessResponse
+from app.schemas.response.director_schema import DirectorDetailResponse, DirectorListItem, DirectorResponse, DirectorUpdatedResponse
 from app.schemas.request.director_schema import DirectorCreateRequest, DirectorUpdateRequest
 from app.exceptions.custom_exceptions import NotFoundError
 
 router = APIRouter(prefix="/api/v1/directors", tags=["directors"])
 
 
-def success(data: Any) -> Dict[str, Any]:
-    """Success response"""
-    return {"status": "success", "data": data}
-
-
-@router.get("", response_model=Dict[str, Any])
+@router.get("", response_model=SuccessResponse[PaginatedResponse[DirectorListItem]])
 async def list_directors(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous next_cursor"),
+    include_stats: bool = Query(False, description="Add movies_count and average_rating to each item"),
+    db: DbSession = Depends(get_read_session),
 ):
-    """List directors with pagination"""
-    service = DirectorService(db)
+    """List directors with pagination (page/page_size or keyset cursor)"""
     skip = (page - 1) * page_size
 
-    directors = service.get_all_directors(skip=skip, limit=page_size)
-    total = service.get_total_count()
-
-    items = [
-        {
-            "id": d.id,
-            "name": d.name,
-            "birth_year": d.birth_year,
-            "description": d.description,
-        }
-        for d in directors
-    ]
+    def load(session: Session):
+        service = DirectorService(session)
+        directors, next_cursor = service.get_directors_page(skip=skip, limit=page_size, cursor=cursor)
+        total = service.get_total_count()
+
+        items = [
+            {
+                "id": d.id,
+                "name": d.name,
+                "birth_year": d.birth_year,
+                "description": d.description,
+            }
+            for d in directors
+        ]
+        if include_stats:
+            # One grouped query for the whole page
+            stats = service.get_movie_stats([item["id"] for item in items])
+            for item in items:
+                item.update(stats[item["id"]])
+        return items, total, next_cursor
+
+    items, total, next_cursor = await run_db(db, load)
 
     return success({
-        "page": page,
+        "page": page if cursor is None else None,
         "page_size": page_size,
         "total_items": total,
         "items": items,
+        "next_cursor": next_cursor,
     })
 
 
-@router.get("/{director_id}", response_model=Dict[str, Any])
-async def get_director(director_id: int, db: Session = Depends(get_db)):
-    """Director details"""
-    service = DirectorService(db)
-    director = service.get_director(director_id)
+@router.get("/{director_id}", response_model=SuccessResponse[DirectorDetailResponse])
+async def get_director(director_id: int, request: Request, db: DbSession = Depends(get_read_session)):
+    """Director details (ETag / If-None-Match revalidation costs one query)"""
+    def load(session: Session):
+        service = DirectorService(session)
+        version = service.get_director_version(director_id)
+        if not_modified(request, version):
+            return version, None
+        director = service.get_director(director_id)
+        stats = service.get_movie_stats([director_id])[director_id]
+        return version, {
+            "id": director.id,
+            "name": director.name,
+            "birth_year": director.birth_year,
+            "description": director.description,
+            "movies_count": stats["movies_count"],
+            "average_rating": stats["average_rating"],
+        }
 
-    return success({
-        "id": director.id,
-        "name": director.name,
-        "birth_year": director.birth_year,
-        "description": director.description,
-        "movies_count": len(director.movies),
-    })
+    version, data = await run_db(db, load)
+    return not_modified(request, version) or success(data, version=version)
 
 
-@router.post("", status_code=status.HTTP_201_CREATED, response_model=Dict[str, Any])
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=SuccessResponse[DirectorResponse])
 async def create_director(
     body: DirectorCreateRequest,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
 ):
     """Add a new director"""
-    service = DirectorService(db)
-    director = service.create_director(
-        name=body.name,
-        birth_year=body.birth_year,
-        description=body.description,
-    )
+    def create(session: Session):
+        director = DirectorService(session).create_director(
+            name=body.name,
+            birth_year=body.birth_year,
+            description=body.description,
+        )
+        return {
+            "id": director.id,
+            "name": director.name,
+            "birth_year": director.birth_year,
+            "description": director.description,
+        }
 
-    return success({
-        "id": director.id,
-        "name": director.name,
-        "birth_year": director.birth_year,
-        "description": director.description,
-    })
+    return success(await run_db(db, create), status.HTTP_201_CREATED)
 
 
-@router.put("/{director_id}", response_model=Dict[str, Any])
+@router.put("/{director_id}", response_model=SuccessResponse[DirectorUpdatedResponse])
 async def update_director(
     director_id: int,
     body: DirectorUpdateRequest,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
 ):
     """Update a director"""
-    service = DirectorService(db)
-    director = service.update_director(
-        director_id=director_id,
-        name=body.name,
-        birth_year=body.birth_year,
-        description=body.description,
-    )
+    def update(session: Session):
+        director = DirectorService(session).update_director(
+            director_id=director_id,
+            name=body.name,
+            birth_year=body.birth_year,
+            description=body.description,
+        )
+        return {
+            "id": director.id,
+            "name": director.name,
+            "birth_year": director.birth_year,
+            "description": director.description,
+            "updated_at": director.updated_at.isoformat() if director.updated_at else None,
+        }
 
-    return success({
-        "id": director.id,
-        "name": director.name,
-        "birth_year": director.birth_year,
-        "description": director.description,
-        "updated_at": director.updated_at.isoformat() if director.updated_at else None,
-    })
+    return success(await run_db(db, update))
 
 
 @router.delete("/{director_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_director(director_id: int, db: Session = Depends(get_db)):
+async def delete_director(director_id: int, db: DbSession = Depends(get_session)):
     """Delete a director and all their movies"""
-    service = DirectorService(db)
-    service.delete_director(director_id)
+    await run_db(db, lambda session: DirectorService(session).delete_director(director_id))
     return None
@@ -1,106 +1,126 @@
-from typing import Dict, Any
-from fastapi import APIRouter, Depends, Query, status
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Request, status
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.controllers.responses import not_modified, success
+from app.db.database import DbSession, get_session, run_db
+from app.db.replicas import get_read_session
 from app.services.genre_service import GenreService
+from app.schemas.response.base_schema import PaginatedResponse, SuccessResponse
+from app.schemas.response.genre_schema import GenreDetailResponse, GenreListItem, GenreResponse
 from app.schemas.request.genre_schema import GenreCreateRequest, GenreUpdateRequest
 
 router = APIRouter(prefix="/api/v1/genres", tags=["genres"])
 
 
-def success(data: Any) -> Dict[str, Any]:
-    """Success response"""
-    return {"status": "success", "data": data}
-
-
-@router.get("", response_model=Dict[str, Any])
+@router.get("", response_model=SuccessResponse[PaginatedResponse[GenreListItem]])
 async def list_genres(
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous next_cursor"),
+    include_stats: bool = Query(False, description="Add movies_count and average_rating to each item"),
+    db: DbSession = Depends(get_read_session),
 ):
-    """List genres with pagination"""
-    service = GenreService(db)
+    """List genres with pagination (page/page_size or keyset cursor)"""
     skip = (page - 1) * page_size
 
-    genres = service.get_all_genres(skip=skip, limit=page_size)
-    total = service.get_total_count()
-
-    items = [
-        {
-            "id": g.id,
-            "name": g.name,
-            "description": g.description,
-        }
-        for g in genres
-    ]
+    def load(session: Session):
+        service = GenreService(session)
+        genres, next_cursor = service.get_genres_page(skip=skip, limit=page_size, cursor=cursor)
+        total = service.get_total_count()
+
+        items = [
+            {
+                "id": g.id,
+                "name": g.name,
+                "description": g.description,
+            }
+            for g in genres
+        ]
+        if include_stats:
+            # One grouped query for the whole page
+            stats = service.get_movie_stats([item["id"] for item in items])
+            for item in items:
+                item.update(stats[item["id"]])
+        return items, total, next_cursor
+
+    items, total, next_cursor = await run_db(db, load)
 
     return success({
-        "page": page,
+        "page": page if cursor is None else None,
         "page_size": page_size,
         "total_items": total,
         "items": items,
+        "next_cursor": next_cursor,
     })
 
 
-@router.get("/{genre_id}", response_model=Dict[str, Any])
-async def get_genre(genre_id: int, db: Session = Depends(get_db)):
-    """Genre details"""
-    service = GenreService(db)
-    genre = service.get_genre(genre_id)
+@router.get("/{genre_id}", response_model=SuccessResponse[GenreDetailResponse])
+async def get_genre(genre_id: int, request: Request, db: DbSession = Depends(get_read_session)):
+    """Genre details (ETag / If-None-Match revalidation costs one query)"""
+    def load(session: Session):
+        service = GenreService(session)
+        version = service.get_genre_version(genre_id)
+        if not_modified(request, version):
+            return version, None
+        genre = service.get_genre(genre_id)
+        stats = service.get_movie_stats([genre_id])[genre_id]
+        return version, {
+            "id": genre.id,
+            "name": genre.name,
+            "description": genre.description,
+            "movies_count": stats["movies_count"],
+            "average_rating": stats["average_rating"],
+        }
 
-    return success({
-        "id": genre.id,
-        "name": genre.name,
-        "description": genre.description,
-        "movies_count": len(genre.movies),
-    })
+    version, data = await run_db(db, load)
+    return not_modified(request, version) or success(data, version=version)
 
 
-@router.post("", status_code=status.HTTP_201_CREATED, response_model=Dict[str, Any])
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=SuccessResponse[GenreResponse])
 async def create_genre(
     body: GenreCreateRequest,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
 ):
     """Add a new genre"""
-    service = GenreService(db)
-    genre = service.create_genre(
-        name=body.name,
-        description=body.description,
-    )
+    def create(session: Session):
+        genre = GenreService(session).create_genre(
+            name=body.name,
+            description=body.description,
+        )
+        return {
+            "id": genre.id,
+            "name": genre.name,
+            "description": genre.description,
+        }
 
-    return success({
-        "id": genre.id,
-        "name": genre.name,
-        "description": genre.description,
-    })
+    return success(await run_db(db, create), status.HTTP_201_CREATED)
 
 
-@router.put("/{genre_id}", response_model=Dict[str, Any])
+@router.put("/{genre_id}", response_model=SuccessResponse[GenreResponse])
 async def update_genre(
     genre_id: int,
     body: GenreUpdateRequest,
-    db: Session = Depends(get_db),
+    db: DbSession = Depends(get_session),
 ):
     """Update a genre"""
-    service = GenreService(db)
-    genre = service.update_genre(
-        genre_id=genre_id,
-        name=body.name,
-        description=body.description,
-    )
+    def update(session: Session):
+        genre = GenreService(session).update_genre(
+            genre_id=genre_id,
+            name=body.name,
+            description=body.description,
+        )
+        return {
+            "id": genre.id,
+            "name": genre.name,
+            "description": genre.description,
+        }
 
-    return success({
-        "id": genre.id,
-        "name": genre.name,
-        "description": genre.description,
-    })
+    return success(await run_db(db, update))
 
 
 @router.delete("/{genre_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_genre(genre_id: int, db: Session = Depends(get_db)):
+async def delete_genre(genre_id: int, db: DbSession = Depends(get_session)):
     """Delete a genre"""
-    service = GenreService(db)
-    service.delete_genre(genre_id)
+    await run_db(db, lambda session: GenreService(session).delete_genre(genre_id))
     return None
@@ -0,0 +1,80 @@
+import os
+import secrets
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, Header
+
+from app.cache.caches import CACHE_BACKEND, CACHES
+from app.controllers.responses import success
+from app.db.database import (
+    DATABASE_ASYNC,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    pool_metrics,
+    async_pool_metrics,
+)
+from app.db.replicas import DB_REPLICA_EJECT_SECONDS, DB_REPLICA_MAX_LAG, replica_router
+from app.exceptions.custom_exceptions import NotFoundError, UnauthorizedError
+
+# Shared secret for the /internal routes (X-Internal-Token header); unset disables them
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN", "")
+
+
+def require_internal_token(x_internal_token: Optional[str] = Header(None)):
+    """Only callers presenting INTERNAL_API_TOKEN reach the operational endpoints"""
+    if not INTERNAL_API_TOKEN:
+        raise NotFoundError()
+    if x_internal_token is None or not secrets.compare_digest(x_internal_token, INTERNAL_API_TOKEN):
+        raise UnauthorizedError("Invalid or missing internal token")
+
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_token)]
+)
+
+
+@router.get("/db/pool", response_model=Dict[str, Any])
+async def get_pool_metrics():
+    """Connection pool settings, checkout wait times and saturation"""
+    pools = [pool_metrics.snapshot()]
+    if DATABASE_ASYNC:
+        pools.append(async_pool_metrics.snapshot())
+    pools.extend(replica_router.pools())
+
+    return success({
+        "settings": {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+        },
+        "pools": pools,
+    })
+
+
+@router.get("/db/replicas", response_model=Dict[str, Any])
+async def get_replica_health():
+    """Read replicas: health, ejections and reads routed to each"""
+    return success(dict(
+        replica_router.snapshot(),
+        settings={
+            "eject_seconds": DB_REPLICA_EJECT_SECONDS,
+            "max_lag_seconds": DB_REPLICA_MAX_LAG,
+        },
+    ))
+
+
+@router.get("/cache", response_model=Dict[str, Any])
+async def get_cache_stats():
+    """Hit / miss / eviction counters of this worker's caches"""
+    return success({
+        "backend": CACHE_BACKEND,
+        "pid": os.getpid(),
+        "caches": {name: cache.stats() for name, cache in CACHES.items()},
+    })
@@ -1,10 +1,29 @@
 import logging
-from typing import Optional
+from typing import Optional, Union
 from fastapi import APIRouter, Depends, Query, HTTPException, status, Body, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.db.database import get_db
+from app.controllers.responses import not_modified, success
+from app.db.database import DbSession, get_session, run_db
+from app.db.replicas import get_read_session, open_read_session
 from app.services.movie_service import MovieService
-from app.schemas.request.movie_schema import MovieCreateRequest, MovieUpdateRequest
+from app.services.rating_buffer import rating_buffer
+from app.services.leaderboard_service import LeaderboardService
+from app.services.trending_service import TrendingService
+from app.services.export_service import EXPORT_BATCH_SIZE, EXPORT_MEDIA_TYPES, ExportService
+from app.cache.caches import movie_detail_cache
+from app.schemas.response.base_schema import SuccessResponse
+from app.schemas.response.movie_schema import (
+    MovieDetailResponse,
+    MoviePaginatedResponse,
+    MovieResponse,
+    MovieUpdatedResponse,
+    RatingHistogramResponse,
+    TopMoviesResponse,
+    TrendingMoviesResponse,
+)
+from app.schemas.response.rating_schema import RatingQueuedResponse, RatingResponse
+from app.schemas.request.movie_schema import MovieCreateRequest, MovieUpdateRequest, MovieBatchCreateRequest
 from app.exceptions.custom_exceptions import NotFoundError, ValidationError
 
 router = APIRouter(prefix="/api/v1", tags=["movies"])
@@ -12,7 +31,7 @@ router = APIRouter(prefix="/api/v1", tags=["movies"])
 logger = logging.getLogger("movie_rating")
 
 
-@router.get("/movies", response_model=dict)
+@router.get("/movies", response_model=SuccessResponse[MoviePaginatedResponse])
 async def get_movies(
         request: Request,
         page: int = Query(1, ge=1),
@@ -20,7 +39,9 @@ async def get_movies(
         title: Optional[str] = Query(None),
         release_year: Optional[int] = Query(None),
         genre: Optional[str] = Query(None),
-        db: Session = Depends(get_db)
+        cursor: Optional[str] = Query(None),
+        include_total: bool = Query(True),
+        db: DbSession = Depends(get_read_session)
 ):
     """
     Get list of movies with filtering and pagination
@@ -31,24 +52,25 @@ async def get_movies(
     - title: Search by title
     - release_year: Filter by release year (example: 2008)
     - genre: Filter by genre
+    - cursor: Opaque `next_cursor` from a previous response (keyset paging; overrides page)
+    - include_total: Set to false to skip counting; total_items is then null
     """
 
     logger.info(f"Fetching movies list (page={page}, size={page_size}, query_params={request.query_params})")
 
-    try:
-        service = MovieService(db)
-
-        movies, total_items = service.get_all_movies(
+    def load(session: Session):
+        movies, total_items, total_is_estimate, next_cursor = MovieService(session).get_all_movies(
             page=page,
             page_size=page_size,
             title=title,
             release_year=release_year,
-            genre=genre
+            genre=genre,
+            cursor=cursor,
+            include_total=include_total
         )
 
-        items = []
-        for movie in movies:
-            item = {
+        items = [
+            {
                 "id": movie.id,
                 "title": movie.title,
                 "release_year": movie.release_year,
@@ -58,27 +80,26 @@ async def get_movies(
                 } if movie.director else None,
                 "genres": [genre.name for genre in movie.genres],
                 "cast": movie.cast,
-                "average_rating": None,
-                "ratings_count": 0
+                "average_rating": movie.get_average_rating(),
+                "ratings_count": movie.get_ratings_count()
             }
+            for movie in movies
+        ]
+        return items, total_items, total_is_estimate, next_cursor
 
-            stats = service.get_movie_stats(movie.id)
-            item["average_rating"] = stats["average_rating"]
-            item["ratings_count"] = stats["ratings_count"]
-
-            items.append(item)
+    try:
+        items, total_items, total_is_estimate, next_cursor = await run_db(db, load)
 
         logger.info(f"Movies fetched successfully (count={len(items)}, total={total_items})")
 
-        return {
-            "status": "success",
-            "data": {
-                "page": page,
-                "page_size": page_size,
-                "total_items": total_items,
-                "items": items
-            }
-        }
+        return success({
+            "page": page if cursor is None else None,
+            "page_size": page_size,
+            "total_items": total_items,
+            "total_is_estimate": total_is_estimate,
+            "items": items,
+            "next_cursor": next_cursor
+        })
 
     except ValidationError as e:
         logger.error(f"Validation Error, Failed to fetch movies: {str(e)}", exc_info=True)
@@ -94,33 +115,156 @@ async def get_movies(
         )
 
 
-@router.get("/movies/{movie_id}", response_model=dict)
-async def get_movie(movie_id: int, db: Session = Depends(get_db)):
-    """Get details of a specific movie"""
+@router.get("/movies/top", response_model=SuccessResponse[TopMoviesResponse])
+async def get_top_movies(
+        limit: int = Query(10, ge=1, le=100),
+        genre_id: Optional[int] = Query(None, ge=1),
+        release_year: Optional[int] = Query(None),
+        db: DbSession = Depends(get_read_session)
+):
+    """
+    Top-rated movies by Bayesian average, from the precomputed ranking tables
+    (refreshed in the background every LEADERBOARD_REFRESH_INTERVAL seconds)
+
+    Query Parameters:
+    - limit: Number of movies (default: 10, maximum: 100)
+    - genre_id: Only movies of this genre
+    - release_year: Only movies released in this year
+    """
+    def load(session: Session):
+        return LeaderboardService(session).get_top_movies(
+            limit=limit,
+            genre_id=genre_id,
+            release_year=release_year
+        )
+
     try:
-        service = MovieService(db)
-        movie = service.get_movie_by_id(movie_id)
+        return success({
+            "items": await run_db(db, load)
+        })
 
-        stats = service.get_movie_stats(movie_id)
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Failed to fetch top movies: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error: {str(e)}"
+        )
+
+
+@router.get("/movies/trending", response_model=SuccessResponse[TrendingMoviesResponse])
+async def get_trending_movies(
+        window: str = Query("24h", description="1h, 24h, 7d or 30d"),
+        limit: int = Query(10, ge=1, le=100),
+        db: DbSession = Depends(get_read_session)
+):
+    """
+    Movies with the most ratings in a recent window, from the rating rollups
+
+    Query Parameters:
+    - window: 1h, 24h, 7d or 30d (default: 24h)
+    - limit: Number of movies (default: 10, maximum: 100)
+    """
+    def load(session: Session):
+        return TrendingService(session).get_trending(window=window, limit=limit)
+
+    try:
+        return success({
+            "window": window,
+            "items": await run_db(db, load)
+        })
+
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Failed to fetch trending movies: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error: {str(e)}"
+        )
 
-        return {
-            "status": "success",
-            "data": {
-                "id": movie.id,
-                "title": movie.title,
-                "release_year": movie.release_year,
-                "director": {
-                    "id": movie.director.id,
-                    "name": movie.director.name,
-                    "birth_year": movie.director.birth_year,
-                    "description": movie.director.description
-                } if movie.director else None,
-                "genres": [genre.name for genre in movie.genres],
-                "cast": movie.cast,
-                "average_rating": stats["average_rating"],
-                "ratings_count": stats["ratings_count"]
-            }
-        }
+
+@router.get("/movies/export", response_class=StreamingResponse)
+async def export_movies(
+        request: Request,
+        format: str = Query("ndjson", description="ndjson or csv"),
+        title: Optional[str] = Query(None),
+        release_year: Optional[int] = Query(None),
+        genre: Optional[str] = Query(None),
+        batch_size: int = Query(EXPORT_BATCH_SIZE, ge=1, le=10000)
+):
+    """
+    Stream every movie (or those matching the listing filters) with director,
+    genres and rating aggregates, as NDJSON or CSV
+
+    Rows are read through a server-side cursor and sent as a chunked
+    response, one chunk per batch, so memory stays flat for any catalog size.
+    """
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid format: {format} (expected ndjson or csv)"
+        )
+
+    logger.info(f"Exporting movies (format={format}, query_params={request.query_params})")
+
+    # The stream outlives this handler, so it owns its session
+    db = open_read_session(request)
+    service = ExportService(db)
+
+    def chunks():
+        try:
+            yield from service.export(
+                format,
+                title=title,
+                release_year=release_year,
+                genre=genre,
+                batch_size=batch_size
+            )
+            logger.info(f"Export finished (format={format}, movies={service.exported})")
+        except Exception as e:
+            logger.error(f"Export failed after {service.exported} movies: {str(e)}", exc_info=True)
+            raise
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        chunks(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="movies.{format}"'}
+    )
+
+
+@router.get("/movies/{movie_id}", response_model=SuccessResponse[MovieDetailResponse])
+async def get_movie(movie_id: int, request: Request, db: DbSession = Depends(get_read_session)):
+    """
+    Get details of a specific movie
+
+    Responses carry ETag and Last-Modified; a request whose If-None-Match
+    matches gets 304 after a single version lookup.
+    """
+    def load(session: Session):
+        service = MovieService(session)
+        version = service.get_movie_version(movie_id)
+        if not_modified(request, version):
+            return {"version": version, "data": None}
+        return service.get_movie_detail(movie_id)
+
+    try:
+        # Cache hits are answered without touching the session (the shared
+        # backend reads its file in the threadpool, never on the event loop)
+        entry = await movie_detail_cache.aget(movie_id)
+        if entry is None:
+            entry = await run_db(db, load)
+
+        return not_modified(request, entry["version"]) or success(entry["data"], version=entry["version"])
 
     except NotFoundError as e:
         raise HTTPException(
@@ -134,14 +278,14 @@ async def get_movie(movie_id: int, db: Session = Depends(get_db)):
         )
 
 
-@router.post("/movies", response_model=dict, status_code=status.HTTP_201_CREATED)
+@router.post("/movies", response_model=SuccessResponse[MovieResponse], status_code=status.HTTP_201_CREATED)
 async def create_movie(
         movie_data: MovieCreateRequest = Body(...),
-        db: Session = Depends(get_db)
+        db: DbSession = Depends(get_session)
 ):
     """Create a new movie"""
-    try:
-        service = MovieService(db)
+    def create(session: Session):
+        service = MovieService(session)
 
         movie = service.create_movie(
             title=movie_data.title,
@@ -154,22 +298,22 @@ async def create_movie(
         stats = service.get_movie_stats(movie.id)
 
         return {
-            "status": "success",
-            "data": {
-                "id": movie.id,
-                "title": movie.title,
-                "release_year": movie.release_year,
-                "director": {
-                    "id": movie.director.id,
-                    "name": movie.director.name
-                } if movie.director else None,
-                "cast": movie.cast,
-                "genres": [g.name for g in movie.genres],
-                "average_rating": stats["average_rating"],
-                "ratings_count": stats["ratings_count"]
-            }
+            "id": movie.id,
+            "title": movie.title,
+            "release_year": movie.release_year,
+            "director": {
+                "id": movie.director.id,
+                "name": movie.director.name
+            } if movie.director else None,
+            "cast": movie.cast,
+            "genres": [g.name for g in movie.genres],
+            "average_rating": stats["average_rating"],
+            "ratings_count": stats["ratings_count"]
         }
 
+    try:
+        return success(await run_db(db, create), status.HTTP_201_CREATED)
+
     except ValidationError as e:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -182,15 +326,44 @@ async def create_movie(
         )
 
 
-@router.put("/movies/{movie_id}", response_model=dict)
+@router.post("/movies/batch", response_model=dict, status_code=status.HTTP_201_CREATED)
+async def create_movies_batch(
+        body: MovieBatchCreateRequest = Body(...),
+        db: DbSession = Depends(get_session)
+):
+    """
+    Create many movies in one request (catalog imports)
+
+    Each item is validated against MovieCreateRequest; directors and genres
+    are checked with one set-based query each and valid movies are inserted
+    in a single transaction. Invalid items are reported by index.
+    """
+    items = body.movies
+    logger.info(f"Batch movie creation (items={len(items)})")
+
+    try:
+        result = await run_db(db, lambda session: MovieService(session).create_movies_batch(items))
+
+        logger.info(f"Batch movies saved (created={result['created']}, failed={result['failed']})")
+        return success(result, status.HTTP_201_CREATED)
+
+    except Exception as e:
+        logger.error(f"Failed to create movies batch: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error: {str(e)}"
+        )
+
+
+@router.put("/movies/{movie_id}", response_model=SuccessResponse[MovieUpdatedResponse])
 async def update_movie(
         movie_id: int,
         movie_data: MovieUpdateRequest = Body(...),
-        db: Session = Depends(get_db)
+        db: DbSession = Depends(get_session)
 ):
     """Update a movie"""
-    try:
-        service = MovieService(db)
+    def update(session: Session):
+        service = MovieService(session)
 
         movie = service.update_movie(
             movie_id=movie_id,
@@ -204,23 +377,23 @@ async def update_movie(
         stats = service.get_movie_stats(movie.id)
 
         return {
-            "status": "success",
-            "data": {
-                "id": movie.id,
-                "title": movie.title,
-                "release_year": movie.release_year,
-                "director": {
-                    "id": movie.director.id,
-                    "name": movie.director.name
-                } if movie.director else None,
-                "cast": movie.cast,
-                "genres": [g.name for g in movie.genres],
-                "average_rating": stats["average_rating"],
-                "ratings_count": stats["ratings_count"],
-                "updated_at": movie.updated_at.isoformat() if movie.updated_at else None
-            }
+            "id": movie.id,
+            "title": movie.title,
+            "release_year": movie.release_year,
+            "director": {
+                "id": movie.director.id,
+                "name": movie.director.name
+            } if movie.director else None,
+            "cast": movie.cast,
+            "genres": [g.name for g in movie.genres],
+            "average_rating": stats["average_rating"],
+            "ratings_count": stats["ratings_count"],
+            "updated_at": movie.updated_at.isoformat() if movie.updated_at else None
         }
 
+    try:
+        return success(await run_db(db, update))
+
     except NotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -239,23 +412,25 @@ async def update_movie(
 
 
 @router.delete("/movies/{movie_id}", response_model=dict)
-async def delete_movie(movie_id: int, db: Session = Depends(get_db)):
+async def delete_movie(movie_id: int, db: DbSession = Depends(get_session)):
     """Delete a movie"""
-    try:
-        service = MovieService(db)
+    def delete(session: Session):
+        service = MovieService(session)
 
         movie = service.get_movie_by_id(movie_id)
+        title = movie.title
 
         service.delete_movie(movie_id)
+        return title
 
-        return {
-            "status": "success",
-            "data": {
-                "message": f"Movie {movie_id} deleted successfully",
-                "deleted_id": movie_id,
-                "deleted_title": movie.title
-            }
-        }
+    try:
+        deleted_title = await run_db(db, delete)
+
+        return success({
+            "message": f"Movie {movie_id} deleted successfully",
+            "deleted_id": movie_id,
+            "deleted_title": deleted_title
+        })
 
     except NotFoundError as e:
         raise HTTPException(
@@ -269,12 +444,40 @@ async def delete_movie(movie_id: int, db: Session = Depends(get_db)):
         )
 
 
-@router.post("/movies/{movie_id}/ratings", response_model=dict, status_code=status.HTTP_201_CREATED)
+@router.get("/movies/{movie_id}/ratings/histogram", response_model=SuccessResponse[RatingHistogramResponse])
+async def get_rating_histogram(movie_id: int, db: DbSession = Depends(get_read_session)):
+    """
+    Rating distribution of a movie (count per score 1-10)
+    with median and percentiles derived from it
+    """
+    def load(session: Session):
+        return MovieService(session).get_rating_histogram(movie_id)
+
+    try:
+        return success(await run_db(db, load))
+
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error: {str(e)}"
+        )
+
+
+@router.post(
+    "/movies/{movie_id}/ratings",
+    response_model=SuccessResponse[Union[RatingResponse, RatingQueuedResponse]],
+    status_code=status.HTTP_201_CREATED
+)
 async def add_rating(
         request: Request,
         movie_id: int,
         rating_data: dict = Body(..., example={"score": 8}),
-        db: Session = Depends(get_db)
+        db: DbSession = Depends(get_session)
 ):
     """
     Add a rating to a movie
@@ -283,36 +486,45 @@ async def add_rating(
     {
         "score": 8  (number between 1 and 10)
     }
+
+    In write-behind mode (RATING_WRITE_BEHIND) the rating is validated,
+    queued and acknowledged with 202 Accepted; it is written with the next batch.
     """
     score = rating_data.get("score")
 
     logger.info(f"Rating movie (movie_id={movie_id}, rating={score}, route={request.url.path})")
 
-    try:
-        service = MovieService(db)
+    def rate(session: Session):
+        service = MovieService(session)
 
-        if score is None:
-            logger.warning(f"Invalid rating value: None (movie_id={movie_id})")
-            raise ValidationError("score is required")
+        if rating_buffer.running and service.queue_rating(movie_id=movie_id, score=int(score)):
+            return {
+                "movie_id": movie_id,
+                "score": int(score),
+                "queued": True
+            }
 
         rating = service.add_rating(
             movie_id=movie_id,
             score=int(score)
         )
+        return {
+            "rating_id": rating.id,
+            "movie_id": rating.movie_id,
+            "score": rating.score,
+            "created_at": rating.created_at.isoformat()
+        }
 
-        logger.info(f"Rating saved successfully (movie_id={movie_id}, rating={score})")
+    try:
+        if score is None:
+            logger.warning(f"Invalid rating value: None (movie_id={movie_id})")
+            raise ValidationError("score is required")
 
-        stats = service.get_movie_stats(movie_id)
+        data = await run_db(db, rate)
 
-        return {
-            "status": "success",
-            "data": {
-                "rating_id": rating.id,
-                "movie_id": rating.movie_id,
-                "score": rating.score,
-                "created_at": rating.created_at.isoformat()
-            }
-        }
+        logger.info(f"Rating saved successfully (movie_id={movie_id}, rating={score})")
+
+        return success(data, status.HTTP_202_ACCEPTED if data.get("queued") else status.HTTP_201_CREATED)
 
     except NotFoundError as e:
         logger.warning(f"Movie not found for rating: {movie_id}")
@@ -0,0 +1,33 @@
+import logging
+from typing import Dict, Any
+from fastapi import APIRouter, Depends, status
+
+from app.controllers.responses import success
+from app.db.database import DbSession, get_session, run_db
+from app.services.rating_service import RatingService
+from app.schemas.request.rating_schema import RatingBulkCreateRequest
+
+router = APIRouter(prefix="/api/v1/ratings", tags=["ratings"])
+
+logger = logging.getLogger("movie_rating")
+
+
+@router.post("/bulk", status_code=status.HTTP_201_CREATED, response_model=Dict[str, Any])
+async def create_ratings_bulk(
+    body: RatingBulkCreateRequest,
+    db: DbSession = Depends(get_session),
+):
+    """
+    Ingest a batch of ratings in one request.
+
+    Each item is validated against RatingBulkItem, movie ids are checked with
+    set-based queries and valid rows are inserted in a single transaction;
+    invalid items are reported by index.
+    """
+    items = body.ratings
+    logger.info(f"Bulk rating ingestion (items={len(items)})")
+
+    result = await run_db(db, lambda session: RatingService(session).create_ratings_from_request(items))
+
+    logger.info(f"Bulk ratings saved (inserted={result['inserted']}, failed={result['failed']})")
+    return success(result, status.HTTP_201_CREATED)
@@ -0,0 +1,62 @@
+from datetime import timezone
+from decimal import Decimal
+from email.utils import format_datetime
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse as StarletteJSONResponse
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson cannot serialize natively (e.g. numeric aggregates from PostgreSQL)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    return jsonable_encoder(obj)
+
+
+class JSONResponse(StarletteJSONResponse):
+    """JSON response rendered by orjson; non-string keys (e.g. histogram scores) are allowed"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def version_headers(version: Dict) -> Dict[str, str]:
+    """ETag and Last-Modified headers for a resource version (see resource_version)"""
+    headers = {"ETag": f'"{version["etag"]}"'}
+    if version["last_modified"] is not None:
+        # updated_at columns hold naive UTC times
+        headers["Last-Modified"] = format_datetime(
+            version["last_modified"].replace(tzinfo=timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def not_modified(request: Request, version: Dict) -> Optional[Response]:
+    """
+    304 Not Modified if the request's If-None-Match lists the current ETag (or is *).
+    If-Modified-Since is not evaluated: timestamps cannot express removals
+    (e.g. a deleted genre), the ETag can.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    etag = f'"{version["etag"]}"'
+    # If-None-Match uses weak comparison, so W/ prefixes are ignored
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=version_headers(version))
+    return None
+
+
+def success(data: Any, status_code: int = 200, version: Optional[Dict] = None) -> JSONResponse:
+    """
+    Success envelope, serialized directly.
+    Returning a Response skips FastAPI's response_model validation and
+    jsonable_encoder pass; response_model still documents the shape.
+    `version` adds ETag / Last-Modified headers.
+    """
+    headers = version_headers(version) if version is not None else None
+    return JSONResponse({"status": "success", "data": data}, status_code=status_code, headers=headers)
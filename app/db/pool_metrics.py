@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Checkout waits kept for percentiles
+WAIT_SAMPLES = 2048
+
+
+class PoolMetrics:
+    """
+    Checkout wait times and saturation of one connection pool.
+    Waits are timed by the pool class from instrumented_pool(); connections
+    in use, peaks and reconnects come from SQLAlchemy pool events.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.engine: Optional[Engine] = None
+        self.capacity: Optional[int] = None
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._waits.clear()
+            self.checkouts = 0
+            self.waits = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.in_use = 0
+            self.peak_in_use = 0
+            self.saturated_checkouts = 0
+            self.connects = 0
+            self.invalidations = 0
+
+    def instrument(self, engine: Engine, capacity: Optional[int] = None):
+        """
+        Attach the pool event listeners to an engine's pool (they survive
+        engine.dispose()). capacity is pool_size + max_overflow, None if unbounded.
+        """
+        self.engine = engine
+        self.capacity = capacity
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            self.waits += 1
+            self._waits.append(seconds)
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+            if self.capacity and self.in_use >= self.capacity:
+                self.saturated_checkouts += 1
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict:
+        """Current counters for the internal pool endpoint"""
+        with self._lock:
+            waits = sorted(self._waits)
+            capacity = self.capacity
+            pool = self.engine.pool if self.engine else None
+            data = {
+                "name": self.name,
+                "pool_class": type(pool).__name__ if pool else None,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "capacity": capacity,
+                "saturation": round(self.in_use / capacity, 3) if capacity else None,
+                "saturated_checkouts": self.saturated_checkouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "wait_ms": {
+                    "avg": round(self.wait_total / self.waits * 1000, 3) if self.waits else 0.0,
+                    "max": round(self.wait_max * 1000, 3),
+                    "p50": _percentile_ms(waits, 50),
+                    "p95": _percentile_ms(waits, 95),
+                    "p99": _percentile_ms(waits, 99),
+                },
+            }
+        if isinstance(pool, QueuePool):
+            data["pool"] = {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            }
+        return data
+
+
+def _percentile_ms(sorted_values, percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))
+    return round(sorted_values[index] * 1000, 3)
+
+
+def instrumented_pool(base: Type[QueuePool], metrics: PoolMetrics) -> Type[QueuePool]:
+    """QueuePool subclass that times how long each checkout waits for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            record = base._do_get(self)
+        except PoolTimeoutError:
+            metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        metrics.record_wait(time.perf_counter() - started)
+        return record
+
+    return type(f"Instrumented{base.__name__}", (base,), {"_do_get": _do_get})
@@ -0,0 +1,107 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    """SQL statements issued within one tracked scope (usually a request)"""
+
+    def __init__(self, record_statements: bool = False):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Optional[List[str]] = [] if record_statements else None
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+# Process-wide scopes opened by query_budget(); they see statements from any thread
+_watchers: List[QueryStats] = []
+
+
+def current_stats() -> Optional[QueryStats]:
+    """Stats of the scope the caller runs in, if any"""
+    return _current.get()
+
+
+@contextmanager
+def track_queries(record_statements: bool = False) -> Iterator[QueryStats]:
+    """
+    Count statements and DB time of everything run inside the block.
+    The stats object is shared with threadpool and run_sync work started from
+    the block, since both copy the current context.
+    """
+    stats = QueryStats(record_statements)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """
+    Fail with AssertionError when the block issues more than max_queries statements.
+    Meant for tests, e.g.:
+
+        with query_budget(3):
+            client.get("/api/v1/movies?page_size=50")
+
+    Every statement the process runs meanwhile is counted (TestClient serves
+    the app from another thread), so keep the block to the request under test.
+    """
+    stats = QueryStats(record_statements=True)
+    _watchers.append(stats)
+    try:
+        yield stats
+    finally:
+        _watchers.remove(stats)
+    if stats.count > max_queries:
+        listing = "\n".join(f"  {i}. {sql}" for i, sql in enumerate(stats.statements, 1))
+        raise AssertionError(
+            f"Query budget exceeded: {stats.count} statements (budget {max_queries})\n{listing}"
+        )
+
+
+def _scopes() -> List[QueryStats]:
+    stats = _current.get()
+    return _watchers + [stats] if stats is not None else _watchers
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _scopes():
+        conn.info.setdefault("query_stats_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_stats_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    for stats in _scopes():
+        stats.count += 1
+        stats.duration += elapsed
+        if stats.statements is not None:
+            stats.statements.append(" ".join(statement.split())[:200])
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    conn = exception_context.connection
+    started = conn.info.get("query_stats_started") if conn is not None else None
+    if started:
+        started.pop()
+
+
+def instrument(engine: Engine):
+    """Attach the statement counting hooks to an engine (sync, or an async engine's sync_engine)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
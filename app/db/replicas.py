@@ -0,0 +1,196 @@
+import logging
+import os
+import threading
+import time
+from math import ceil
+from typing import Dict, List
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.db import query_stats
+from app.db.database import (
+    DATABASE_ASYNC,
+    AsyncSessionLocal,
+    SessionLocal,
+    _async_url,
+    _pool_capacity,
+    _pool_options,
+    get_db,
+)
+from app.db.pool_metrics import PoolMetrics
+
+logger = logging.getLogger("movie_rating")
+
+# Comma-separated read replicas; GET routes read from them round-robin
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# A replica that fails to connect is skipped for this many seconds
+DB_REPLICA_EJECT_SECONDS = float(os.getenv("DB_REPLICA_EJECT_SECONDS", "30"))
+# How far replicas may lag behind the primary
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))
+# After a write, the same client reads from the primary for this long
+DB_READ_YOUR_WRITES_SECONDS = int(os.getenv("DB_READ_YOUR_WRITES_SECONDS", str(ceil(DB_REPLICA_MAX_LAG))))
+
+# Set on write responses; requests carrying it (or the header) read from the primary
+READ_PRIMARY_COOKIE = "db_read_primary"
+READ_CONSISTENCY_HEADER = "X-Read-Consistency"
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class Replica:
+    """One read replica: its engines, pool metrics and health"""
+
+    def __init__(self, index: int, url: str):
+        self.name = f"replica-{index}"
+        self.url = url
+        self.ejected_until = 0.0
+        self.ejections = 0
+        self.reads = 0
+        self.last_error = None
+
+        self.pool_metrics = PoolMetrics(self.name)
+        self.engine = create_engine(url, **_pool_options(url, QueuePool, self.pool_metrics))
+        self.pool_metrics.instrument(self.engine, _pool_capacity(url))
+        self._watch(self.engine)
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+        self.async_pool_metrics = None
+        self.async_session_factory = None
+        if DATABASE_ASYNC:
+            async_url = _async_url(url)
+            self.async_pool_metrics = PoolMetrics(f"{self.name}-async")
+            async_engine = create_async_engine(
+                async_url, **_pool_options(async_url, AsyncAdaptedQueuePool, self.async_pool_metrics)
+            )
+            self.async_pool_metrics.instrument(async_engine.sync_engine, _pool_capacity(async_url))
+            self._watch(async_engine.sync_engine)
+            self.async_session_factory = async_sessionmaker(bind=async_engine, autocommit=False, autoflush=False)
+
+    def _watch(self, engine):
+        query_stats.instrument(engine)
+        event.listen(engine, "handle_error", self._on_error)
+
+    def _on_error(self, context):
+        # Failed connects and dropped connections mean the replica is down;
+        # statement errors do not
+        if context.connection is None or context.is_disconnect:
+            self.eject(context.original_exception)
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+
+    def eject(self, error: BaseException):
+        if self.healthy:
+            logger.warning(f"Ejecting read {self.name} for {DB_REPLICA_EJECT_SECONDS:g}s: {error}")
+            self.ejections += 1
+        self.ejected_until = time.monotonic() + DB_REPLICA_EJECT_SECONDS
+        self.last_error = str(error)
+
+    def snapshot(self) -> Dict:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "ejected_for_s": round(max(0.0, self.ejected_until - time.monotonic()), 1),
+            "ejections": self.ejections,
+            "reads": self.reads,
+            "last_error": self.last_error,
+        }
+
+
+class ReplicaRouter:
+    """
+    Picks the replica for each read-only request, round-robin over the
+    healthy ones. Ejected replicas are tried again once their ejection
+    expires; with none healthy, reads go to the primary.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(index, url) for index, url in enumerate(urls)]
+        self.primary_reads = 0
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def choose(self):
+        """Next healthy replica, or None to read from the primary"""
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                replica = self.replicas[self._cursor % len(self.replicas)]
+                self._cursor += 1
+                if replica.healthy:
+                    replica.reads += 1
+                    return replica
+            self.primary_reads += 1
+            return None
+
+    def pools(self) -> List[Dict]:
+        """Pool metrics of every replica engine"""
+        metrics = []
+        for replica in self.replicas:
+            metrics.append(replica.pool_metrics.snapshot())
+            if replica.async_pool_metrics is not None:
+                metrics.append(replica.async_pool_metrics.snapshot())
+        return metrics
+
+    def snapshot(self) -> Dict:
+        return {
+            "primary_reads": self.primary_reads,
+            "replicas": [replica.snapshot() for replica in self.replicas],
+        }
+
+
+replica_router = ReplicaRouter(DATABASE_REPLICA_URLS)
+
+
+def wants_primary(request: Request) -> bool:
+    """No replicas, or read-your-writes: the client wrote recently or asked for the primary"""
+    return (
+        not replica_router.enabled
+        or READ_PRIMARY_COOKIE in request.cookies
+        or request.headers.get(READ_CONSISTENCY_HEADER, "").lower() == "primary"
+    )
+
+
+def get_read_db(request: Request):
+    """Session for read-only routes: a replica when one is healthy, else the primary"""
+    replica = None if wants_primary(request) else replica_router.choose()
+    if replica is None:
+        yield from get_db()
+        return
+    db = replica.session_factory()
+    # run_db retries on the primary if this replica fails mid-request
+    db.info["replica"] = replica
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """get_read_db for DATABASE_ASYNC"""
+    replica = None if wants_primary(request) else replica_router.choose()
+    factory = AsyncSessionLocal if replica is None else replica.async_session_factory
+    async with factory() as db:
+        if replica is not None:
+            db.info["replica"] = replica
+        yield db
+
+
+def open_read_session(request: Request) -> Session:
+    """
+    Sync read session for work that outlives the route handler (streamed
+    exports), routed like get_read_session. The caller closes it.
+    """
+    replica = None if wants_primary(request) else replica_router.choose()
+    return SessionLocal() if replica is None else replica.session_factory()
+
+
+# Request-scoped read-only session dependency, selected by DATABASE_ASYNC
+get_read_session = get_async_read_db if DATABASE_ASYNC else get_read_db
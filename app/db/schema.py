@@ -0,0 +1,77 @@
+import argparse
+import logging
+import os
+
+from sqlalchemy import inspect
+
+from app.db.database import DATABASE_URL, engine
+
+logger = logging.getLogger("main")
+
+# What the app does to the schema at startup (never at import):
+#   none       - nothing; run migrations as a deploy step (default)
+#   create_all - create missing tables from the models
+#   migrate    - alembic upgrade head
+SCHEMA_MODES = ("none", "create_all", "migrate")
+DB_SCHEMA_MODE = os.getenv("DB_SCHEMA_MODE", "none").lower()
+
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic")
+
+
+def _alembic_config():
+    # Alembic is only needed when migrating; keep it out of the import path
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", ALEMBIC_DIR)
+    config.set_main_option("sqlalchemy.url", DATABASE_URL.replace("%", "%%"))
+    return config
+
+
+def _create_all(stamp: bool):
+    """Create missing tables; `stamp` marks a fresh schema as being at the latest migration"""
+    from alembic import command
+    from app.models.base import Base
+    # Every model module, so the metadata holds all tables
+    from app.models import director, genre, movie, ranking, rating, rollup  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    if stamp:
+        command.stamp(_alembic_config(), "head")
+
+
+def prepare_schema(mode: str = DB_SCHEMA_MODE) -> str:
+    """
+    Bring the schema up according to `mode` (see SCHEMA_MODES); returns what was done.
+
+    The migration chain starts from the tables the models created, so an empty
+    database is built with create_all and stamped at head instead of migrated.
+    A database already under alembic is never touched by create_all, which
+    would create tables that a pending migration then fails to add.
+    """
+    if mode not in SCHEMA_MODES:
+        raise ValueError(f"Invalid DB_SCHEMA_MODE: {mode} (expected one of {', '.join(SCHEMA_MODES)})")
+    if mode == "none":
+        return "skipped"
+
+    tables = set(inspect(engine).get_table_names())
+    if not tables:
+        _create_all(stamp=True)
+        return "created"
+
+    if mode == "create_all":
+        if "alembic_version" in tables:
+            logger.warning("Database is managed by alembic; use DB_SCHEMA_MODE=migrate instead of create_all")
+            return "skipped"
+        _create_all(stamp=False)
+        return "created missing tables"
+
+    from alembic import command
+    command.upgrade(_alembic_config(), "head")
+    return "migrated"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create or migrate the database schema (deploy step)")
+    parser.add_argument("--mode", choices=SCHEMA_MODES[1:], default="migrate")
+    print(f"Schema {prepare_schema(parser.parse_args().mode)}")
@@ -1,29 +1,73 @@
 ﻿import logging
+import os
+import time
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from fastapi.responses import JSONResponse
-
-from app.db.database import engine
-from app.models.base import Base
-from app.controllers import director_router, genre_router, movie_router
+from starlette.concurrency import run_in_threadpool
+
+from app.controllers.responses import JSONResponse
+from app.db.query_stats import track_queries
+from app.db.database import DATABASE_ASYNC, DB_POOL_WARMUP, warm_pool, warm_async_pool
+from app.db.replicas import DB_READ_YOUR_WRITES_SECONDS, READ_METHODS, READ_PRIMARY_COOKIE, replica_router
+from app.db.schema import DB_SCHEMA_MODE, prepare_schema
+from app.controllers import director_router, genre_router, movie_router, rating_router, internal_router
 from app.logging_config import setup_logging
+from app.services.leaderboard_refresher import LEADERBOARD_BACKGROUND_REFRESH, leaderboard_refresher
+from app.services.rating_buffer import RATING_WRITE_BEHIND, rating_buffer
 
 setup_logging()
 
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(
     title="Movie Rating System API",
     description="Backend API for movie management and rating system",
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    default_response_class=JSONResponse
 )
 
 logger = logging.getLogger("main")
 
+# Requests issuing more SQL statements than this are logged as warnings
+QUERY_COUNT_WARN_THRESHOLD = int(os.getenv("QUERY_COUNT_WARN_THRESHOLD", "20"))
+
+
+@app.middleware("http")
+async def query_stats_middleware(request: Request, call_next):
+    """Count SQL statements and DB time per request; report them in Server-Timing and the log"""
+    started = time.perf_counter()
+    with track_queries() as stats:
+        response = await call_next(request)
+    total_ms = (time.perf_counter() - started) * 1000
+
+    response.headers["Server-Timing"] = (
+        f'db;dur={stats.duration_ms:.2f};desc="{stats.count} queries", app;dur={total_ms:.2f}'
+    )
+    response.headers["X-DB-Query-Count"] = str(stats.count)
+
+    message = (
+        f"{request.method} {request.url.path} -> {response.status_code} "
+        f"({stats.count} queries, {stats.duration_ms:.1f} ms db, {total_ms:.1f} ms total)"
+    )
+    if stats.count > QUERY_COUNT_WARN_THRESHOLD:
+        logger.warning(f"Query count over threshold: {message}")
+    else:
+        logger.info(message)
+    return response
+
+
+@app.middleware("http")
+async def read_your_writes_middleware(request: Request, call_next):
+    """After a successful write, pin the client's reads to the primary until replicas have caught up"""
+    response = await call_next(request)
+    if replica_router.enabled and request.method not in READ_METHODS and response.status_code < 400:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE, "1", max_age=DB_READ_YOUR_WRITES_SECONDS, httponly=True, samesite="lax"
+        )
+    return response
+
 
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
@@ -80,11 +124,34 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 @app.on_event("startup")
 async def startup_event():
+    if DB_SCHEMA_MODE != "none":
+        # Explicit opt-in: importing the app never touches the database
+        outcome = await run_in_threadpool(prepare_schema)
+        logger.info(f"Schema {outcome} (DB_SCHEMA_MODE={DB_SCHEMA_MODE})")
+    if DB_POOL_WARMUP > 0:
+        # Pay connection setup now instead of on the first requests
+        try:
+            if DATABASE_ASYNC:
+                opened = await warm_async_pool()
+            else:
+                opened = await run_in_threadpool(warm_pool)
+            logger.info(f"Connection pool warmed ({opened} connections)")
+        except Exception as e:
+            logger.warning(f"Connection pool warm-up failed: {e}")
+    if RATING_WRITE_BEHIND:
+        rating_buffer.start()
+    if LEADERBOARD_BACKGROUND_REFRESH:
+        leaderboard_refresher.start()
     logger.info("Movie management system started")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    if rating_buffer.running:
+        # Write every acknowledged rating before the worker exits
+        await run_in_threadpool(rating_buffer.stop)
+    if leaderboard_refresher.running:
+        await run_in_threadpool(leaderboard_refresher.stop)
     logger.info("Movie management system stopped")
 
 
@@ -101,6 +168,8 @@ async def health_check():
 app.include_router(director_router)
 app.include_router(genre_router)
 app.include_router(movie_router)
+app.include_router(rating_router)
+app.include_router(internal_router)
 
 if __name__ == "__main__":
     import uvicorn
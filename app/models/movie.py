@@ -1,13 +1,20 @@
-﻿from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Table, DateTime
+﻿import math
+import sqlite3
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import Column, Integer, BigInteger, Boolean, String, Text, ForeignKey, Table, DateTime, DDL, Index, event, false
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
+RATING_SCORES = range(1, 11)
+
 movie_genres = Table(
     'movie_genres',
     Base.metadata,
     Column('movie_id', Integer, ForeignKey('movies.id', ondelete='CASCADE'), primary_key=True),
-    Column('genre_id', Integer, ForeignKey('genres.id', ondelete='CASCADE'), primary_key=True)
+    Column('genre_id', Integer, ForeignKey('genres.id', ondelete='CASCADE'), primary_key=True),
+    # The primary key leads with movie_id; per-genre lookups and counts need their own index
+    Index('ix_movie_genres_genre_id', 'genre_id')
 )
 
 
@@ -16,10 +23,27 @@ class Movie(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, index=True)
-    director_id = Column(Integer, ForeignKey('directors.id', ondelete='CASCADE'), nullable=False)
+    director_id = Column(Integer, ForeignKey('directors.id', ondelete='CASCADE'), nullable=False, index=True)
     release_year = Column(Integer, nullable=False)
     cast = Column(Text, nullable=True)
     description = Column(Text, nullable=True)
+    # Denormalized rating aggregates, maintained in the same transaction as rating writes
+    ratings_count = Column(Integer, nullable=False, default=0, server_default="0")
+    ratings_sum = Column(BigInteger, nullable=False, default=0, server_default="0")
+    # Score distribution: rating_hist_N counts the ratings with score N
+    rating_hist_1 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_hist_2 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_hist_3 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_hist_4 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_hist_5 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_hist_6 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_hist_7 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_hist_8 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_hist_9 = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_hist_10 = Column(Integer, nullable=False, default=0, server_default="0")
+    # Set by every change the leaderboard depends on (same UPDATE as the aggregates);
+    # cleared by the refresh that recomputes the movie's ranking rows
+    ranking_dirty = Column(Boolean, nullable=False, default=False, server_default=false())
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -31,15 +55,98 @@ class Movie(Base):
     )
     ratings = relationship("MovieRating", back_populates="movie", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Partial index: only the few movies waiting for a ranking refresh are in it
+        Index('ix_movies_ranking_dirty', 'id', postgresql_where=ranking_dirty, sqlite_where=ranking_dirty),
+    )
+
     def __repr__(self):
         return f"<Movie(id={self.id}, title='{self.title}')>"
 
     def get_average_rating(self):
-        """calculate average rating"""
-        if not self.ratings:
+        """average rating from the denormalized aggregates"""
+        if not self.ratings_count:
             return None
-        return sum(r.score for r in self.ratings) / len(self.ratings)
+        return self.ratings_sum / self.ratings_count
 
     def get_ratings_count(self):
         """ratings count"""
-        return len(self.ratings)
+        return self.ratings_count or 0
+
+    @classmethod
+    def histogram_column(cls, score: int):
+        """histogram column holding the count for a score"""
+        return getattr(cls, f"rating_hist_{score}")
+
+    def get_rating_histogram(self) -> Dict[int, int]:
+        """score -> number of ratings, for every score on the 1-10 scale"""
+        return {score: getattr(self, f"rating_hist_{score}") or 0 for score in RATING_SCORES}
+
+    def get_rating_percentile(self, percent: float) -> Optional[int]:
+        """nearest-rank percentile (0-100] of the scores, derived from the histogram"""
+        histogram = self.get_rating_histogram()
+        total = sum(histogram.values())
+        if not total:
+            return None
+        rank = max(1, math.ceil(percent / 100 * total))
+        seen = 0
+        for score, count in histogram.items():
+            seen += count
+            if seen >= rank:
+                return score
+        return RATING_SCORES[-1]
+
+    def get_median_rating(self) -> Optional[int]:
+        """median score, derived from the histogram"""
+        return self.get_rating_percentile(50)
+
+
+# Trigram index for substring title search (PostgreSQL only; see MovieRepository._title_filter)
+event.listen(
+    Movie.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+event.listen(
+    Movie.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_movies_title_trgm ON movies USING gin (title gin_trgm_ops)"
+    ).execute_if(dialect="postgresql")
+)
+
+# SQLite: FTS5 trigram index over movies.title, kept current by triggers on
+# every insert, update and delete (ORM, Core and raw SQL alike).
+# The trigram tokenizer needs SQLite 3.34+.
+TITLE_FTS_TABLE = "movies_title_fts"
+SQLITE_TITLE_FTS = sqlite3.sqlite_version_info >= (3, 34, 0)
+
+TITLE_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TITLE_FTS_TABLE} "
+    f"USING fts5(title, content='movies', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_ai AFTER INSERT ON movies BEGIN "
+    f"INSERT INTO {TITLE_FTS_TABLE} (rowid, title) VALUES (new.id, new.title); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_ad AFTER DELETE ON movies BEGIN "
+    f"INSERT INTO {TITLE_FTS_TABLE} ({TITLE_FTS_TABLE}, rowid, title) VALUES ('delete', old.id, old.title); END",
+    f"CREATE TRIGGER IF NOT EXISTS {TITLE_FTS_TABLE}_au AFTER UPDATE OF title ON movies BEGIN "
+    f"INSERT INTO {TITLE_FTS_TABLE} ({TITLE_FTS_TABLE}, rowid, title) VALUES ('delete', old.id, old.title); "
+    f"INSERT INTO {TITLE_FTS_TABLE} (rowid, title) VALUES (new.id, new.title); END",
+)
+
+
+def _sqlite_title_fts(ddl, target, bind, **kw):
+    return SQLITE_TITLE_FTS
+
+
+for _statement in TITLE_FTS_DDL:
+    event.listen(
+        Movie.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite", callable_=_sqlite_title_fts)
+    )
+# The triggers go with the table; the FTS table must be dropped explicitly
+event.listen(
+    Movie.__table__,
+    "before_drop",
+    DDL(f"DROP TABLE IF EXISTS {TITLE_FTS_TABLE}").execute_if(dialect="sqlite")
+)
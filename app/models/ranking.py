@@ -0,0 +1,56 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Index
+from app.models.base import Base
+
+
+class MovieRanking(Base):
+    """Precomputed Bayesian ranking per movie (see LeaderboardService)"""
+    __tablename__ = "movie_rankings"
+
+    movie_id = Column(Integer, ForeignKey('movies.id', ondelete='CASCADE'), primary_key=True)
+    release_year = Column(Integer, nullable=False)
+    bayesian_score = Column(Float, nullable=False)
+    average_rating = Column(Float, nullable=False)
+    ratings_count = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index(
+            'ix_movie_rankings_score', bayesian_score.desc(), 'movie_id',
+            postgresql_include=['average_rating', 'ratings_count', 'release_year']
+        ),
+        Index(
+            'ix_movie_rankings_year_score', 'release_year', bayesian_score.desc(), 'movie_id',
+            postgresql_include=['average_rating', 'ratings_count']
+        ),
+    )
+
+    def __repr__(self):
+        return f"<MovieRanking(movie_id={self.movie_id}, score={self.bayesian_score})>"
+
+
+class GenreRanking(Base):
+    """Per-genre copy of the ranking so top-N per genre is a single index range scan"""
+    __tablename__ = "movie_genre_rankings"
+
+    genre_id = Column(Integer, ForeignKey('genres.id', ondelete='CASCADE'), primary_key=True)
+    movie_id = Column(Integer, ForeignKey('movies.id', ondelete='CASCADE'), primary_key=True)
+    bayesian_score = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index('ix_movie_genre_rankings_score', 'genre_id', bayesian_score.desc(), 'movie_id'),
+    )
+
+    def __repr__(self):
+        return f"<GenreRanking(genre_id={self.genre_id}, movie_id={self.movie_id})>"
+
+
+class LeaderboardState(Base):
+    """Single-row bookkeeping for ranking refreshes (movies to refresh are flagged by Movie.ranking_dirty)"""
+    __tablename__ = "leaderboard_state"
+
+    id = Column(Integer, primary_key=True)
+    global_mean = Column(Float, nullable=True)
+    refreshed_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<LeaderboardState(global_mean={self.global_mean}, refreshed_at={self.refreshed_at})>"
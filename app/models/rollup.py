@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, BigInteger, String, ForeignKey, DateTime, Index
+from app.models.base import Base
+
+HOUR = "hour"
+DAY = "day"
+
+
+class RatingRollup(Base):
+    """
+    Ratings received by a movie per time bucket (see RatingRollupRepository).
+    Recent buckets are hourly; the retention job compacts old ones into daily buckets.
+    """
+    __tablename__ = "movie_rating_rollups"
+
+    movie_id = Column(Integer, ForeignKey('movies.id', ondelete='CASCADE'), primary_key=True)
+    granularity = Column(String(4), primary_key=True)  # "hour" | "day"
+    bucket_start = Column(DateTime, primary_key=True)
+    ratings_count = Column(Integer, nullable=False, default=0)
+    ratings_sum = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        Index('ix_movie_rating_rollups_window', 'granularity', 'bucket_start', 'movie_id'),
+    )
+
+    def __repr__(self):
+        return f"<RatingRollup(movie_id={self.movie_id}, {self.granularity}={self.bucket_start})>"
+
+
+def bucket_start(moment, granularity: str):
+    """Truncate a timestamp to the start of its hour or day"""
+    if granularity == DAY:
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    return moment.replace(minute=0, second=0, microsecond=0)
@@ -1,8 +1,9 @@
-from typing import TypeVar, Generic, Type, List, Optional
+from typing import TypeVar, Generic, Type, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.models.base import Base
 from app.exceptions.custom_exceptions import NotFoundError
+from app.repositories.pagination import keyset_page
 
 T = TypeVar('T', bound=Base)
 
@@ -28,7 +29,15 @@ class BaseRepository(Generic[T]):
 
     def get_all(self, skip: int = 0, limit: int = 10) -> List[T]:
         """Get all records with pagination"""
-        return self.db.query(self.model).offset(skip).limit(limit).all()
+        return self.db.query(self.model).order_by(self.model.id).offset(skip).limit(limit).all()
+
+    def get_page(self, skip: int = 0, limit: int = 10,
+                 after_id: Optional[int] = None) -> Tuple[List[T], Optional[int]]:
+        """
+        Get a page ordered by id, by offset or after a given id (keyset).
+        Returns the records and the id to resume after, or None on the last page.
+        """
+        return keyset_page(self.db.query(self.model), self.model.id, limit, skip=skip, after=after_id)
 
     def count(self) -> int:
         """Total number of records"""
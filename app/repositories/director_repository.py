@@ -1,6 +1,8 @@
+from typing import Dict, Iterable, List, Set
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from app.models.director import Director
+from app.models.movie import Movie
 from app.repositories.base_repository import BaseRepository
 
 
@@ -17,3 +19,53 @@ class DirectorRepository(BaseRepository[Director]):
     def get_directors_with_movies(self, skip: int = 0, limit: int = 10):
         """Get directors with their movie count"""
         return self.db.query(Director).offset(skip).limit(limit).all()
+
+    def get_movie_ids(self, director_id: int) -> List[int]:
+        """Ids of the director's movies"""
+        rows = self.db.query(Movie.id).filter(Movie.director_id == director_id).all()
+        return [row.id for row in rows]
+
+    def existing_ids(self, director_ids: Iterable[int]) -> Set[int]:
+        """Which of the given director ids exist, in a single IN query"""
+        ids = set(director_ids)
+        if not ids:
+            return set()
+        rows = self.db.query(Director.id).filter(Director.id.in_(ids)).all()
+        return {row.id for row in rows}
+
+    def get_movie_stats(self, director_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        movies_count and rating-weighted average per director, in one grouped query.
+        Directors without movies are omitted.
+        """
+        ids = set(director_ids)
+        if not ids:
+            return {}
+        rows = self.db.query(
+            Movie.director_id,
+            func.count(Movie.id).label("movies_count"),
+            func.sum(Movie.ratings_sum).label("ratings_sum"),
+            func.sum(Movie.ratings_count).label("ratings_count")
+        ).filter(Movie.director_id.in_(ids)).group_by(Movie.director_id).all()
+        return {
+            row.director_id: {
+                "movies_count": row.movies_count,
+                "average_rating": row.ratings_sum / row.ratings_count if row.ratings_count else None
+            }
+            for row in rows
+        }
+
+    def get_version_row(self, director_id: int):
+        """
+        updated_at of the director plus count, rating totals and latest updated_at
+        of their movies, in one query on the director_id index. None if the director does not exist.
+        """
+        return self.db.query(
+            Director.updated_at,
+            func.count(Movie.id).label("movies_count"),
+            func.sum(Movie.ratings_sum).label("ratings_sum"),
+            func.sum(Movie.ratings_count).label("ratings_count"),
+            func.max(Movie.updated_at).label("movies_updated_at")
+        ).outerjoin(Movie, Movie.director_id == Director.id).filter(
+            Director.id == director_id
+        ).group_by(Director.id, Director.updated_at).first()
@@ -1,5 +1,8 @@
+from typing import Dict, Iterable, List
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.models.genre import Genre
+from app.models.movie import Movie, movie_genres
 from app.repositories.base_repository import BaseRepository
 
 
@@ -16,3 +19,56 @@ class GenreRepository(BaseRepository[Genre]):
     def get_genres_with_movies(self, skip: int = 0, limit: int = 10):
         """Get genres with their movie count"""
         return self.db.query(Genre).offset(skip).limit(limit).all()
+
+    def get_movie_ids(self, genre_id: int) -> List[int]:
+        """Ids of the movies tagged with this genre"""
+        rows = self.db.query(movie_genres.c.movie_id).filter(movie_genres.c.genre_id == genre_id).all()
+        return [row.movie_id for row in rows]
+
+    def get_by_ids(self, genre_ids: Iterable[int]) -> List[Genre]:
+        """Genres with the given ids, in a single IN query"""
+        ids = set(genre_ids)
+        if not ids:
+            return []
+        return self.db.query(Genre).filter(Genre.id.in_(ids)).all()
+
+    def get_movie_stats(self, genre_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        movies_count and rating-weighted average per genre, in one grouped query.
+        Genres without movies are omitted.
+        """
+        ids = set(genre_ids)
+        if not ids:
+            return {}
+        rows = self.db.query(
+            movie_genres.c.genre_id,
+            func.count(movie_genres.c.movie_id).label("movies_count"),
+            func.sum(Movie.ratings_sum).label("ratings_sum"),
+            func.sum(Movie.ratings_count).label("ratings_count")
+        ).join(
+            Movie, Movie.id == movie_genres.c.movie_id
+        ).filter(movie_genres.c.genre_id.in_(ids)).group_by(movie_genres.c.genre_id).all()
+        return {
+            row.genre_id: {
+                "movies_count": row.movies_count,
+                "average_rating": row.ratings_sum / row.ratings_count if row.ratings_count else None
+            }
+            for row in rows
+        }
+
+    def get_version_row(self, genre_id: int):
+        """
+        updated_at of the genre plus count, rating totals and latest updated_at
+        of its movies, in one query on the genre_id index. None if the genre does not exist.
+        """
+        return self.db.query(
+            Genre.updated_at,
+            func.count(Movie.id).label("movies_count"),
+            func.sum(Movie.ratings_sum).label("ratings_sum"),
+            func.sum(Movie.ratings_count).label("ratings_count"),
+            func.max(Movie.updated_at).label("movies_updated_at")
+        ).outerjoin(
+            movie_genres, movie_genres.c.genre_id == Genre.id
+        ).outerjoin(
+            Movie, Movie.id == movie_genres.c.movie_id
+        ).filter(Genre.id == genre_id).group_by(Genre.id, Genre.updated_at).first()
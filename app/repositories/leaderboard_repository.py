@@ -0,0 +1,127 @@
+from datetime import datetime
+from typing import Iterable, List, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select, update, cast, Float, literal
+from app.models.movie import Movie, movie_genres
+from app.models.ranking import MovieRanking, GenreRanking, LeaderboardState
+
+
+class LeaderboardRepository:
+    """Data access for the precomputed ranking tables"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_state(self, lock: bool = False) -> LeaderboardState:
+        """
+        The single bookkeeping row, created on first use; lock serializes refreshers.
+        A locked read reloads the row, so a refresher that waited for the lock
+        sees what the previous holder committed, not its identity-map copy.
+        """
+        query = self.db.query(LeaderboardState).filter(LeaderboardState.id == 1)
+        if lock:
+            query = query.with_for_update().populate_existing()
+        state = query.first()
+        if state is None:
+            try:
+                with self.db.begin_nested():
+                    self.db.add(LeaderboardState(id=1, global_mean=None))
+            except IntegrityError:
+                # Another refresher created it first
+                pass
+            state = query.first()
+        return state
+
+    def global_mean(self) -> Optional[float]:
+        """Mean score over all ratings, from the denormalized movie aggregates"""
+        total_sum, total_count = self.db.query(
+            func.sum(Movie.ratings_sum), func.sum(Movie.ratings_count)
+        ).one()
+        if not total_count:
+            return None
+        return float(total_sum) / float(total_count)
+
+    def claim_dirty_movies(self) -> List[int]:
+        """
+        Ids of the movies flagged ranking_dirty, locked and cleared (no commit).
+        The row locks are held until the refresh commits, so a rating written
+        meanwhile waits and flags its movie again for the next refresh; no
+        change can be lost, whatever order transactions commit in.
+        """
+        ids = [
+            row.id for row in self.db.query(Movie.id).filter(Movie.ranking_dirty).with_for_update().all()
+        ]
+        if ids:
+            self.db.execute(
+                # Keep updated_at: the flag is bookkeeping, not a change to the movie
+                update(Movie).where(Movie.id.in_(ids)).values(ranking_dirty=False, updated_at=Movie.updated_at),
+                execution_options={"synchronize_session": False}
+            )
+        return ids
+
+    def rebuild(self, mean: float, prior_weight: float):
+        """Recompute every ranking row"""
+        self.db.query(GenreRanking).delete(synchronize_session=False)
+        self.db.query(MovieRanking).delete(synchronize_session=False)
+        self._insert_rankings(mean, prior_weight)
+
+    def refresh_movies(self, movie_ids: Iterable[int], mean: float, prior_weight: float):
+        """Recompute the ranking rows of the given movies only"""
+        ids = list(movie_ids)
+        if not ids:
+            return
+        self.db.query(GenreRanking).filter(GenreRanking.movie_id.in_(ids)).delete(synchronize_session=False)
+        self.db.query(MovieRanking).filter(MovieRanking.movie_id.in_(ids)).delete(synchronize_session=False)
+        self._insert_rankings(mean, prior_weight, ids)
+
+    def _insert_rankings(self, mean: float, prior_weight: float, movie_ids: Optional[List[int]] = None):
+        # Bayesian average: (C * m + sum) / (C + n), shrinking sparse movies towards the mean
+        score = (literal(prior_weight * mean) + Movie.ratings_sum) / (literal(prior_weight) + Movie.ratings_count)
+        average = cast(Movie.ratings_sum, Float) / Movie.ratings_count
+
+        movies = select(
+            Movie.id, Movie.release_year, score, average, Movie.ratings_count
+        ).where(Movie.ratings_count > 0)
+        links = select(
+            movie_genres.c.genre_id, Movie.id, score
+        ).join(Movie, Movie.id == movie_genres.c.movie_id).where(Movie.ratings_count > 0)
+
+        if movie_ids is not None:
+            movies = movies.where(Movie.id.in_(movie_ids))
+            links = links.where(Movie.id.in_(movie_ids))
+
+        self.db.execute(insert(MovieRanking).from_select(
+            ["movie_id", "release_year", "bayesian_score", "average_rating", "ratings_count"], movies
+        ))
+        self.db.execute(insert(GenreRanking).from_select(
+            ["genre_id", "movie_id", "bayesian_score"], links
+        ))
+
+    def save_state(self, state: LeaderboardState, mean: float):
+        state.global_mean = mean
+        state.refreshed_at = datetime.utcnow()
+
+    def top(self, limit: int = 10, genre_id: Optional[int] = None, release_year: Optional[int] = None):
+        """Top-N rows (ranking columns plus title), served from the ranking indexes"""
+        if genre_id is not None:
+            query = self.db.query(
+                MovieRanking.movie_id, Movie.title, MovieRanking.release_year,
+                MovieRanking.bayesian_score, MovieRanking.average_rating, MovieRanking.ratings_count
+            ).select_from(GenreRanking).join(
+                MovieRanking, MovieRanking.movie_id == GenreRanking.movie_id
+            ).join(Movie, Movie.id == GenreRanking.movie_id).filter(
+                GenreRanking.genre_id == genre_id
+            ).order_by(GenreRanking.bayesian_score.desc(), GenreRanking.movie_id)
+        else:
+            query = self.db.query(
+                MovieRanking.movie_id, Movie.title, MovieRanking.release_year,
+                MovieRanking.bayesian_score, MovieRanking.average_rating, MovieRanking.ratings_count
+            ).join(Movie, Movie.id == MovieRanking.movie_id).order_by(
+                MovieRanking.bayesian_score.desc(), MovieRanking.movie_id
+            )
+
+        if release_year is not None:
+            query = query.filter(MovieRanking.release_year == release_year)
+
+        return query.limit(limit).all()
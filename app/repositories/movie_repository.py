@@ -1,11 +1,14 @@
-from typing import List, Optional, Dict
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from app.models.movie import Movie
+from typing import Iterator, List, Optional, Dict, Tuple
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import and_, func, literal_column, or_, select, text
+from app.models.movie import Movie, RATING_SCORES, SQLITE_TITLE_FTS, TITLE_FTS_TABLE
+from app.models.director import Director
 from app.models.genre import Genre
 from app.models.movie import movie_genres
 from app.models.rating import MovieRating
 from app.repositories.base_repository import BaseRepository
+from app.repositories.pagination import keyset_page
+from app.repositories.rollup_repository import RatingRollupRepository
 
 
 class MovieRepository(BaseRepository[Movie]):
@@ -14,34 +17,61 @@ class MovieRepository(BaseRepository[Movie]):
     def __init__(self, db: Session):
         super().__init__(db, Movie)
 
+    def get_with_relations(self, movie_id: int) -> Optional[Movie]:
+        """Get a movie with director and genres loaded eagerly"""
+        return self.db.query(Movie).options(
+            joinedload(Movie.director),
+            selectinload(Movie.genres)
+        ).filter(Movie.id == movie_id).first()
+
+    def get_version_row(self, movie_id: int):
+        """
+        Everything the movie detail document depends on, in one primary-key lookup:
+        the movie's updated_at and rating aggregates, its director's updated_at and
+        the number and latest updated_at of its genres. None if the movie does not exist.
+        """
+        genre_links = movie_genres.join(Genre, Genre.id == movie_genres.c.genre_id)
+        genres_count = select(func.count(Genre.id)).select_from(genre_links).where(
+            movie_genres.c.movie_id == Movie.id
+        ).correlate(Movie).scalar_subquery()
+        genres_updated_at = select(func.max(Genre.updated_at)).select_from(genre_links).where(
+            movie_genres.c.movie_id == Movie.id
+        ).correlate(Movie).scalar_subquery()
+
+        return self.db.query(
+            Movie.updated_at,
+            Movie.ratings_count,
+            Movie.ratings_sum,
+            Director.updated_at.label("director_updated_at"),
+            genres_count.label("genres_count"),
+            genres_updated_at.label("genres_updated_at")
+        ).outerjoin(Director, Director.id == Movie.director_id).filter(Movie.id == movie_id).first()
+
     def search_movies(
             self,
             skip: int = 0,
             limit: int = 10,
             title: Optional[str] = None,
             release_year: Optional[int] = None,
-            genre_name: Optional[str] = None
-    ) -> List[Movie]:
+            genre_name: Optional[str] = None,
+            after_id: Optional[int] = None
+    ) -> Tuple[List[Movie], Optional[int]]:
         """
         Search movies with combined filters and pagination.
-        Handles joins properly for genre filtering.
+        Results are ordered by id; pass after_id to page by keyset instead of
+        offset. Director and genres are loaded eagerly and rating stats are
+        read from the denormalized columns, so a page costs a fixed number of
+        queries regardless of its size.
+        Returns the movies and the id to resume after (None on the last page).
         """
-        query = self.db.query(Movie)
-
-        if title:
-            query = query.filter(Movie.title.ilike(f"%{title}%"))
-
-        if release_year:
-            query = query.filter(Movie.release_year == release_year)
+        query = self.db.query(Movie).options(
+            joinedload(Movie.director),
+            selectinload(Movie.genres)
+        )
 
-        if genre_name:
-            query = query.join(Movie.genres).filter(
-                Genre.name.ilike(f"%{genre_name}%")
-            )
-
-        query = query.distinct()
+        query = self._apply_filters(query, title, release_year, genre_name)
 
-        return query.offset(skip).limit(limit).all()
+        return keyset_page(query, Movie.id, limit, skip=skip, after=after_id)
 
     def count_with_filters(
             self,
@@ -51,36 +81,165 @@ class MovieRepository(BaseRepository[Movie]):
     ) -> int:
         """Count movies matching the filters"""
         query = self.db.query(func.count(Movie.id))
+        query = self._apply_filters(query, title, release_year, genre_name)
+        return query.scalar()
 
+    def iter_export_batches(
+            self,
+            title: Optional[str] = None,
+            release_year: Optional[int] = None,
+            genre_name: Optional[str] = None,
+            batch_size: int = 1000
+    ) -> Iterator[List[Dict]]:
+        """
+        Every movie matching the filters with its director, genres and rating
+        aggregates, in id order, as batches of plain dicts.
+        Rows come through a server-side cursor (stream_results / yield_per) and
+        no ORM objects are built, so only one batch is held in memory; genres
+        are loaded with one IN query per batch.
+        """
+        query = select(
+            Movie.id,
+            Movie.title,
+            Movie.release_year,
+            Movie.cast,
+            Movie.ratings_count,
+            Movie.ratings_sum,
+            Director.id.label("director_id"),
+            Director.name.label("director_name")
+        ).outerjoin(Director, Director.id == Movie.director_id)
+        query = self._apply_filters(query, title, release_year, genre_name).order_by(Movie.id)
+
+        result = self.db.execute(query.execution_options(yield_per=batch_size))
+        try:
+            for rows in result.partitions():
+                genres = self._genre_names([row.id for row in rows])
+                yield [dict(row._mapping, genres=genres.get(row.id, [])) for row in rows]
+        finally:
+            result.close()
+
+    def _genre_names(self, movie_ids: List[int]) -> Dict[int, List[str]]:
+        """{movie_id: [genre names]} for a batch of movies"""
+        rows = self.db.execute(
+            select(movie_genres.c.movie_id, Genre.name)
+            .join(Genre, Genre.id == movie_genres.c.genre_id)
+            .where(movie_genres.c.movie_id.in_(movie_ids))
+            .order_by(movie_genres.c.movie_id, Genre.name)
+        )
+        names: Dict[int, List[str]] = {}
+        for movie_id, name in rows:
+            names.setdefault(movie_id, []).append(name)
+        return names
+
+    def estimate_count(self) -> Optional[int]:
+        """
+        Planner estimate of the number of movies (PostgreSQL pg_class.reltuples).
+        Returns None where no estimate is available (other backends, or a table
+        that has never been analyzed), so callers can fall back to COUNT.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return None
+
+        estimate = self.db.execute(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'movies'::regclass")
+        ).scalar()
+        if estimate is None or estimate < 0:
+            return None
+        return int(estimate)
+
+    def _apply_filters(self, query, title, release_year, genre_name):
+        """
+        Apply the listing filters to a query.
+        Genre matching uses EXISTS instead of a join, so movies are neither
+        duplicated in pages nor counted twice.
+        """
         if title:
-            query = query.filter(Movie.title.ilike(f"%{title}%"))
+            query = query.filter(self._title_filter(title))
 
         if release_year:
             query = query.filter(Movie.release_year == release_year)
 
         if genre_name:
-            query = query.join(Movie.genres).filter(
-                Genre.name.ilike(f"%{genre_name}%")
+            query = query.filter(
+                Movie.genres.any(Genre.name.ilike(f"%{genre_name}%"))
             )
 
-        return query.scalar()
+        return query
+
+    def _title_filter(self, title: str):
+        """
+        Substring match on title.
+        On PostgreSQL the ILIKE is served by the pg_trgm GIN index
+        (ix_movies_title_trgm). On SQLite, terms of 3+ characters are looked up
+        in the FTS5 trigram table (movies_title_fts), which triggers keep in
+        step with movies; the ILIKE then only rechecks the matches.
+        Other backends scan.
+        """
+        condition = Movie.title.ilike(f"%{title}%")
+        if len(title) < 3 or not SQLITE_TITLE_FTS or self.db.get_bind().dialect.name != "sqlite":
+            return condition
+
+        matches = select(literal_column("rowid")).select_from(text(TITLE_FTS_TABLE)).where(
+            literal_column("title").like(f"%{title}%")
+        )
+        return and_(Movie.id.in_(matches), condition)
 
     def get_movie_stats(self, movie_id: int) -> Dict[str, float]:
         """
         Get aggregated statistics for a movie (avg rating, count).
-        Moved from Service to Repository (Data Access Layer).
+        Reads the denormalized ratings_count / ratings_sum columns.
         """
         stats = self.db.query(
-            func.avg(MovieRating.score).label("average_rating"),
-            func.count(MovieRating.id).label("ratings_count")
-        ).filter(MovieRating.movie_id == movie_id).first()
+            Movie.ratings_count,
+            Movie.ratings_sum
+        ).filter(Movie.id == movie_id).first()
+
+        if not stats or not stats.ratings_count:
+            return {"average_rating": None, "ratings_count": 0}
 
         return {
-            "average_rating": float(stats.average_rating) if stats.average_rating else None,
-            "ratings_count": stats.ratings_count or 0
+            "average_rating": stats.ratings_sum / stats.ratings_count,
+            "ratings_count": stats.ratings_count
+        }
+
+    def recompute_rating_stats(self, movie_id: Optional[int] = None) -> int:
+        """
+        Rebuild ratings_count / ratings_sum and the score histogram from
+        movie_ratings to fix drift. Only rows whose stored aggregates differ
+        are rewritten. Returns the number of movies that were corrected.
+        """
+        def actual(expr, *criteria):
+            return self.db.query(expr).filter(
+                MovieRating.movie_id == Movie.id, *criteria
+            ).scalar_subquery()
+
+        values = {
+            Movie.ratings_count: actual(func.count(MovieRating.id)),
+            Movie.ratings_sum: actual(func.coalesce(func.sum(MovieRating.score), 0)),
         }
+        for score in RATING_SCORES:
+            values[Movie.histogram_column(score)] = actual(
+                func.count(MovieRating.id), MovieRating.score == score
+            )
+
+        query = self.db.query(Movie).filter(
+            or_(*(column != expected for column, expected in values.items()))
+        )
+        if movie_id is not None:
+            query = query.filter(Movie.id == movie_id)
+
+        fixed = query.update(values, synchronize_session=False)
+        self.db.commit()
+        return fixed
 
     def delete_ratings_by_movie_id(self, movie_id: int):
         """Delete all ratings for a specific movie"""
         self.db.query(MovieRating).filter(MovieRating.movie_id == movie_id).delete()
+        RatingRollupRepository(self.db).delete_by_movie(movie_id)
+        reset = {Movie.ratings_count: 0, Movie.ratings_sum: 0}
+        reset.update({Movie.histogram_column(score): 0 for score in RATING_SCORES})
+        self.db.query(Movie).filter(Movie.id == movie_id).update(
+            reset,
+            synchronize_session=False
+        )
         self.db.commit()
@@ -0,0 +1,44 @@
+import base64
+import json
+from typing import List, Optional, Tuple
+
+from app.exceptions.custom_exceptions import ValidationError
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last seen id as an opaque cursor"""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))["id"]
+    except (ValueError, KeyError, TypeError):
+        raise ValidationError("Invalid cursor")
+
+    if not isinstance(last_id, int):
+        raise ValidationError("Invalid cursor")
+    return last_id
+
+
+def keyset_page(query, key_column, limit: int, skip: int = 0,
+                after: Optional[int] = None) -> Tuple[List, Optional[int]]:
+    """
+    Fetch one page ordered by an indexed, unique key column.
+    With `after` the page starts right after that key (keyset), otherwise
+    `skip` rows are skipped (offset). One extra row is fetched to know whether
+    another page exists. Returns (items, key of the last item or None).
+    """
+    query = query.order_by(key_column)
+    if after is not None:
+        query = query.filter(key_column > after)
+    elif skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+    items = rows[:limit]
+    has_more = len(rows) > limit
+    return items, (items[-1].id if has_more else None)
@@ -1,7 +1,16 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, List, Set, Tuple
+from sqlalchemy import bindparam, insert, update
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from app.models.movie import Movie, RATING_SCORES
 from app.models.rating import MovieRating
 from app.repositories.base_repository import BaseRepository
+from app.repositories.rollup_repository import RatingRollupRepository
+from app.exceptions.custom_exceptions import NotFoundError
+
+# Ids bound per IN query (SQLite caps bound parameters per statement)
+ID_LOOKUP_CHUNK = 500
 
 
 class RatingRepository(BaseRepository[MovieRating]):
@@ -9,6 +18,87 @@ class RatingRepository(BaseRepository[MovieRating]):
 
     def __init__(self, db: Session):
         super().__init__(db, MovieRating)
+        self.rollup_repo = RatingRollupRepository(db)
+
+    def add_rating(self, movie_id: int, score: int) -> MovieRating:
+        """Insert a rating and update the movie aggregates and rollups in one transaction"""
+        rating = MovieRating(movie_id=movie_id, score=score, created_at=datetime.utcnow())
+        self.db.add(rating)
+        self._apply_movie_stats(movie_id, score, 1)
+        self.rollup_repo.add_ratings([(movie_id, score, rating.created_at)])
+        self.db.commit()
+        self.db.refresh(rating)
+        return rating
+
+    def bulk_add_ratings(self, ratings: List[Tuple[int, int]]) -> int:
+        """
+        Insert many (movie_id, score) pairs and update the movie aggregates and
+        rollups in one transaction.
+        Rows go out as multi-row INSERTs and aggregates as one batched UPDATE per
+        distinct movie. Callers must have validated movie ids and scores.
+        """
+        if not ratings:
+            return 0
+
+        now = datetime.utcnow()
+        self.db.execute(
+            insert(MovieRating),
+            [{"movie_id": movie_id, "score": score, "created_at": now} for movie_id, score in ratings]
+        )
+
+        # movie_id -> per-score counts
+        deltas = defaultdict(lambda: dict.fromkeys(RATING_SCORES, 0))
+        for movie_id, score in ratings:
+            deltas[movie_id][score] += 1
+
+        movies = Movie.__table__
+        hist_values = {
+            f"rating_hist_{score}": movies.c[f"rating_hist_{score}"] + bindparam(f"hist_delta_{score}")
+            for score in RATING_SCORES
+        }
+        self.db.connection().execute(
+            update(movies).where(movies.c.id == bindparam("movie_id")).values(
+                ratings_count=movies.c.ratings_count + bindparam("count_delta"),
+                ratings_sum=movies.c.ratings_sum + bindparam("sum_delta"),
+                ranking_dirty=True,
+                **hist_values
+            ),
+            [
+                {
+                    "movie_id": movie_id,
+                    "count_delta": sum(counts.values()),
+                    "sum_delta": sum(score * n for score, n in counts.items()),
+                    **{f"hist_delta_{score}": n for score, n in counts.items()}
+                }
+                # Fixed lock order, so concurrent batches over the same movies cannot deadlock
+                for movie_id, counts in sorted(deltas.items())
+            ]
+        )
+        self.rollup_repo.add_ratings((movie_id, score, now) for movie_id, score in ratings)
+        self.db.commit()
+        return len(ratings)
+
+    def existing_movie_ids(self, movie_ids: Iterable[int]) -> Set[int]:
+        """Which of the given movie ids exist, one IN query per ID_LOOKUP_CHUNK ids"""
+        ids = sorted(set(movie_ids))
+        found = set()
+        for i in range(0, len(ids), ID_LOOKUP_CHUNK):
+            rows = self.db.query(Movie.id).filter(Movie.id.in_(ids[i:i + ID_LOOKUP_CHUNK])).all()
+            found.update(row.id for row in rows)
+        return found
+
+    def delete(self, id: int) -> bool:
+        """Delete a rating and update the movie aggregates and rollups in one transaction"""
+        rating = self.get_by_id(id)
+        if not rating:
+            raise NotFoundError("MovieRating not found")
+
+        self._apply_movie_stats(rating.movie_id, rating.score, -1)
+        if rating.created_at is not None:
+            self.rollup_repo.remove_rating(rating.movie_id, rating.score, rating.created_at)
+        self.db.delete(rating)
+        self.db.commit()
+        return True
 
     def get_by_movie(self, movie_id: int):
         """Get all ratings for a movie"""
@@ -18,13 +108,32 @@ class RatingRepository(BaseRepository[MovieRating]):
 
     def get_average(self, movie_id: int) -> float:
         """Average rating of a movie"""
-        result = self.db.query(func.avg(MovieRating.score)).filter(
-            MovieRating.movie_id == movie_id
-        ).scalar()
-        return round(result, 1) if result else None
+        stats = self.db.query(Movie.ratings_count, Movie.ratings_sum).filter(
+            Movie.id == movie_id
+        ).first()
+        if not stats or not stats.ratings_count:
+            return None
+        return round(stats.ratings_sum / stats.ratings_count, 1)
 
     def count_by_movie(self, movie_id: int) -> int:
         """Number of ratings for a movie"""
-        return self.db.query(func.count(MovieRating.id)).filter(
-            MovieRating.movie_id == movie_id
-        ).scalar()
+        return self.db.query(Movie.ratings_count).filter(
+            Movie.id == movie_id
+        ).scalar() or 0
+
+    def _apply_movie_stats(self, movie_id: int, score: int, sign: int):
+        """
+        Atomically add (sign=1) or remove (sign=-1) one score from a movie's
+        ratings_count / ratings_sum and histogram bucket, and flag its
+        ranking for the next leaderboard refresh (no commit)
+        """
+        bucket = Movie.histogram_column(score)
+        self.db.query(Movie).filter(Movie.id == movie_id).update(
+            {
+                Movie.ratings_count: Movie.ratings_count + sign,
+                Movie.ratings_sum: Movie.ratings_sum + sign * score,
+                bucket: bucket + sign,
+                Movie.ranking_dirty: True
+            },
+            synchronize_session=False
+        )
@@ -0,0 +1,143 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+from sqlalchemy import and_, or_, func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.models.movie import Movie
+from app.models.rollup import RatingRollup, HOUR, DAY, bucket_start
+
+# (movie_id, granularity, bucket_start) -> [ratings_count, ratings_sum]
+BucketDeltas = Dict[Tuple[int, str, datetime], List[int]]
+
+UPSERT_BATCH_SIZE = 5000
+
+
+class RatingRollupRepository:
+    """Data access for the per-movie hourly/daily rating buckets (no commits)"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_ratings(self, ratings: Iterable[Tuple[int, int, datetime]]):
+        """Fold (movie_id, score, created_at) ratings into their hourly buckets"""
+        deltas: BucketDeltas = defaultdict(lambda: [0, 0])
+        for movie_id, score, created_at in ratings:
+            delta = deltas[(movie_id, HOUR, bucket_start(created_at, HOUR))]
+            delta[0] += 1
+            delta[1] += score
+        self._upsert(deltas)
+
+    def remove_rating(self, movie_id: int, score: int, created_at: datetime):
+        """Take a deleted rating out of its hourly bucket, or its daily one once compacted"""
+        table = RatingRollup.__table__
+        for granularity in (HOUR, DAY):
+            result = self.db.connection().execute(
+                update(table).where(
+                    table.c.movie_id == movie_id,
+                    table.c.granularity == granularity,
+                    table.c.bucket_start == bucket_start(created_at, granularity)
+                ).values(
+                    ratings_count=table.c.ratings_count - 1,
+                    ratings_sum=table.c.ratings_sum - score
+                )
+            )
+            if result.rowcount:
+                return
+
+    def delete_by_movie(self, movie_id: int):
+        self.db.query(RatingRollup).filter(RatingRollup.movie_id == movie_id).delete(synchronize_session=False)
+
+    def trending(self, since: datetime, limit: int) -> List:
+        """
+        Movies with the most ratings since `since`, read from the buckets only.
+        Daily buckets are counted whole, so windows reaching past the hourly
+        retention are day-granular at their far edge.
+        """
+        ratings_count = func.sum(RatingRollup.ratings_count).label("ratings_count")
+        ratings_sum = func.sum(RatingRollup.ratings_sum).label("ratings_sum")
+        return self.db.query(
+            RatingRollup.movie_id, Movie.title, ratings_count, ratings_sum
+        ).join(Movie, Movie.id == RatingRollup.movie_id).filter(
+            or_(
+                and_(RatingRollup.granularity == HOUR, RatingRollup.bucket_start >= bucket_start(since, HOUR)),
+                and_(RatingRollup.granularity == DAY, RatingRollup.bucket_start >= bucket_start(since, DAY))
+            )
+        ).group_by(
+            RatingRollup.movie_id, Movie.title
+        ).having(
+            ratings_count > 0
+        ).order_by(
+            ratings_count.desc(), ratings_sum.desc(), RatingRollup.movie_id
+        ).limit(limit).all()
+
+    def compact(self, before: datetime) -> int:
+        """
+        Merge hourly buckets of whole days before `before` into daily buckets.
+        Returns the number of hourly buckets removed.
+        """
+        expired = (RatingRollup.granularity == HOUR, RatingRollup.bucket_start < bucket_start(before, DAY))
+        hourly = self.db.query(
+            RatingRollup.movie_id, RatingRollup.bucket_start,
+            RatingRollup.ratings_count, RatingRollup.ratings_sum
+        ).filter(*expired)
+
+        deltas: BucketDeltas = defaultdict(lambda: [0, 0])
+        for row in hourly.yield_per(UPSERT_BATCH_SIZE):
+            delta = deltas[(row.movie_id, DAY, bucket_start(row.bucket_start, DAY))]
+            delta[0] += row.ratings_count
+            delta[1] += row.ratings_sum
+        self._upsert(deltas)
+
+        return self.db.query(RatingRollup).filter(*expired).delete(synchronize_session=False)
+
+    def purge(self, before: datetime) -> int:
+        """Drop daily buckets older than `before`; returns the number removed"""
+        return self.db.query(RatingRollup).filter(
+            RatingRollup.granularity == DAY,
+            RatingRollup.bucket_start < bucket_start(before, DAY)
+        ).delete(synchronize_session=False)
+
+    def _upsert(self, deltas: BucketDeltas):
+        """Add count/sum deltas to buckets, creating missing ones"""
+        rows = [
+            {
+                "movie_id": movie_id, "granularity": granularity, "bucket_start": start,
+                "ratings_count": count, "ratings_sum": total
+            }
+            # Sorted like the movie aggregates, for a fixed lock order
+            for (movie_id, granularity, start), (count, total) in sorted(deltas.items())
+        ]
+        if not rows:
+            return
+
+        conn = self.db.connection()
+        table = RatingRollup.__table__
+        dialect = conn.dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            stmt = (postgresql if dialect == "postgresql" else sqlite).insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.movie_id, table.c.granularity, table.c.bucket_start],
+                set_={
+                    "ratings_count": table.c.ratings_count + stmt.excluded.ratings_count,
+                    "ratings_sum": table.c.ratings_sum + stmt.excluded.ratings_sum
+                }
+            )
+            for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+                conn.execute(stmt, rows[i:i + UPSERT_BATCH_SIZE])
+            return
+
+        # Portable fallback: update in place, insert the buckets that did not exist
+        for row in rows:
+            result = conn.execute(
+                update(table).where(
+                    table.c.movie_id == row["movie_id"],
+                    table.c.granularity == row["granularity"],
+                    table.c.bucket_start == row["bucket_start"]
+                ).values(
+                    ratings_count=table.c.ratings_count + row["ratings_count"],
+                    ratings_sum=table.c.ratings_sum + row["ratings_sum"]
+                )
+            )
+            if not result.rowcount:
+                conn.execute(table.insert(), row)
@@ -17,3 +17,9 @@ class MovieUpdateRequest(BaseModel):
     release_year: Optional[int] = Field(None, ge=1800, le=2100)
     cast: Optional[str] = Field(None, max_length=5000)
     genres: Optional[List[int]] = Field(None, min_length=1)
+
+
+class MovieBatchCreateRequest(BaseModel):
+    """Request to create many movies at once"""
+    # Items are validated one by one in the service, so a bad item only fails itself
+    movies: List[dict] = Field(..., min_length=1, max_length=10000, description="Movies to create (MovieCreateRequest)")
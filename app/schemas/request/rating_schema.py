@@ -1,6 +1,19 @@
 from pydantic import BaseModel, Field
+from typing import List
 
 
 class RatingCreateRequest(BaseModel):
     """Request to create a rating"""
     score: int = Field(..., ge=1, le=10, description="Rating from 1 to 10")
+
+
+class RatingBulkItem(BaseModel):
+    """One rating in a bulk request (range is checked per item, not per request)"""
+    movie_id: int = Field(..., description="Movie ID")
+    score: int = Field(..., description="Rating from 1 to 10")
+
+
+class RatingBulkCreateRequest(BaseModel):
+    """Request to create many ratings at once"""
+    # Items are validated one by one in the service, so a bad item only fails itself
+    ratings: List[dict] = Field(..., min_length=1, max_length=50000, description="Ratings to ingest (RatingBulkItem)")
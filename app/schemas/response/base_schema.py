@@ -1,11 +1,13 @@
 from pydantic import BaseModel
-from typing import Any, Dict, Optional, List
+from typing import Generic, Optional, List, TypeVar
 
+T = TypeVar("T")
 
-class SuccessResponse(BaseModel):
+
+class SuccessResponse(BaseModel, Generic[T]):
     """Success response format"""
     status: str = "success"
-    data: Any
+    data: T
 
 
 class ErrorDetail(BaseModel):
@@ -20,9 +22,10 @@ class ErrorResponse(BaseModel):
     error: ErrorDetail
 
 
-class PaginatedResponse(BaseModel):
+class PaginatedResponse(BaseModel, Generic[T]):
     """Paginated response format"""
-    page: int
+    page: Optional[int] = None
     page_size: int
     total_items: int
-    items: List[Any]
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from typing import Optional
+from datetime import datetime
 
 
 class DirectorResponse(BaseModel):
@@ -13,6 +14,18 @@ class DirectorResponse(BaseModel):
         from_attributes = True
 
 
+class DirectorListItem(DirectorResponse):
+    """Director in a list; stats only with include_stats=true"""
+    movies_count: Optional[int] = None
+    average_rating: Optional[float] = None
+
+
 class DirectorDetailResponse(DirectorResponse):
     """Detailed director response"""
     movies_count: int = 0
+    average_rating: Optional[float] = None
+
+
+class DirectorUpdatedResponse(DirectorResponse):
+    """Director after an update"""
+    updated_at: Optional[datetime] = None
@@ -12,6 +12,13 @@ class GenreResponse(BaseModel):
         from_attributes = True
 
 
+class GenreListItem(GenreResponse):
+    """Genre in a list; stats only with include_stats=true"""
+    movies_count: Optional[int] = None
+    average_rating: Optional[float] = None
+
+
 class GenreDetailResponse(GenreResponse):
     """Detailed genre response"""
     movies_count: int = 0
+    average_rating: Optional[float] = None
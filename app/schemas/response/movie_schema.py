@@ -1,5 +1,8 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Dict, Optional, List
+from datetime import datetime
+
+from app.schemas.response.director_schema import DirectorResponse
 
 
 class DirectorMinimal(BaseModel):
@@ -19,8 +22,9 @@ class MovieResponse(BaseModel):
     id: int
     title: str
     release_year: int
-    director: DirectorMinimal
+    director: Optional[DirectorMinimal] = None
     genres: List[str]
+    cast: Optional[str] = None
     average_rating: Optional[float] = None
     ratings_count: int = 0
 
@@ -28,15 +32,62 @@ class MovieResponse(BaseModel):
         from_attributes = True
 
 
+class MovieUpdatedResponse(MovieResponse):
+    """Movie after an update"""
+    updated_at: Optional[datetime] = None
+
+
 class MovieDetailResponse(MovieResponse):
     """Detailed movie response"""
-    cast: Optional[str] = None
-    director: Optional[dict] = None
+    director: Optional[DirectorResponse] = None
+    median_rating: Optional[float] = None
+    rating_histogram: Dict[int, int]
 
 
 class MoviePaginatedResponse(BaseModel):
     """Paginated list of movies"""
-    page: int
+    page: Optional[int] = None
     page_size: int
-    total_items: int
+    total_items: Optional[int] = None
+    total_is_estimate: bool = False
     items: List[MovieResponse]
+    next_cursor: Optional[str] = None
+
+
+class RatingHistogramResponse(BaseModel):
+    """Score distribution of a movie"""
+    movie_id: int
+    ratings_count: int
+    histogram: Dict[int, int]
+    median: Optional[float] = None
+    percentiles: Dict[str, Optional[float]]
+
+
+class TopMovieResponse(BaseModel):
+    """Leaderboard entry"""
+    rank: int
+    movie_id: int
+    title: str
+    release_year: int
+    score: float
+    average_rating: float
+    ratings_count: int
+
+
+class TopMoviesResponse(BaseModel):
+    """Leaderboard"""
+    items: List[TopMovieResponse]
+
+
+class TrendingMovieResponse(BaseModel):
+    """Movie ranked by ratings within a window"""
+    movie_id: int
+    title: str
+    ratings_count: int
+    average_rating: float
+
+
+class TrendingMoviesResponse(BaseModel):
+    """Trending movies of a window"""
+    window: str
+    items: List[TrendingMovieResponse]
@@ -12,3 +12,10 @@ class RatingResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class RatingQueuedResponse(BaseModel):
+    """Rating accepted by the write-behind buffer, not yet written"""
+    movie_id: int
+    score: int
+    queued: bool = True
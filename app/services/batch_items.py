@@ -0,0 +1,21 @@
+from typing import Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError as SchemaError
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def validate_item(schema: Type[M], raw: dict) -> Tuple[Optional[M], Optional[str]]:
+    """
+    Check one raw item of a batch request against `schema`.
+    Returns (model, None), or (None, error) with the pydantic errors as one
+    line, e.g. 'release_year: Input should be a valid integer', so a bad item
+    is reported by index instead of failing the whole batch.
+    """
+    try:
+        return schema.model_validate(raw), None
+    except SchemaError as e:
+        return None, "; ".join(
+            f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}"
+            for detail in e.errors()
+        )
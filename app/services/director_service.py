@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
 from app.repositories.director_repository import DirectorRepository
+from app.repositories.pagination import encode_cursor, decode_cursor
+from app.services.resource_version import resource_version
 from app.exceptions.custom_exceptions import NotFoundError, ValidationError
+from app.cache.caches import movie_detail_cache, movie_count_cache
 
 
 class DirectorService:
@@ -13,10 +16,33 @@ class DirectorService:
         """List directors"""
         return self.repo.get_all(skip, limit)
 
+    def get_directors_page(self, skip: int = 0, limit: int = 10, cursor: str = None):
+        """List directors by offset or cursor; returns (directors, next_cursor)"""
+        after_id = decode_cursor(cursor) if cursor else None
+        directors, last_id = self.repo.get_page(skip=skip, limit=limit, after_id=after_id)
+        return directors, encode_cursor(last_id) if last_id is not None else None
+
     def get_total_count(self) -> int:
         """Total number of directors"""
         return self.repo.count()
 
+    def get_movie_stats(self, director_ids) -> dict:
+        """{director_id: {"movies_count", "average_rating"}} for a page of directors, in one query"""
+        stats = self.repo.get_movie_stats(director_ids)
+        empty = {"movies_count": 0, "average_rating": None}
+        return {director_id: stats.get(director_id, empty) for director_id in director_ids}
+
+    def get_director_version(self, director_id: int) -> dict:
+        """ETag / Last-Modified of the director detail document, from one query"""
+        row = self.repo.get_version_row(director_id)
+        if row is None:
+            raise NotFoundError(f"Director with id {director_id} not found")
+        return resource_version(
+            "director", director_id,
+            (row.updated_at, row.movies_count, row.ratings_sum, row.ratings_count),
+            (row.updated_at, row.movies_updated_at)
+        )
+
     def get_director(self, director_id: int):
         """Get director details"""
         director = self.repo.get_by_id(director_id)
@@ -61,12 +87,14 @@ class DirectorService:
         if birth_year and (birth_year < 1800 or birth_year > 2100):
             raise ValidationError("Birth year must be between 1800 and 2100")
 
-        return self.repo.update(
+        director = self.repo.update(
             director_id,
             name=name.strip() if name else None,
             birth_year=birth_year,
             description=description
         )
+        movie_detail_cache.invalidate_many(self.repo.get_movie_ids(director_id))
+        return director
 
     def delete_director(self, director_id: int):
         """Delete director and all associated movies"""
@@ -74,4 +102,8 @@ class DirectorService:
         if not director:
             raise NotFoundError(f"Director with id {director_id} not found")
 
-        return self.repo.delete(director_id)
+        movie_ids = self.repo.get_movie_ids(director_id)
+        deleted = self.repo.delete(director_id)
+        movie_detail_cache.invalidate_many(movie_ids)
+        movie_count_cache.clear()
+        return deleted
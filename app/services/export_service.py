@@ -0,0 +1,114 @@
+import csv
+import io
+import os
+from typing import Dict, Iterator, List, Optional
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app.exceptions.custom_exceptions import ValidationError
+from app.repositories.movie_repository import MovieRepository
+
+# Movies fetched per server-side cursor batch; each batch becomes one response chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_COLUMNS = [
+    "id", "title", "release_year", "director_id", "director_name",
+    "genres", "cast", "average_rating", "ratings_count",
+]
+
+
+class ExportService:
+    """Streaming export of the whole movie catalog"""
+
+    def __init__(self, db: Session):
+        self.movie_repo = MovieRepository(db)
+        self.exported = 0
+
+    def export(
+            self,
+            fmt: str = "ndjson",
+            title: Optional[str] = None,
+            release_year: Optional[int] = None,
+            genre: Optional[str] = None,
+            batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[bytes]:
+        """
+        Encoded chunks of the export, one per batch of movies.
+        The format is checked here, before anything is streamed.
+        """
+        if fmt not in EXPORT_MEDIA_TYPES:
+            raise ValidationError(f"Invalid format: {fmt} (expected ndjson or csv)")
+        if batch_size < 1:
+            raise ValidationError("batch_size must be at least 1")
+
+        batches = self.iter_movies(title=title, release_year=release_year, genre=genre, batch_size=batch_size)
+        return _ndjson_chunks(batches) if fmt == "ndjson" else _csv_chunks(batches)
+
+    def iter_movies(
+            self,
+            title: Optional[str] = None,
+            release_year: Optional[int] = None,
+            genre: Optional[str] = None,
+            batch_size: int = EXPORT_BATCH_SIZE
+    ) -> Iterator[List[Dict]]:
+        """Batches of movies shaped like the listing items"""
+        for rows in self.movie_repo.iter_export_batches(
+            title=title,
+            release_year=release_year,
+            genre_name=genre,
+            batch_size=batch_size
+        ):
+            self.exported += len(rows)
+            yield [
+                {
+                    "id": row["id"],
+                    "title": row["title"],
+                    "release_year": row["release_year"],
+                    "director": {
+                        "id": row["director_id"],
+                        "name": row["director_name"]
+                    } if row["director_id"] is not None else None,
+                    "genres": row["genres"],
+                    "cast": row["cast"],
+                    "average_rating": row["ratings_sum"] / row["ratings_count"] if row["ratings_count"] else None,
+                    "ratings_count": row["ratings_count"] or 0
+                }
+                for row in rows
+            ]
+
+
+def _ndjson_chunks(batches: Iterator[List[Dict]]) -> Iterator[bytes]:
+    for movies in batches:
+        yield b"".join(orjson.dumps(movie) + b"\n" for movie in movies)
+
+
+def _csv_chunks(batches: Iterator[List[Dict]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for movies in batches:
+        for movie in movies:
+            director = movie["director"] or {}
+            writer.writerow([
+                movie["id"],
+                movie["title"],
+                movie["release_year"],
+                director.get("id"),
+                director.get("name"),
+                "|".join(movie["genres"]),
+                movie["cast"],
+                movie["average_rating"],
+                movie["ratings_count"],
+            ])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header of an empty export
+        yield buffer.getvalue().encode()
@@ -1,6 +1,9 @@
 from sqlalchemy.orm import Session
 from app.repositories.genre_repository import GenreRepository
+from app.repositories.pagination import encode_cursor, decode_cursor
+from app.services.resource_version import resource_version
 from app.exceptions.custom_exceptions import NotFoundError, ValidationError, ConflictError
+from app.cache.caches import movie_detail_cache, movie_count_cache
 
 
 class GenreService:
@@ -13,10 +16,33 @@ class GenreService:
         """List genres"""
         return self.repo.get_all(skip, limit)
 
+    def get_genres_page(self, skip: int = 0, limit: int = 10, cursor: str = None):
+        """List genres by offset or cursor; returns (genres, next_cursor)"""
+        after_id = decode_cursor(cursor) if cursor else None
+        genres, last_id = self.repo.get_page(skip=skip, limit=limit, after_id=after_id)
+        return genres, encode_cursor(last_id) if last_id is not None else None
+
     def get_total_count(self) -> int:
         """Total number of genres"""
         return self.repo.count()
 
+    def get_movie_stats(self, genre_ids) -> dict:
+        """{genre_id: {"movies_count", "average_rating"}} for a page of genres, in one query"""
+        stats = self.repo.get_movie_stats(genre_ids)
+        empty = {"movies_count": 0, "average_rating": None}
+        return {genre_id: stats.get(genre_id, empty) for genre_id in genre_ids}
+
+    def get_genre_version(self, genre_id: int) -> dict:
+        """ETag / Last-Modified of the genre detail document, from one query"""
+        row = self.repo.get_version_row(genre_id)
+        if row is None:
+            raise NotFoundError(f"Genre with id {genre_id} not found")
+        return resource_version(
+            "genre", genre_id,
+            (row.updated_at, row.movies_count, row.ratings_sum, row.ratings_count),
+            (row.updated_at, row.movies_updated_at)
+        )
+
     def get_genre(self, genre_id: int):
         """Get genre details"""
         genre = self.repo.get_by_id(genre_id)
@@ -59,11 +85,15 @@ class GenreService:
             if existing:
                 raise ConflictError(f"Genre with name '{name}' already exists")
 
-        return self.repo.update(
+        genre = self.repo.update(
             genre_id,
             name=name.strip() if name else None,
             description=description
         )
+        movie_detail_cache.invalidate_many(self.repo.get_movie_ids(genre_id))
+        # Listing totals are keyed by genre name
+        movie_count_cache.clear()
+        return genre
 
     def delete_genre(self, genre_id: int):
         """Delete a genre (movies are not deleted)"""
@@ -71,4 +101,8 @@ class GenreService:
         if not genre:
             raise NotFoundError(f"Genre with id {genre_id} not found")
 
-        return self.repo.delete(genre_id)
+        movie_ids = self.repo.get_movie_ids(genre_id)
+        deleted = self.repo.delete(genre_id)
+        movie_detail_cache.invalidate_many(movie_ids)
+        movie_count_cache.clear()
+        return deleted
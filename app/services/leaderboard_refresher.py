@@ -0,0 +1,89 @@
+import logging
+import os
+import threading
+from typing import Callable, Dict
+
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.services.leaderboard_service import LEADERBOARD_REFRESH_INTERVAL, LeaderboardService
+
+logger = logging.getLogger("movie_rating")
+
+# Refresh the ranking tables from a background thread in each worker
+LEADERBOARD_BACKGROUND_REFRESH = os.getenv("LEADERBOARD_BACKGROUND_REFRESH", "true").lower() in ("1", "true", "yes")
+
+
+class LeaderboardRefresher:
+    """
+    Background thread keeping the ranking tables fresh, so GET /movies/top
+    only reads them.
+
+    Every `interval` seconds it refreshes rankings older than
+    LEADERBOARD_REFRESH_INTERVAL. With several workers each runs one; the
+    locked state row and the age check make all but one of them a no-op.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], interval: float = LEADERBOARD_REFRESH_INTERVAL):
+        self.session_factory = session_factory
+        self.interval = interval
+
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stats = {"runs": 0, "refreshes": 0, "errors": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        """Start the background refresher"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="leaderboard-refresh", daemon=True)
+        self._thread.start()
+        logger.info(f"Leaderboard refresher started (interval={self.interval:g}s)")
+
+    def stop(self):
+        """Stop the refresher, waiting for a refresh in progress to finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        logger.info(f"Leaderboard refresher stopped ({self.stats()})")
+
+    def run_once(self):
+        """One refresh cycle; errors are logged and retried on the next one"""
+        db = self.session_factory()
+        try:
+            result = LeaderboardService(db).refresh_if_stale()
+        except Exception as e:
+            db.rollback()
+            with self._lock:
+                self._stats["runs"] += 1
+                self._stats["errors"] += 1
+            logger.error(f"Leaderboard refresh failed: {str(e)}", exc_info=True)
+            return
+        finally:
+            db.close()
+
+        with self._lock:
+            self._stats["runs"] += 1
+            if result is not None:
+                self._stats["refreshes"] += 1
+        if result is not None:
+            logger.info(f"Leaderboard refreshed: {result}")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+
+leaderboard_refresher = LeaderboardRefresher(SessionLocal)
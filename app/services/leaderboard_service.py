@@ -0,0 +1,93 @@
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.repositories.leaderboard_repository import LeaderboardRepository
+from app.repositories.genre_repository import GenreRepository
+from app.exceptions.custom_exceptions import NotFoundError
+
+# Prior weight C of the Bayesian average: a movie needs about C ratings before
+# its own mean outweighs the global mean
+LEADERBOARD_PRIOR_WEIGHT = float(os.getenv("LEADERBOARD_PRIOR_WEIGHT", "25"))
+# The background refresher brings the rankings up to date this often (seconds)
+LEADERBOARD_REFRESH_INTERVAL = float(os.getenv("LEADERBOARD_REFRESH_INTERVAL", "60"))
+# A full rebuild is forced once the global mean moves further than this from
+# the mean the current rankings were computed with
+LEADERBOARD_MEAN_TOLERANCE = float(os.getenv("LEADERBOARD_MEAN_TOLERANCE", "0.05"))
+
+
+class LeaderboardService:
+    """Top-rated movies ranked by a Bayesian (shrinkage) average"""
+
+    def __init__(self, db: Session):
+        self.repo = LeaderboardRepository(db)
+        self.genre_repo = GenreRepository(db)
+        self.db = db
+
+    def refresh(self, full: bool = False, only_if_stale: bool = False) -> Optional[Dict]:
+        """
+        Bring the ranking tables up to date.
+        Only movies flagged ranking_dirty by a write are recomputed, unless
+        this is the first run, `full` is set or the global mean has drifted.
+        With `only_if_stale`, returns None without doing anything when the
+        rankings (as read under the lock) are still fresh.
+        """
+        state = self.repo.get_state(lock=True)
+        if only_if_stale and not self._is_stale(state):
+            # Another refresher got here first while we waited for the lock
+            self.db.rollback()
+            return None
+        movie_ids = self.repo.claim_dirty_movies()
+        mean = self.repo.global_mean()
+
+        if mean is None:
+            self.repo.save_state(state, None)
+            self.db.commit()
+            return {"mode": "empty", "movies": 0}
+
+        drifted = state.global_mean is None or abs(mean - state.global_mean) > LEADERBOARD_MEAN_TOLERANCE
+        if full or drifted:
+            self.repo.rebuild(mean, LEADERBOARD_PRIOR_WEIGHT)
+            self.repo.save_state(state, mean)
+            self.db.commit()
+            return {"mode": "full", "global_mean": mean}
+
+        # Keep scoring against the stored mean so all rows stay comparable
+        self.repo.refresh_movies(movie_ids, state.global_mean, LEADERBOARD_PRIOR_WEIGHT)
+        self.repo.save_state(state, state.global_mean)
+        self.db.commit()
+        return {"mode": "incremental", "movies": len(movie_ids)}
+
+    def refresh_if_stale(self) -> Optional[Dict]:
+        """Refresh when the rankings are older than LEADERBOARD_REFRESH_INTERVAL"""
+        # Unlocked check first, so fresh rankings cost no lock; refresh checks again under it
+        if not self._is_stale(self.repo.get_state()):
+            self.db.rollback()
+            return None
+        return self.refresh(only_if_stale=True)
+
+    @staticmethod
+    def _is_stale(state) -> bool:
+        age_limit = datetime.utcnow() - timedelta(seconds=LEADERBOARD_REFRESH_INTERVAL)
+        return state.global_mean is None or state.refreshed_at is None or state.refreshed_at < age_limit
+
+    def get_top_movies(self, limit: int = 10, genre_id: Optional[int] = None,
+                       release_year: Optional[int] = None) -> List[Dict]:
+        """Top-N movies, optionally within a genre and/or release year (read only)"""
+        if genre_id is not None and not self.genre_repo.get_by_id(genre_id):
+            raise NotFoundError(f"Genre with id {genre_id} not found")
+
+        return [
+            {
+                "rank": position,
+                "movie_id": row.movie_id,
+                "title": row.title,
+                "release_year": row.release_year,
+                "score": round(row.bayesian_score, 4),
+                "average_rating": round(row.average_rating, 2),
+                "ratings_count": row.ratings_count
+            }
+            for position, row in enumerate(
+                self.repo.top(limit=limit, genre_id=genre_id, release_year=release_year), start=1
+            )
+        ]
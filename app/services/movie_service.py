@@ -1,4 +1,5 @@
-from typing import List, Dict, Optional, Tuple
+from datetime import datetime
+from typing import List, Dict, NamedTuple, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from app.models.movie import Movie
@@ -6,12 +7,27 @@ from app.models.rating import MovieRating
 from app.repositories.movie_repository import MovieRepository
 from app.repositories.genre_repository import GenreRepository
 from app.repositories.director_repository import DirectorRepository
+from app.repositories.rating_repository import RatingRepository
+from app.repositories.pagination import encode_cursor, decode_cursor
+from app.services.rating_buffer import rating_buffer
+from app.services.batch_items import validate_item
+from app.services.resource_version import resource_version
+from app.cache.caches import movie_detail_cache, movie_count_cache
+from app.schemas.request.movie_schema import MovieCreateRequest
 from app.exceptions.custom_exceptions import (
     NotFoundError,
     ValidationError
 )
 
 
+class MoviePage(NamedTuple):
+    """One page of the movie listing"""
+    items: List[Movie]
+    total_items: Optional[int]
+    total_is_estimate: bool
+    next_cursor: Optional[str]
+
+
 class MovieService:
     """Movie management service"""
 
@@ -20,6 +36,7 @@ class MovieService:
         self.movie_repo = MovieRepository(db)
         self.genre_repo = GenreRepository(db)
         self.director_repo = DirectorRepository(db)
+        self.rating_repo = RatingRepository(db)
         self.db = db
 
     def get_all_movies(
@@ -28,31 +45,68 @@ class MovieService:
             page_size: int = 10,
             title: Optional[str] = None,
             release_year: Optional[int] = None,
-            genre: Optional[str] = None
-    ) -> Tuple[List[Movie], int]:
+            genre: Optional[str] = None,
+            cursor: Optional[str] = None,
+            include_total: bool = True
+    ) -> MoviePage:
         """
-        Get all movies with filtering and pagination
+        Get all movies with filtering and pagination.
+        When a cursor is given, paging is keyset-based and `page` is ignored.
+        With include_total=False no count is run and total_items is None.
         """
         if page < 1:
             raise ValidationError(f"Page must be positive, received: {page}")
 
+        after_id = decode_cursor(cursor) if cursor else None
         skip = (page - 1) * page_size
 
-        movies = self.movie_repo.search_movies(
+        movies, last_id = self.movie_repo.search_movies(
             skip=skip,
             limit=page_size,
             title=title,
             release_year=release_year,
-            genre_name=genre
+            genre_name=genre,
+            after_id=after_id
         )
 
-        total_items = self.movie_repo.count_with_filters(
-            title=title,
-            release_year=release_year,
-            genre_name=genre
-        )
+        total_items, total_is_estimate = None, False
+        if include_total:
+            total_items, total_is_estimate = self.count_movies(
+                title=title,
+                release_year=release_year,
+                genre=genre
+            )
+
+        next_cursor = encode_cursor(last_id) if last_id is not None else None
+        return MoviePage(movies, total_items, total_is_estimate, next_cursor)
 
-        return movies, total_items
+    def count_movies(
+            self,
+            title: Optional[str] = None,
+            release_year: Optional[int] = None,
+            genre: Optional[str] = None
+    ) -> Tuple[int, bool]:
+        """
+        Number of movies matching the filters, as (total, is_estimate).
+        The unfiltered total comes from planner statistics where the database
+        keeps them; everything else is an exact count memoized for a short TTL.
+        """
+        filtered = bool(title or release_year or genre)
+        if not filtered:
+            estimate = self.movie_repo.estimate_count()
+            if estimate is not None:
+                return estimate, True
+
+        key = (title, release_year, genre)
+        total = movie_count_cache.get_or_set(
+            key,
+            lambda: self.movie_repo.count_with_filters(
+                title=title,
+                release_year=release_year,
+                genre_name=genre
+            )
+        )
+        return total, False
 
     def get_movie_by_id(self, movie_id: int) -> Movie:
         """Get movie by ID"""
@@ -61,6 +115,77 @@ class MovieService:
             raise NotFoundError(f"Movie with ID {movie_id} not found")
         return movie
 
+    def get_movie_version(self, movie_id: int) -> Dict:
+        """ETag / Last-Modified of the movie detail document, from one primary-key lookup"""
+        row = self.movie_repo.get_version_row(movie_id)
+        if not row:
+            raise NotFoundError(f"Movie with ID {movie_id} not found")
+        return resource_version(
+            "movie", movie_id, tuple(row),
+            (row.updated_at, row.director_updated_at, row.genres_updated_at)
+        )
+
+    def get_movie_detail(self, movie_id: int) -> Dict:
+        """
+        Movie detail document (director, genres, rating stats) with its version,
+        as {"data": ..., "version": ...}.
+        Served from movie_detail_cache; writes that affect it invalidate the entry.
+        """
+        return movie_detail_cache.get_or_set(movie_id, lambda: self._build_movie_detail(movie_id))
+
+    def _build_movie_detail(self, movie_id: int) -> Dict:
+        movie = self.movie_repo.get_with_relations(movie_id)
+        if not movie:
+            raise NotFoundError(f"Movie with ID {movie_id} not found")
+
+        # The version is derived from the rows the document is built from, so a
+        # write landing between two reads cannot pair an old version with new data.
+        # Same parts as get_version_row, so the ETags match.
+        director_updated_at = movie.director.updated_at if movie.director else None
+        genre_timestamps = [genre.updated_at for genre in movie.genres if genre.updated_at is not None]
+        genres_updated_at = max(genre_timestamps) if genre_timestamps else None
+        version = resource_version(
+            "movie", movie_id,
+            (movie.updated_at, movie.ratings_count, movie.ratings_sum,
+             director_updated_at, len(movie.genres), genres_updated_at),
+            (movie.updated_at, director_updated_at, genres_updated_at)
+        )
+
+        data = {
+            "id": movie.id,
+            "title": movie.title,
+            "release_year": movie.release_year,
+            "director": {
+                "id": movie.director.id,
+                "name": movie.director.name,
+                "birth_year": movie.director.birth_year,
+                "description": movie.director.description
+            } if movie.director else None,
+            "genres": [genre.name for genre in movie.genres],
+            "cast": movie.cast,
+            "average_rating": movie.get_average_rating(),
+            "ratings_count": movie.get_ratings_count(),
+            "median_rating": movie.get_median_rating(),
+            "rating_histogram": movie.get_rating_histogram()
+        }
+        return {"version": version, "data": data}
+
+    def get_rating_histogram(self, movie_id: int) -> Dict:
+        """
+        Score distribution of a movie with median and percentiles.
+        Everything is derived from the stored histogram; no rating rows are read.
+        """
+        movie = self.get_movie_by_id(movie_id)
+        return {
+            "movie_id": movie.id,
+            "ratings_count": movie.get_ratings_count(),
+            "histogram": movie.get_rating_histogram(),
+            "median": movie.get_median_rating(),
+            "percentiles": {
+                f"p{p}": movie.get_rating_percentile(p) for p in (10, 25, 50, 75, 90)
+            }
+        }
+
     def _validate_director(self, director_id: int):
         """Helper to validate director existence and ID limits"""
         if director_id > 2147483647:
@@ -71,42 +196,109 @@ class MovieService:
             raise ValidationError(f"Director with id {director_id} not found")
         return director
 
+    def _resolve_genres(self, genre_ids: List[int]) -> List:
+        """Load the genres for a list of ids with one IN query; unknown ids are a ValidationError"""
+        for genre_id in genre_ids:
+            if genre_id > 2147483647:
+                raise ValidationError(f"Invalid genre_id: {genre_id}")
+
+        found = {genre.id: genre for genre in self.genre_repo.get_by_ids(genre_ids)}
+        for genre_id in genre_ids:
+            if genre_id not in found:
+                raise ValidationError(f"Genre with id {genre_id} not found")
+        return [found[genre_id] for genre_id in dict.fromkeys(genre_ids)]
+
     def create_movie(self, title: str, director_id: int, release_year: int,
                      cast: str, genres: Optional[List[int]] = None) -> Movie:
-        """Create a new movie"""
+        """Create a new movie with its genre links in one transaction"""
         if not title or len(title.strip()) == 0:
             raise ValidationError("Movie title cannot be empty")
 
         self._validate_director(director_id)
+        valid_genres = self._resolve_genres(genres) if genres else []
 
-        valid_genres = []
-        if genres:
-            for genre_id in genres:
-                if genre_id > 2147483647:
-                    raise ValidationError(f"Invalid genre_id: {genre_id}")
-
-                genre = self.genre_repo.get_by_id(genre_id)
-                if not genre:
-                    raise ValidationError(f"Genre with id {genre_id} not found")
-                valid_genres.append(genre)
-
-        movie = self.movie_repo.create(
+        movie = Movie(
             title=title,
             director_id=director_id,
             release_year=release_year,
-            cast=cast
+            cast=cast,
+            genres=valid_genres
         )
+        self.db.add(movie)
+        self.db.commit()
 
-        if valid_genres:
-            movie.genres.extend(valid_genres)
-            self.db.commit()
-
+        movie_count_cache.clear()
         return movie
 
+    def create_movies_batch(self, items: List[Dict]) -> Dict:
+        """
+        Create many movies in one transaction.
+        Each raw item is validated against MovieCreateRequest, then directors
+        and genres are checked with one IN query each; invalid items are
+        skipped and reported by index, the rest are inserted.
+        """
+        failures = []
+        valid = []
+        for index, raw in enumerate(items):
+            item, error = validate_item(MovieCreateRequest, raw)
+            if error:
+                failures.append({"index": index, "title": raw.get("title"), "error": error})
+            else:
+                valid.append((index, item.model_dump()))
+
+        director_ids = self.director_repo.existing_ids(
+            item["director_id"] for _, item in valid if item["director_id"] <= 2147483647
+        )
+        genres = {
+            genre.id: genre for genre in self.genre_repo.get_by_ids(
+                genre_id for _, item in valid for genre_id in item["genres"]
+                if 0 < genre_id <= 2147483647
+            )
+        }
+
+        created = []
+        for index, item in valid:
+            missing_genres = [g for g in item.get("genres") or [] if g not in genres]
+            if not item["title"] or not item["title"].strip():
+                error = "Movie title cannot be empty"
+            elif item["director_id"] not in director_ids:
+                error = f"Director with id {item['director_id']} not found"
+            elif missing_genres:
+                error = f"Genre with id {missing_genres[0]} not found"
+            else:
+                created.append((index, Movie(
+                    title=item["title"],
+                    director_id=item["director_id"],
+                    release_year=item["release_year"],
+                    cast=item.get("cast"),
+                    genres=[genres[g] for g in dict.fromkeys(item.get("genres") or [])]
+                )))
+                continue
+            failures.append({"index": index, "title": item["title"], "error": error})
+        failures.sort(key=lambda failure: failure["index"])
+
+        if created:
+            self.db.add_all([movie for _, movie in created])
+            # Ids are needed for the response; read them before commit expires the objects
+            self.db.flush()
+            items_created = [{"index": index, "id": movie.id} for index, movie in created]
+            self.db.commit()
+            movie_count_cache.clear()
+        else:
+            items_created = []
+
+        return {
+            "received": len(items),
+            "created": len(items_created),
+            "failed": len(failures),
+            "items": items_created,
+            "failures": failures
+        }
+
     def update_movie(self, movie_id: int, title: Optional[str] = None,
                      director_id: Optional[int] = None, release_year: Optional[int] = None,
                      cast: Optional[str] = None, genres: Optional[List[int]] = None) -> Movie:
-        """Update a movie"""
+        """Update a movie in one transaction"""
         movie = self.get_movie_by_id(movie_id)
 
         if title is not None:
@@ -122,20 +314,18 @@ class MovieService:
         if cast is not None: movie.cast = cast
 
         if genres is not None:
-            new_genres = []
-            for genre_id in genres:
-                if genre_id > 2147483647:
-                    raise ValidationError(f"Invalid genre_id: {genre_id}")
-
-                genre = self.genre_repo.get_by_id(genre_id)
-                if not genre:
-                    raise ValidationError(f"Genre with id {genre_id} not found")
-                new_genres.append(genre)
+            movie.genres = self._resolve_genres(genres)
+            # Only the link table changes, which would not trigger the onupdate
+            movie.updated_at = datetime.utcnow()
 
-            movie.genres = new_genres
+        if release_year is not None or genres is not None:
+            # Ranking rows carry release year and genre links
+            movie.ranking_dirty = True
 
         self.db.commit()
         self.db.refresh(movie)
+        movie_detail_cache.invalidate(movie_id)
+        movie_count_cache.clear()
         return movie
 
     def delete_movie(self, movie_id: int) -> None:
@@ -146,6 +336,8 @@ class MovieService:
 
         self.movie_repo.delete_ratings_by_movie_id(movie_id)
         self.movie_repo.delete(movie_id)
+        movie_detail_cache.invalidate(movie_id)
+        movie_count_cache.clear()
 
     def add_rating(self, movie_id: int, score: int) -> MovieRating:
         """Add a rating to a movie"""
@@ -156,14 +348,28 @@ class MovieService:
                 f"Rating must be between 1 and 10, received: {score}"
             )
 
-        rating = MovieRating(movie_id=movie_id, score=score)
-        self.db.add(rating)
-        self.db.commit()
-        self.db.refresh(rating)
-
+        rating = self.rating_repo.add_rating(movie_id=movie_id, score=score)
+        movie_detail_cache.invalidate(movie_id)
         return rating
 
+    def queue_rating(self, movie_id: int, score: int) -> bool:
+        """
+        Validate a rating and hand it to the write-behind buffer.
+        Returns False when the buffer is full; the caller should then use add_rating.
+        """
+        self.get_movie_by_id(movie_id)
+
+        if not (1 <= score <= 10):
+            raise ValidationError(
+                f"Rating must be between 1 and 10, received: {score}"
+            )
+
+        return rating_buffer.submit(movie_id, score)
+
     def get_movie_stats(self, movie_id: int) -> Dict:
         """Get movie statistics"""
-        self.get_movie_by_id(movie_id)
-        return self.movie_repo.get_movie_stats(movie_id)
+        movie = self.get_movie_by_id(movie_id)
+        return {
+            "average_rating": movie.get_average_rating(),
+            "ratings_count": movie.get_ratings_count()
+        }
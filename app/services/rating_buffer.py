@@ -0,0 +1,196 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.services.rating_service import RatingService
+
+logger = logging.getLogger("movie_rating")
+
+# Write-behind mode: ratings are acknowledged once queued and written in batches
+RATING_WRITE_BEHIND = os.getenv("RATING_WRITE_BEHIND", "false").lower() in ("1", "true", "yes")
+# Flush as soon as this many ratings are pending
+RATING_BUFFER_BATCH_SIZE = int(os.getenv("RATING_BUFFER_BATCH_SIZE", "500"))
+# ...or when the oldest pending rating is this many seconds old
+RATING_BUFFER_FLUSH_INTERVAL = float(os.getenv("RATING_BUFFER_FLUSH_INTERVAL", "1.0"))
+# Upper bound on acknowledged-but-unwritten ratings (what a crash can lose);
+# beyond it, callers fall back to the synchronous write path
+RATING_BUFFER_MAX_PENDING = int(os.getenv("RATING_BUFFER_MAX_PENDING", "10000"))
+# On shutdown, failed flushes are retried with backoff for up to this many seconds
+RATING_BUFFER_SHUTDOWN_TIMEOUT = float(os.getenv("RATING_BUFFER_SHUTDOWN_TIMEOUT", "30"))
+
+
+class RatingWriteBuffer:
+    """
+    In-process write-behind queue for ratings.
+
+    A background thread drains the queue in size- or time-bounded batches
+    through RatingService.create_ratings_bulk, so each batch is one
+    multi-row INSERT plus one aggregate update and a single commit.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session],
+                 batch_size: int = RATING_BUFFER_BATCH_SIZE,
+                 flush_interval: float = RATING_BUFFER_FLUSH_INTERVAL,
+                 max_pending: int = RATING_BUFFER_MAX_PENDING,
+                 shutdown_timeout: float = RATING_BUFFER_SHUTDOWN_TIMEOUT):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.shutdown_timeout = shutdown_timeout
+
+        self._pending: Deque[Tuple[int, int]] = deque()
+        # Monotonic enqueue time of the oldest pending rating (None when the queue is empty)
+        self._oldest: Optional[float] = None
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._running = False
+        # rejected: invalid ratings; dropped: acknowledged ratings lost to database errors
+        self._stats = {"queued": 0, "written": 0, "rejected": 0, "dropped": 0, "flushes": 0, "errors": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        """Start the background flusher"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="rating-write-behind", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Rating write-behind started (batch_size={self.batch_size}, "
+            f"interval={self.flush_interval}s, max_pending={self.max_pending})"
+        )
+
+    def stop(self):
+        """
+        Stop the flusher and write everything still pending. Failed flushes
+        are retried with backoff until the queue is empty or shutdown_timeout
+        has passed; whatever is left then is dropped and logged.
+        """
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        delay = 0.1
+        while True:
+            self.flush()
+            with self._cond:
+                remaining = len(self._pending)
+            if not remaining:
+                break
+            if time.monotonic() + delay > deadline:
+                with self._cond:
+                    remaining = len(self._pending)
+                    self._pending.clear()
+                    self._oldest = None
+                    self._stats["dropped"] += remaining
+                logger.error(
+                    f"Rating write-behind stopped with {remaining} acknowledged rating(s) unwritten; "
+                    f"they were dropped after {self.shutdown_timeout:g}s of retries"
+                )
+                break
+            logger.warning(f"Rating write-behind: {remaining} rating(s) still pending, retrying in {delay:.1f}s")
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0)
+        logger.info(f"Rating write-behind stopped ({self.stats()})")
+
+    def submit(self, movie_id: int, score: int) -> bool:
+        """Queue a validated rating; False when the pending limit is reached"""
+        with self._cond:
+            if not self._running or len(self._pending) >= self.max_pending:
+                return False
+            if not self._pending:
+                # Starts the flush interval; wakes the flusher idling on an empty queue
+                self._oldest = time.monotonic()
+                self._cond.notify()
+            self._pending.append((movie_id, score))
+            self._stats["queued"] += 1
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+            return True
+
+    def flush(self) -> int:
+        """Write all pending ratings now; returns the number written"""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                    if not self._pending:
+                        self._oldest = None
+                if not batch:
+                    return written
+                count = self._write(batch)
+                if count is None:
+                    # Database error: the batch was re-queued, retry on the next cycle
+                    return written
+                written += count
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return dict(self._stats, pending=len(self._pending))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                # Flush once the batch is full or the oldest pending rating is flush_interval old
+                while self._running and len(self._pending) < self.batch_size:
+                    if self._oldest is None:
+                        self._cond.wait()
+                        continue
+                    remaining = self._oldest + self.flush_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._running:
+                    return
+            self.flush()
+
+    def _write(self, batch: List[Tuple[int, int]]) -> Optional[int]:
+        db = self.session_factory()
+        try:
+            result = RatingService(db).create_ratings_bulk(batch)
+        except Exception as e:
+            db.rollback()
+            with self._cond:
+                self._stats["errors"] += 1
+                # Put the batch back unless that would exceed the durability limit
+                room = max(self.max_pending - len(self._pending), 0)
+                self._pending.extendleft(reversed(batch[:room]))
+                if self._pending:
+                    # Retry the failed batch one interval from now
+                    self._oldest = time.monotonic()
+                dropped = max(len(batch) - room, 0)
+                self._stats["dropped"] += dropped
+            logger.error(f"Rating write-behind flush failed (batch={len(batch)}): {str(e)}", exc_info=True)
+            if dropped:
+                logger.error(f"Rating write-behind dropped {dropped} acknowledged rating(s): queue full")
+            return None
+        finally:
+            db.close()
+
+        with self._cond:
+            self._stats["flushes"] += 1
+            self._stats["written"] += result["inserted"]
+            self._stats["rejected"] += result["failed"]
+        if result["failed"]:
+            logger.warning(f"Rating write-behind dropped {result['failed']} rating(s): {result['failures'][:5]}")
+        return result["inserted"]
+
+
+rating_buffer = RatingWriteBuffer(SessionLocal)
@@ -1,7 +1,11 @@
+from typing import Dict, List, Tuple
 from sqlalchemy.orm import Session
 from app.repositories.rating_repository import RatingRepository
 from app.repositories.movie_repository import MovieRepository
 from app.exceptions.custom_exceptions import NotFoundError, ValidationError
+from app.cache.caches import movie_detail_cache
+from app.schemas.request.rating_schema import RatingBulkItem
+from app.services.batch_items import validate_item
 
 
 class RatingService:
@@ -22,10 +26,74 @@ class RatingService:
         if not isinstance(score, int) or score < 1 or score > 10:
             raise ValidationError("Score must be an integer between 1 and 10")
 
-        return self.repo.create(
+        rating = self.repo.add_rating(
             movie_id=movie_id,
             score=score
         )
+        movie_detail_cache.invalidate(movie_id)
+        return rating
+
+    def create_ratings_bulk(self, items: List[Tuple[int, int]]) -> Dict:
+        """
+        Create many (movie_id, score) ratings in one transaction.
+        Invalid items are skipped and reported; the rest are inserted.
+        """
+        return self._create_bulk([(index, movie_id, score) for index, (movie_id, score) in enumerate(items)],
+                                 [], len(items))
+
+    def create_ratings_from_request(self, raw_items: List[Dict]) -> Dict:
+        """
+        create_ratings_bulk for raw request items: each one is validated
+        against RatingBulkItem first, and schema errors are reported by index too.
+        """
+        items = []
+        failures = []
+        for index, raw in enumerate(raw_items):
+            item, error = validate_item(RatingBulkItem, raw)
+            if error:
+                failures.append({"index": index, "movie_id": raw.get("movie_id"), "score": raw.get("score"), "error": error})
+            else:
+                items.append((index, item.movie_id, item.score))
+        return self._create_bulk(items, failures, len(raw_items))
+
+    def _create_bulk(self, items: List[Tuple[int, int, int]], failures: List[Dict], received: int) -> Dict:
+        """Insert the valid (index, movie_id, score) items; failures already holds earlier rejections"""
+        known_ids = self.repo.existing_movie_ids(
+            movie_id for _, movie_id, _ in items if 0 < movie_id <= 2147483647
+        )
+
+        valid = []
+        for index, movie_id, score in items:
+            if movie_id not in known_ids:
+                error = f"Movie with id {movie_id} not found"
+            elif score < 1 or score > 10:
+                error = "Score must be an integer between 1 and 10"
+            else:
+                valid.append((movie_id, score))
+                continue
+            failures.append({"index": index, "movie_id": movie_id, "score": score, "error": error})
+        failures.sort(key=lambda failure: failure["index"])
+
+        inserted = self.repo.bulk_add_ratings(valid)
+        movie_detail_cache.invalidate_many({movie_id for movie_id, _ in valid})
+
+        return {
+            "received": received,
+            "inserted": inserted,
+            "failed": len(failures),
+            "failures": failures
+        }
+
+    def delete_rating(self, rating_id: int):
+        """Delete a rating"""
+        rating = self.repo.get_by_id(rating_id)
+        if not rating:
+            raise NotFoundError(f"Rating with id {rating_id} not found")
+
+        movie_id = rating.movie_id
+        deleted = self.repo.delete(rating_id)
+        movie_detail_cache.invalidate(movie_id)
+        return deleted
 
     def get_movie_ratings(self, movie_id: int):
         """All ratings for a movie"""
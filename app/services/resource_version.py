@@ -0,0 +1,18 @@
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+
+def resource_version(kind: str, key: Any, parts: Iterable[Any],
+                     modified: Iterable[Optional[datetime]]) -> Dict:
+    """
+    Version of a rendered document: `etag` changes whenever any of `parts`
+    (everything the document is built from) changes; `last_modified` is the
+    latest of the given timestamps.
+    """
+    digest = hashlib.blake2b(repr((kind, key, *parts)).encode(), digest_size=16).hexdigest()
+    timestamps = [moment for moment in modified if moment is not None]
+    return {
+        "etag": digest,
+        "last_modified": max(timestamps) if timestamps else None
+    }
@@ -0,0 +1,52 @@
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List
+from sqlalchemy.orm import Session
+from app.repositories.rollup_repository import RatingRollupRepository
+from app.exceptions.custom_exceptions import ValidationError
+
+# Hourly buckets older than this are compacted into daily buckets
+RATING_ROLLUP_HOURLY_RETENTION_HOURS = int(os.getenv("RATING_ROLLUP_HOURLY_RETENTION_HOURS", "168"))
+# Daily buckets older than this are dropped
+RATING_ROLLUP_DAILY_RETENTION_DAYS = int(os.getenv("RATING_ROLLUP_DAILY_RETENTION_DAYS", "90"))
+
+TRENDING_WINDOWS = {
+    "1h": timedelta(hours=1),
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+
+
+class TrendingService:
+    """Trending movies from the time-bucketed rating rollups"""
+
+    def __init__(self, db: Session):
+        self.repo = RatingRollupRepository(db)
+        self.db = db
+
+    def get_trending(self, window: str = "24h", limit: int = 10) -> List[Dict]:
+        """Movies ranked by ratings received within the window (ties: higher score sum)"""
+        if window not in TRENDING_WINDOWS:
+            raise ValidationError(
+                f"Invalid window: {window} (expected one of {', '.join(TRENDING_WINDOWS)})"
+            )
+
+        since = datetime.utcnow() - TRENDING_WINDOWS[window]
+        return [
+            {
+                "movie_id": row.movie_id,
+                "title": row.title,
+                "ratings_count": row.ratings_count,
+                "average_rating": row.ratings_sum / row.ratings_count
+            }
+            for row in self.repo.trending(since, limit)
+        ]
+
+    def apply_retention(self) -> Dict:
+        """Compact expired hourly buckets into daily ones and drop expired daily buckets"""
+        now = datetime.utcnow()
+        compacted = self.repo.compact(now - timedelta(hours=RATING_ROLLUP_HOURLY_RETENTION_HOURS))
+        purged = self.repo.purge(now - timedelta(days=RATING_ROLLUP_DAILY_RETENTION_DAYS))
+        self.db.commit()
+        return {"hourly_compacted": compacted, "daily_purged": purged}
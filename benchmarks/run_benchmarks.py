@@ -0,0 +1,313 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_DB = os.path.join(tempfile.gettempdir(), "movie_rating_bench.db")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+GENRES = [
+    "Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary", "Drama",
+    "Family", "Fantasy", "History", "Horror", "Music", "Mystery", "Romance",
+    "Science Fiction", "Thriller", "War", "Western",
+]
+TITLE_WORDS = [
+    "Dark", "Night", "Star", "Love", "City", "Last", "Lost", "King", "Storm", "River",
+    "Ghost", "Iron", "Secret", "Silent", "Blue", "Road", "Empire", "Dream", "Fire", "Stone",
+]
+SEARCH_TITLE = "star"
+
+
+# ---------------------------------------------------------------------------
+# Dataset
+# ---------------------------------------------------------------------------
+
+def seed_dataset(engine, directors, movies, max_ratings, seed, batch_size=5000):
+    """Drop and recreate every table, then bulk-load a deterministic synthetic dataset"""
+    from sqlalchemy import insert
+    from app.models.base import Base
+    from app.models.director import Director
+    from app.models.genre import Genre
+    from app.models.movie import Movie, RATING_SCORES, movie_genres
+    from app.models.rating import MovieRating
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    def flush(conn, table, rows):
+        if rows:
+            conn.execute(insert(table), rows)
+            rows.clear()
+
+    with engine.begin() as conn:
+        conn.execute(insert(Genre.__table__), [
+            {"id": i, "name": name, "description": "Benchmark genre", "created_at": now, "updated_at": now}
+            for i, name in enumerate(GENRES, 1)
+        ])
+        conn.execute(insert(Director.__table__), [
+            {"id": i, "name": f"Director {i}", "birth_year": rng.randint(1930, 1995),
+             "description": "Benchmark director", "created_at": now, "updated_at": now}
+            for i in range(1, directors + 1)
+        ])
+
+        movie_rows, link_rows, rating_rows = [], [], []
+        rating_id = 0
+        for movie_id in range(1, movies + 1):
+            scores = [rng.randint(1, 10) for _ in range(rng.randint(0, max_ratings))]
+            movie_rows.append({
+                "id": movie_id,
+                "title": " ".join(rng.sample(TITLE_WORDS, 3)) + f" {movie_id}",
+                "director_id": rng.randint(1, directors),
+                "release_year": rng.randint(1970, 2024),
+                "cast": "Benchmark Cast",
+                "description": "Benchmark movie",
+                "ratings_count": len(scores),
+                "ratings_sum": sum(scores),
+                **{f"rating_hist_{score}": scores.count(score) for score in RATING_SCORES},
+                "created_at": now,
+                "updated_at": now,
+            })
+            for genre_id in rng.sample(range(1, len(GENRES) + 1), rng.randint(1, 3)):
+                link_rows.append({"movie_id": movie_id, "genre_id": genre_id})
+            for score in scores:
+                rating_id += 1
+                rating_rows.append({
+                    "id": rating_id, "movie_id": movie_id, "score": score,
+                    "created_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 365)),
+                })
+
+            if len(movie_rows) >= batch_size or len(rating_rows) >= batch_size:
+                flush(conn, Movie.__table__, movie_rows)
+                flush(conn, movie_genres, link_rows)
+                flush(conn, MovieRating.__table__, rating_rows)
+
+        flush(conn, Movie.__table__, movie_rows)
+        flush(conn, movie_genres, link_rows)
+        flush(conn, MovieRating.__table__, rating_rows)
+
+    return {"directors": directors, "genres": len(GENRES), "movies": movies, "ratings": rating_id}
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+def build_scenarios(dataset, rng):
+    """Scenario name -> callable producing (method, url, json body)"""
+    movies, directors, genres = dataset["movies"], dataset["directors"], dataset["genres"]
+
+    def listing(**filters):
+        def make():
+            params = {"page": rng.randint(1, 5), "page_size": 20}
+            for key, value in filters.items():
+                params[key] = value() if callable(value) else value
+            query = "&".join(f"{k}={v}" for k, v in params.items())
+            return "GET", f"/api/v1/movies?{query}", None
+        return make
+
+    year = lambda: rng.randint(1970, 2024)
+    genre = lambda: rng.choice(GENRES).replace(" ", "%20")
+
+    return {
+        "movies_list": listing(),
+        "movies_list_title": listing(title=SEARCH_TITLE),
+        "movies_list_year": listing(release_year=year),
+        "movies_list_genre": listing(genre=genre),
+        "movies_list_title_year": listing(title=SEARCH_TITLE, release_year=year),
+        "movies_list_title_genre": listing(title=SEARCH_TITLE, genre=genre),
+        "movies_list_year_genre": listing(release_year=year, genre=genre),
+        "movies_list_all_filters": listing(title=SEARCH_TITLE, release_year=year, genre=genre),
+        "movie_detail": lambda: ("GET", f"/api/v1/movies/{rng.randint(1, movies)}", None),
+        "rating_post": lambda: (
+            "POST", f"/api/v1/movies/{rng.randint(1, movies)}/ratings", {"score": rng.randint(1, 10)}
+        ),
+        "director_detail": lambda: ("GET", f"/api/v1/directors/{rng.randint(1, directors)}", None),
+        "genre_detail": lambda: ("GET", f"/api/v1/genres/{rng.randint(1, genres)}", None),
+    }
+
+
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(percent / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_scenario(client, make_request, requests, concurrency, warmup):
+    """Fire `requests` requests with `concurrency` in flight; returns the latency summary"""
+    for _ in range(warmup):
+        method, url, body = make_request()
+        await client.request(method, url, json=body)
+
+    latencies, errors, queries = [], 0, []
+    pending = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in pending:
+            method, url, body = make_request()
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+            if "x-db-query-count" in response.headers:
+                queries.append(int(response.headers["x-db-query-count"]))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "avg_queries": round(statistics.fmean(queries), 2) if queries else None,
+    }
+
+
+async def run_all(app, scenarios, only, requests, concurrency, warmup):
+    import httpx
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, make_request in scenarios.items():
+            if only and name not in only:
+                continue
+            results[name] = await run_scenario(client, make_request, requests, concurrency, warmup)
+            r = results[name]
+            print(
+                f"  {name:<26} p50 {r['p50_ms']:>8.2f} ms  p95 {r['p95_ms']:>8.2f} ms  "
+                f"p99 {r['p99_ms']:>8.2f} ms  {r['throughput_rps']:>8.1f} req/s  "
+                f"queries {r['avg_queries']}  errors {r['errors']}"
+            )
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def compare(results, baseline, tolerance):
+    """Scenarios whose p95 grew or throughput dropped by more than `tolerance` (fraction)"""
+    regressions = []
+    for name, base in baseline.get("scenarios", {}).items():
+        current = results.get(name)
+        if current is None:
+            continue
+        p95_change = current["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        rps_change = current["throughput_rps"] / base["throughput_rps"] - 1 if base["throughput_rps"] else 0.0
+        flag = p95_change > tolerance or rps_change < -tolerance
+        print(
+            f"  {name:<26} p95 {p95_change:+7.1%}  throughput {rps_change:+7.1%}"
+            f"{'  REGRESSION' if flag else ''}"
+        )
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP benchmarks for the hot API routes (in-process, via ASGI)")
+    parser.add_argument("--database-url", default=f"sqlite:///{DEFAULT_DB}",
+                        help="Scratch database; its tables are dropped and recreated")
+    parser.add_argument("--directors", type=int, default=500)
+    parser.add_argument("--movies", type=int, default=5000)
+    parser.add_argument("--max-ratings", type=int, default=40, help="Ratings per movie (0..N)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and request parameters")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data already in the database")
+    parser.add_argument("--requests", type=int, default=300, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--scenario", action="append", help="Only run this scenario (repeatable)")
+    parser.add_argument("--out", default="benchmark-results.json", help="Where to write the results")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed p95 / throughput change before a scenario counts as regressed")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 on regressions")
+    args = parser.parse_args()
+
+    # The app reads its settings at import time
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("RATING_WRITE_BEHIND", "false")
+
+    import logging
+    import sqlalchemy
+    from app.db.database import engine
+    from app.main import app
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.skip_seed:
+        from sqlalchemy import func, select
+        from app.models.director import Director
+        from app.models.movie import Movie
+        from app.models.rating import MovieRating
+        with engine.connect() as conn:
+            dataset = {
+                "directors": conn.execute(select(func.count(Director.id))).scalar(),
+                "genres": len(GENRES),
+                "movies": conn.execute(select(func.count(Movie.id))).scalar(),
+                "ratings": conn.execute(select(func.count(MovieRating.id))).scalar(),
+            }
+    else:
+        print(f"Seeding {args.movies} movies / {args.directors} directors ...")
+        started = time.perf_counter()
+        dataset = seed_dataset(engine, args.directors, args.movies, args.max_ratings, args.seed)
+        print(f"  {dataset['ratings']} ratings loaded in {time.perf_counter() - started:.1f}s")
+
+    print(f"Running scenarios ({args.requests} requests, concurrency {args.concurrency}) ...")
+    scenarios = build_scenarios(dataset, random.Random(args.seed))
+    results = asyncio.run(run_all(app, scenarios, args.scenario, args.requests, args.concurrency, args.warmup))
+
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "dataset": dataset,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    regressions = []
+    if args.baseline and os.path.exists(args.baseline) and os.path.abspath(args.baseline) != os.path.abspath(args.out):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"Compared with {args.baseline} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"Regressed: {', '.join(regressions)}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
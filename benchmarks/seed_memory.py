@@ -0,0 +1,55 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scripts.generate_tmdb_csv import generate
+
+
+def peak_rss_mb(movies, workdir, batch_size):
+    """Generate `movies` TMDB-shaped rows and seed all of them; peak RSS of the seeder process in MB"""
+    generate(movies, workdir)
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'seed.db')}")
+    # seed.py looks for the CSVs relative to the working directory
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "scripts", "seed.py"), "--limit", "0",
+         "--max-ratings", "3", "--batch-size", str(batch_size)],
+        cwd=workdir, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+    )
+    output = proc.stdout.read()
+    _, status, usage = os.wait4(proc.pid, 0)
+    if os.waitstatus_to_exitcode(status) != 0 or "CRITICAL ERROR" in output:
+        raise RuntimeError(f"Seeding {movies} movies failed:\n{output}")
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that the seeder's peak memory does not grow with the dataset size")
+    parser.add_argument("--small", type=int, default=5000, help="Movies in the small dataset")
+    parser.add_argument("--large", type=int, default=50000, help="Movies in the large dataset")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per multi-row INSERT")
+    parser.add_argument("--max-growth-mb", type=float, default=8.0,
+                        help="Allowed peak RSS difference between the two runs")
+    args = parser.parse_args()
+
+    peaks = {}
+    for movies in (args.small, args.large):
+        with tempfile.TemporaryDirectory(prefix="movie_rating_seed_") as workdir:
+            peaks[movies] = peak_rss_mb(movies, workdir, args.batch_size)
+        print(f"  {movies:>9} movies: peak RSS {peaks[movies]:.1f} MB")
+
+    growth = peaks[args.large] - peaks[args.small]
+    if growth > args.max_growth_mb:
+        print(f"Peak RSS grew by {growth:.1f} MB from {args.small} to {args.large} movies "
+              f"(limit {args.max_growth_mb:g} MB)")
+        sys.exit(1)
+    print(f"Peak RSS grew by {growth:.1f} MB (limit {args.max_growth_mb:g} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DEFAULT_DB = os.path.join(tempfile.gettempdir(), "movie_rating_startup.db")
+
+# Runs in a fresh interpreter per sample; prints the phase timings as JSON
+CHILD = r"""
+import asyncio, json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {root!r})
+import httpx
+tooling = time.perf_counter() - started
+
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def boot():
+    async with app.router.lifespan_context(app):
+        ready = time.perf_counter()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.get({path!r})
+            response.raise_for_status()
+        return ready, time.perf_counter()
+
+ready, answered = asyncio.run(boot())
+print(json.dumps({{
+    "tooling_ms": tooling * 1000,
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "first_request_ms": (answered - ready) * 1000,
+    "ready_ms": (answered - started) * 1000,
+}}))
+"""
+
+
+def run_sample(env, path, importtime=False):
+    """One cold start: wall time of the whole process plus the phases it reports"""
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", CHILD.format(root=ROOT, path=path)]
+
+    started = time.perf_counter()
+    proc = subprocess.run(command, env=env, capture_output=True, text=True)
+    wall = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"Cold start failed:\n{proc.stderr}")
+    sample = json.loads(proc.stdout.strip().splitlines()[-1])
+    # Interpreter boot and the benchmark's own httpx import are not the app's cost
+    sample["process_ms"] = wall - sample.pop("tooling_ms")
+    return sample, proc.stderr
+
+
+def heaviest_imports(stderr, count):
+    """Modules with the largest self time from -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line[len("import time:"):].split("|")
+        rows.append((int(self_us), module.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start time of an API worker (import, startup, first request)")
+    parser.add_argument("--database-url", default=f"sqlite:///{DEFAULT_DB}",
+                        help="Database the workers start against; its schema is created if missing")
+    parser.add_argument("--samples", type=int, default=10, help="Fresh worker processes to start")
+    parser.add_argument("--path", default="/api/v1/genres?page_size=1", help="First request sent after startup")
+    parser.add_argument("--schema-mode", default="none", help="DB_SCHEMA_MODE of the workers")
+    parser.add_argument("--target-ms", type=float, default=float(os.getenv("STARTUP_TARGET_MS", "2000")),
+                        help="Median process time (start to first response) a worker must stay under")
+    parser.add_argument("--top-imports", type=int, default=0, help="Also list the N slowest imports")
+    parser.add_argument("--out", default=None, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    env = dict(os.environ, DATABASE_URL=args.database_url, DB_SCHEMA_MODE=args.schema_mode,
+               RATING_WRITE_BEHIND="false")
+    # Workers use cached bytecode, like a deployed image
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    # The workers measure starting against an existing schema
+    os.environ["DATABASE_URL"] = args.database_url
+    from app.db.schema import prepare_schema
+    prepare_schema("create_all")
+
+    # The first start after a change also compiles bytecode; it is not what scale-out pays
+    run_sample(env, args.path)
+
+    print(f"Starting {args.samples} workers against {args.database_url} ...")
+    samples = [run_sample(env, args.path)[0] for _ in range(args.samples)]
+
+    phases = {}
+    for phase in ("import_ms", "startup_ms", "first_request_ms", "ready_ms", "process_ms"):
+        values = sorted(sample[phase] for sample in samples)
+        phases[phase] = {"median": statistics.median(values), "max": values[-1]}
+        print(f"  {phase:<18} median {phases[phase]['median']:8.1f} ms  max {values[-1]:8.1f} ms")
+
+    if args.top_imports:
+        _, stderr = run_sample(env, args.path, importtime=True)
+        print("Slowest imports (self time):")
+        for self_us, module in heaviest_imports(stderr, args.top_imports):
+            print(f"  {self_us / 1000:8.1f} ms  {module}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                "meta": {
+                    "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "samples": args.samples,
+                    "schema_mode": args.schema_mode,
+                    "target_ms": args.target_ms,
+                },
+                "phases": phases,
+            }, f, indent=2)
+        print(f"Results written to {args.out}")
+
+    median = phases["process_ms"]["median"]
+    if median > args.target_ms:
+        print(f"Cold start {median:.0f} ms exceeds the {args.target_ms:.0f} ms target")
+        sys.exit(1)
+    print(f"Cold start {median:.0f} ms (target {args.target_ms:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
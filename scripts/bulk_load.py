@@ -0,0 +1,120 @@
+"""Bulk-loading helpers shared by the data loading scripts (seed.py, generate_synthetic_data.py)."""
+import csv
+import io
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, text
+
+from app.models.rollup import HOUR, DAY, bucket_start
+from app.services.trending_service import (
+    RATING_ROLLUP_HOURLY_RETENTION_HOURS,
+    RATING_ROLLUP_DAILY_RETENTION_DAYS
+)
+
+
+class Throughput:
+    """Counts rows per stage and reports rows/second"""
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.rows = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+
+    def add(self, n=1):
+        self.rows += n
+        now = time.perf_counter()
+        if now - self._last_report >= 5:
+            self._last_report = now
+            print(f"   ... {self.stage}: {self.rows} rows ({self.rate():.0f} rows/s)")
+
+    def rate(self):
+        elapsed = time.perf_counter() - self.started
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def done(self):
+        elapsed = time.perf_counter() - self.started
+        print(f"   {self.stage}: {self.rows} rows in {elapsed:.1f}s ({self.rate():.0f} rows/s)")
+
+
+class BulkWriter:
+    """
+    Buffers rows for one table and writes them in batches.
+    PostgreSQL (psycopg2) uses COPY; other backends use multi-row INSERTs.
+    COPY returns nothing, so ids referenced by other rows must be assigned client-side.
+    """
+
+    def __init__(self, conn, table, columns, batch_size, before_flush=None):
+        self.conn = conn
+        self.table = table
+        self.columns = columns
+        self.batch_size = batch_size
+        self.before_flush = before_flush
+        self.rows = []
+        self.use_copy = conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg2"
+
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        if self.before_flush:
+            # Parent rows (e.g. movies) must land before rows referencing them
+            self.before_flush()
+        if self.use_copy:
+            self._copy()
+        else:
+            self.conn.execute(insert(self.table), [dict(zip(self.columns, r)) for r in self.rows])
+        self.conn.commit()
+        self.rows = []
+
+    def _copy(self):
+        buf = io.StringIO()
+        csv.writer(buf, quoting=csv.QUOTE_NONNUMERIC).writerows(self.rows)
+        buf.seek(0)
+        cols = ", ".join(f'"{c}"' for c in self.columns)
+        raw = self.conn.connection.dbapi_connection
+        with raw.cursor() as cursor:
+            cursor.copy_expert(f"COPY {self.table.name} ({cols}) FROM STDIN WITH (FORMAT csv)", buf)
+
+
+def reset_sequences(conn):
+    """Ids are assigned client-side; move the PostgreSQL sequences past them"""
+    if conn.dialect.name != "postgresql":
+        return
+    for table in ("genres", "directors", "movies", "movie_ratings"):
+        conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 1)) FROM {table}"
+        ))
+    conn.commit()
+
+
+class RollupBuckets:
+    """
+    Per-movie rating rollups following the retention policy of TrendingService:
+    hourly buckets for recent days, daily buckets after that, nothing past retention.
+    """
+
+    def __init__(self, now: datetime):
+        self.hourly_from = bucket_start(now - timedelta(hours=RATING_ROLLUP_HOURLY_RETENTION_HOURS), DAY)
+        self.daily_from = bucket_start(now - timedelta(days=RATING_ROLLUP_DAILY_RETENTION_DAYS), DAY)
+        self.buckets = {}
+
+    def add(self, score, created_at):
+        if created_at < self.daily_from:
+            return
+        granularity = HOUR if created_at >= self.hourly_from else DAY
+        bucket = self.buckets.setdefault((granularity, bucket_start(created_at, granularity)), [0, 0])
+        bucket[0] += 1
+        bucket[1] += score
+
+    def rows(self, movie_id):
+        """(movie_id, granularity, bucket_start, count, sum) rows, then reset for the next movie"""
+        rows = [(movie_id, granularity, start, count, total)
+                for (granularity, start), (count, total) in self.buckets.items()]
+        self.buckets = {}
+        return rows
@@ -0,0 +1,26 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal
+from app.services.trending_service import TrendingService
+
+
+def compact():
+    """Apply the rating rollup retention policy (hourly -> daily, drop old days)."""
+    db = SessionLocal()
+    try:
+        result = TrendingService(db).apply_retention()
+        print(f"Rating rollups compacted: {result}")
+        return result
+    except Exception as e:
+        print(f"Rollup compaction failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    compact()
@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal
+from app.services.export_service import EXPORT_BATCH_SIZE, EXPORT_MEDIA_TYPES, ExportService
+
+
+def export(fmt="ndjson", output=None, title=None, release_year=None, genre=None, batch_size=EXPORT_BATCH_SIZE):
+    """Write the catalog export to a file (or stdout), batch by batch."""
+    db = SessionLocal()
+    started = time.perf_counter()
+    out = open(output, "wb") if output else sys.stdout.buffer
+    try:
+        service = ExportService(db)
+        for chunk in service.export(fmt, title=title, release_year=release_year, genre=genre, batch_size=batch_size):
+            out.write(chunk)
+        out.flush()
+        print(f"Exported {service.exported} movie(s) as {fmt} in {time.perf_counter() - started:.1f}s.",
+              file=sys.stderr)
+        return service.exported
+    finally:
+        if output:
+            out.close()
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream all movies with director, genres and rating aggregates")
+    parser.add_argument("--format", choices=sorted(EXPORT_MEDIA_TYPES), default="ndjson")
+    parser.add_argument("--output", "-o", default=None, help="File to write (default: stdout)")
+    parser.add_argument("--title", default=None, help="Only movies whose title contains this")
+    parser.add_argument("--release-year", type=int, default=None)
+    parser.add_argument("--genre", default=None, help="Only movies with a genre matching this")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE, help="Rows per server-side cursor batch")
+    args = parser.parse_args()
+    export(
+        fmt=args.format,
+        output=args.output,
+        title=args.title,
+        release_year=args.release_year,
+        genre=args.genre,
+        batch_size=args.batch_size
+    )
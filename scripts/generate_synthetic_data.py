@@ -0,0 +1,264 @@
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import engine
+from app.models.base import Base
+from app.models.director import Director
+from app.models.genre import Genre
+from app.models.movie import Movie, RATING_SCORES, movie_genres
+from app.models.rating import MovieRating
+from app.models.rollup import RatingRollup
+from scripts.bulk_load import BulkWriter, RollupBuckets, Throughput, reset_sequences
+
+GENRES = [
+    "Drama", "Comedy", "Thriller", "Action", "Romance", "Horror", "Crime", "Adventure",
+    "Science Fiction", "Family", "Fantasy", "Mystery", "Animation", "Documentary",
+    "History", "War", "Music", "Western", "Foreign", "TV Movie",
+]
+# Genres are linked with Zipf-like frequency: Drama far more often than Western
+GENRE_WEIGHTS = [1 / rank for rank in range(1, len(GENRES) + 1)]
+
+TITLE_WORDS = [
+    "Dark", "Night", "Star", "Love", "City", "Last", "Lost", "King", "Storm", "River",
+    "Ghost", "Iron", "Secret", "Silent", "Blue", "Road", "Empire", "Dream", "Fire", "Stone",
+    "Shadow", "Winter", "Golden", "Wild", "Broken", "Hidden", "Red", "Edge", "Return", "Rising",
+]
+FIRST_NAMES = ["Anna", "Ben", "Carla", "David", "Elena", "Farid", "Grace", "Hugo", "Ines", "Jonas", "Kira", "Leo"]
+LAST_NAMES = ["Moreau", "Tanaka", "Novak", "Silva", "Karimi", "Berg", "Costa", "Walsh", "Rossi", "Ivanova"]
+
+# Scores are sampled in blocks so huge movies never hold all their scores in memory
+SCORE_BLOCK = 100_000
+
+
+class Plan:
+    """Everything a worker needs to generate its chunk; picklable and deterministic"""
+
+    def __init__(self, args, now):
+        self.seed = args.seed
+        self.directors = args.directors
+        self.movies = args.movies
+        self.ratings = args.ratings
+        self.zipf = args.zipf
+        self.days = args.days
+        self.recency_skew = args.recency_skew
+        self.chunk_size = args.chunk_size
+        self.batch_size = args.batch_size
+        self.now = now
+        # Normalizer of the Zipf weights rank^-s over all movies
+        self.harmonic = math.fsum(rank ** -self.zipf for rank in range(1, self.movies + 1))
+        # Popularity rank is an affine permutation of the movie id (no table in memory)
+        rng = random.Random(self.seed)
+        self.rank_step = rng.randrange(1, max(2, self.movies))
+        while math.gcd(self.rank_step, self.movies) != 1:
+            self.rank_step += 1
+        self.rank_offset = rng.randrange(self.movies)
+
+    def popularity_rank(self, movie_id):
+        return ((movie_id - 1) * self.rank_step + self.rank_offset) % self.movies + 1
+
+    def ratings_for(self, movie_id, rng):
+        """Ratings a movie receives: its Zipf share of the total, randomly rounded"""
+        expected = self.ratings * self.popularity_rank(movie_id) ** -self.zipf / self.harmonic
+        whole = int(expected)
+        return whole + (1 if rng.random() < expected - whole else 0)
+
+
+def sample_histogram(count, rng):
+    """Per-score counts for `count` ratings around a random per-movie quality"""
+    quality = min(9.5, max(1.5, rng.gauss(6.4, 1.3)))
+    cum_weights, total = [], 0.0
+    for score in RATING_SCORES:
+        total += math.exp(-((score - quality) ** 2) / 8.0)
+        cum_weights.append(total)
+
+    histogram = dict.fromkeys(RATING_SCORES, 0)
+    remaining = count
+    while remaining:
+        block = min(remaining, SCORE_BLOCK)
+        for score in rng.choices(RATING_SCORES, cum_weights=cum_weights, k=block):
+            histogram[score] += 1
+        remaining -= block
+    return histogram
+
+
+def init_worker():
+    # Connections inherited from the parent process must not be reused
+    engine.dispose(close=False)
+
+
+def generate_chunk(plan, chunk_index):
+    """Generate and bulk-load movies [first, last] of one chunk with their links, ratings and rollups"""
+    first = chunk_index * plan.chunk_size + 1
+    last = min(plan.movies, first + plan.chunk_size - 1)
+    rng = random.Random(plan.seed * 1_000_003 + chunk_index)
+    span = plan.days * 86400
+    now = plan.now
+    ratings_total = 0
+
+    with engine.connect() as conn:
+        movie_writer = BulkWriter(
+            conn, Movie.__table__,
+            ["id", "title", "director_id", "release_year", "cast", "description",
+             "ratings_count", "ratings_sum", *(f"rating_hist_{score}" for score in RATING_SCORES),
+             "created_at", "updated_at"],
+            plan.batch_size
+        )
+        link_writer = BulkWriter(conn, movie_genres, ["movie_id", "genre_id"], plan.batch_size,
+                                 before_flush=movie_writer.flush)
+        # Rating ids come from the database sequence, so chunks never collide
+        rating_writer = BulkWriter(conn, MovieRating.__table__, ["movie_id", "score", "created_at"],
+                                   plan.batch_size, before_flush=movie_writer.flush)
+        rollup_writer = BulkWriter(
+            conn, RatingRollup.__table__,
+            ["movie_id", "granularity", "bucket_start", "ratings_count", "ratings_sum"],
+            plan.batch_size, before_flush=movie_writer.flush
+        )
+        rollups = RollupBuckets(now)
+
+        for movie_id in range(first, last + 1):
+            count = plan.ratings_for(movie_id, rng)
+            histogram = sample_histogram(count, rng)
+            movie_writer.add((
+                movie_id,
+                f"{' '.join(rng.sample(TITLE_WORDS, rng.randint(1, 3)))} {movie_id}",
+                rng.randint(1, plan.directors),
+                rng.randint(1950, now.year),
+                ", ".join(f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(3)),
+                "Synthetic movie",
+                count,
+                sum(score * n for score, n in histogram.items()),
+                *histogram.values(),
+                now, now
+            ))
+
+            for genre_id in {rng.choices(range(1, len(GENRES) + 1), weights=GENRE_WEIGHTS)[0]
+                             for _ in range(rng.randint(1, 3))}:
+                link_writer.add((movie_id, genre_id))
+
+            for score, n in histogram.items():
+                for _ in range(n):
+                    # u ** skew < u for skew > 1, so ratings bunch up towards `now`
+                    created_at = now - timedelta(seconds=int(span * rng.random() ** plan.recency_skew))
+                    rating_writer.add((movie_id, score, created_at))
+                    rollups.add(score, created_at)
+            for row in rollups.rows(movie_id):
+                rollup_writer.add(row)
+            ratings_total += count
+
+        movie_writer.flush()
+        link_writer.flush()
+        rating_writer.flush()
+        rollup_writer.flush()
+
+    return last - first + 1, ratings_total
+
+
+def load_people_and_genres(plan):
+    """Genres and directors, loaded by the parent before any movie chunk"""
+    rng = random.Random(plan.seed)
+    now = plan.now
+    with engine.connect() as conn:
+        genre_writer = BulkWriter(conn, Genre.__table__, ["id", "name", "description", "created_at", "updated_at"],
+                                  plan.batch_size)
+        for genre_id, name in enumerate(GENRES, 1):
+            genre_writer.add((genre_id, name, "Synthetic genre", now, now))
+        genre_writer.flush()
+
+        director_writer = BulkWriter(
+            conn, Director.__table__, ["id", "name", "birth_year", "description", "created_at", "updated_at"],
+            plan.batch_size
+        )
+        progress = Throughput("directors")
+        for director_id in range(1, plan.directors + 1):
+            director_writer.add((
+                director_id,
+                f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {director_id}",
+                rng.randint(1920, 2000),
+                "Synthetic director",
+                now, now
+            ))
+            progress.add()
+        director_writer.flush()
+        progress.done()
+
+
+def generate(args):
+    print("=" * 60)
+    print(f"Generating {args.directors} directors, {args.movies} movies, ~{args.ratings} ratings")
+    print("=" * 60)
+
+    workers = args.workers or os.cpu_count() or 1
+    if engine.dialect.name == "sqlite" and workers > 1:
+        print("SQLite allows a single writer; using 1 worker.")
+        workers = 1
+
+    started = time.perf_counter()
+    now = datetime.fromisoformat(args.now) if args.now else datetime.utcnow().replace(microsecond=0)
+    plan = Plan(args, now)
+
+    print("\n1. Recreating tables...")
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    print("\n2. Genres and directors...")
+    load_people_and_genres(plan)
+
+    chunks = math.ceil(args.movies / args.chunk_size)
+    print(f"\n3. Movies, genre links, ratings and rollups ({chunks} chunks, {workers} workers)...")
+    movie_progress = Throughput("movies")
+    rating_progress = Throughput("ratings")
+    if workers == 1:
+        results = (generate_chunk(plan, i) for i in range(chunks))
+        for movies, ratings in results:
+            movie_progress.add(movies)
+            rating_progress.add(ratings)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+            # Only `workers` chunks are in flight, so memory stays flat however large the dataset
+            pending = set()
+            next_chunk = 0
+            while next_chunk < chunks or pending:
+                while next_chunk < chunks and len(pending) < workers * 2:
+                    pending.add(pool.submit(generate_chunk, plan, next_chunk))
+                    next_chunk += 1
+                done = next(as_completed(pending))
+                pending.remove(done)
+                movies, ratings = done.result()
+                movie_progress.add(movies)
+                rating_progress.add(ratings)
+    movie_progress.done()
+    rating_progress.done()
+
+    with engine.connect() as conn:
+        reset_sequences(conn)
+
+    print("\n" + "=" * 60)
+    print(f"Generation completed in {time.perf_counter() - started:.1f}s")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Deterministic synthetic dataset for load testing (drops and recreates all tables)"
+    )
+    parser.add_argument("--directors", type=int, default=10_000)
+    parser.add_argument("--movies", type=int, default=100_000)
+    parser.add_argument("--ratings", type=int, default=10_000_000, help="Total ratings to generate (approximate)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent of movie popularity")
+    parser.add_argument("--days", type=int, default=3 * 365, help="Ratings are spread over this many past days")
+    parser.add_argument("--recency-skew", type=float, default=2.0,
+                        help="Above 1, recent ratings are more frequent than old ones")
+    parser.add_argument("--seed", type=int, default=42, help="Same seed, chunk size and --now -> same dataset")
+    parser.add_argument("--now", default=None, help="Reference time for rating timestamps (ISO format; default: now)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Movies per parallel chunk")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Rows per COPY / multi-row INSERT")
+    parser.add_argument("--workers", type=int, default=None, help="Loader processes (default: CPU count)")
+    generate(parser.parse_args())
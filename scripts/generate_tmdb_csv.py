@@ -0,0 +1,57 @@
+import argparse
+import csv
+import json
+import os
+import random
+
+GENRES = [
+    "Action", "Adventure", "Animation", "Comedy", "Crime", "Documentary", "Drama",
+    "Family", "Fantasy", "History", "Horror", "Music", "Mystery", "Romance",
+    "Science Fiction", "TV Movie", "Thriller", "War", "Western", "Foreign"
+]
+
+
+def generate(movies, out_dir, seed=42):
+    """Write TMDB-shaped movies/credits CSVs with `movies` rows, streaming to disk."""
+    rnd = random.Random(seed)
+    directors = max(movies // 4, 1)
+    movies_path = os.path.join(out_dir, "tmdb_5000_movies.csv")
+    credits_path = os.path.join(out_dir, "tmdb_5000_credits.csv")
+
+    with open(movies_path, "w", encoding="utf-8", newline="") as mf, \
+            open(credits_path, "w", encoding="utf-8", newline="") as cf:
+        movie_writer = csv.DictWriter(mf, fieldnames=["id", "title", "release_date", "vote_count", "genres"])
+        credit_writer = csv.DictWriter(cf, fieldnames=["movie_id", "title", "cast", "crew"])
+        movie_writer.writeheader()
+        credit_writer.writeheader()
+
+        for i in range(1, movies + 1):
+            title = f"Synthetic Movie {i}"
+            genres = [{"id": g, "name": GENRES[g]} for g in rnd.sample(range(len(GENRES)), rnd.randint(1, 3))]
+            movie_writer.writerow({
+                "id": i,
+                "title": title,
+                "release_date": f"{rnd.randint(1950, 2025)}-01-01",
+                "vote_count": rnd.randint(0, 20000),
+                "genres": json.dumps(genres),
+            })
+            cast = [{"name": f"Actor {rnd.randint(1, movies)}"} for _ in range(8)]
+            crew = [{"job": "Producer", "name": f"Producer {rnd.randint(1, movies)}"}] * 10
+            crew.append({"job": "Director", "name": f"Director {rnd.randint(1, directors)}"})
+            credit_writer.writerow({
+                "movie_id": i,
+                "title": title,
+                "cast": json.dumps(cast),
+                "crew": json.dumps(crew),
+            })
+
+    print(f"Wrote {movies} movies to {movies_path} and {credits_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate TMDB-shaped CSVs for exercising scripts/seed.py at scale")
+    parser.add_argument("--movies", type=int, default=480300, help="Number of movies (default: ~100x the TMDB sample)")
+    parser.add_argument("--out-dir", default="scripts", help="Directory to write the CSVs into")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    args = parser.parse_args()
+    generate(args.movies, args.out_dir, seed=args.seed)
@@ -0,0 +1,30 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal
+from app.repositories.movie_repository import MovieRepository
+
+
+def recompute(movie_id=None):
+    """Rebuild the denormalized rating aggregates from movie_ratings."""
+    db = SessionLocal()
+    try:
+        fixed = MovieRepository(db).recompute_rating_stats(movie_id=movie_id)
+        print(f"Recomputed rating stats: {fixed} movie(s) corrected.")
+        return fixed
+    except Exception as e:
+        print(f"Recompute failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fix drift in movies.ratings_count / ratings_sum / rating_hist_*")
+    parser.add_argument("--movie-id", type=int, default=None, help="Only recompute a single movie")
+    args = parser.parse_args()
+    recompute(movie_id=args.movie_id)
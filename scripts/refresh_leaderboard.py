@@ -0,0 +1,30 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal
+from app.services.leaderboard_service import LeaderboardService
+
+
+def refresh(full=False):
+    """Refresh the top-rated ranking tables (incrementally unless full=True)."""
+    db = SessionLocal()
+    try:
+        result = LeaderboardService(db).refresh(full=full)
+        print(f"Leaderboard refreshed: {result}")
+        return result
+    except Exception as e:
+        print(f"Leaderboard refresh failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the movie_rankings / movie_genre_rankings tables")
+    parser.add_argument("--full", action="store_true", help="Rebuild every ranking instead of only movies flagged since the last refresh")
+    args = parser.parse_args()
+    refresh(full=args.full)
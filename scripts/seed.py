@@ -1,18 +1,28 @@
+import argparse
 import csv
+import heapq
 import json
-import random
 import os
+import random
 import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from itertools import islice
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, Text, func, insert, literal, select, update
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.db.database import SessionLocal, engine
+from app.db.database import engine
 from app.models.base import Base
 from app.models.director import Director
 from app.models.genre import Genre
-from app.models.movie import Movie
+from app.models.movie import Movie, RATING_SCORES, movie_genres
 from app.models.rating import MovieRating
+from app.models.rollup import RatingRollup
+from scripts.bulk_load import BulkWriter, RollupBuckets, Throughput, reset_sequences
 
 # فایل‌های CSV
 CSV_PATHS = [
@@ -22,6 +32,23 @@ CSV_PATHS = [
     "tmdb_5000_credits.csv"
 ]
 
+# TMDB cells (crew JSON in particular) can exceed the csv module's default field limit
+csv.field_size_limit(sys.maxsize)
+
+# Movies whose credits are looked up per query (bound parameters stay under SQLite's limit)
+CREDITS_LOOKUP_CHUNK = 500
+
+# Parsed credits are staged in the database instead of a dict, so memory does not
+# grow with the dataset; movies are then joined against it chunk by chunk
+seed_credits = Table(
+    "seed_credits", MetaData(),
+    Column("tmdb_id", String(32), index=True),
+    Column("director_name", String(255), nullable=False),
+    Column("top_cast", Text),
+    Column("director_id", Integer),
+    prefixes=["TEMPORARY"]
+)
+
 
 def find_csv(filename):
     for path in CSV_PATHS:
@@ -37,7 +64,91 @@ def parse_json_safe(json_str):
         return []
 
 
-def seed_database():
+# ---------------------------------------------------------------------------
+# Row parsers (run in worker processes, so they must stay module-level)
+# ---------------------------------------------------------------------------
+
+def parse_credit(row):
+    """credits row -> (tmdb_movie_id, director_name, top_cast); crew JSON is parsed once"""
+    director_name = None
+    for member in parse_json_safe(row['crew']):
+        if member.get('job') == 'Director':
+            director_name = member.get('name')
+            break
+    top_cast = ", ".join(c['name'] for c in parse_json_safe(row['cast'])[:3])
+    return row['movie_id'], director_name, top_cast
+
+
+def parse_movie(row):
+    """movies row -> (tmdb_id, vote_count, title, release_year, genre_names)"""
+    release_year = 2000
+    release_date = row.get('release_date', '')
+    if release_date:
+        try:
+            release_year = int(release_date.split('-')[0])
+        except ValueError:
+            pass
+
+    try:
+        vote_count = float(row['vote_count']) if row['vote_count'] else 0.0
+    except ValueError:
+        vote_count = 0.0
+
+    genre_names = [g['name'] for g in parse_json_safe(row.get('genres', '[]'))]
+    return row['id'], vote_count, row['title'], release_year, genre_names
+
+
+def iter_csv(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        yield from csv.DictReader(f)
+
+
+def parse_chunk(parser, rows):
+    return [parser(row) for row in rows]
+
+
+def bounded_map(pool, parser, rows, in_flight, chunksize=256):
+    """
+    pool.map(parser, rows) that reads `rows` lazily: at most `in_flight`
+    chunks are submitted at a time (Executor.map would queue the whole CSV
+    up front). Results keep the input order.
+    """
+    rows = iter(rows)
+    pending = deque()
+    while True:
+        chunk = list(islice(rows, chunksize))
+        if not chunk:
+            break
+        if len(pending) >= in_flight:
+            yield from pending.popleft().result()
+        pending.append(pool.submit(parse_chunk, parser, chunk))
+    while pending:
+        yield from pending.popleft().result()
+
+
+def with_credits(conn, movies):
+    """
+    (movie, director_id, top_cast) for each parsed movie that has a director.
+    Credits are read from seed_credits one chunk of movies at a time.
+    """
+    movies = iter(movies)
+    while True:
+        chunk = list(islice(movies, CREDITS_LOOKUP_CHUNK))
+        if not chunk:
+            return
+        credits = {
+            tmdb_id: (director_id, top_cast)
+            for tmdb_id, director_id, top_cast in conn.execute(
+                select(seed_credits.c.tmdb_id, seed_credits.c.director_id, seed_credits.c.top_cast)
+                .where(seed_credits.c.tmdb_id.in_([m[0] for m in chunk]))
+            )
+        }
+        for m in chunk:
+            if m[0] in credits:
+                yield (m, *credits[m[0]])
+
+
+def seed_database(movies_limit=1000, batch_size=5000, workers=None, max_ratings=40):
     print("=" * 60)
     print("Starting Database Seeding (TMDB 5000 ETL)")
     print("=" * 60)
@@ -49,142 +160,154 @@ def seed_database():
         print("\nERROR: CSV files not found!")
         return
 
-    db = SessionLocal()
-    try:
-        # 1. Cleanup
-        print("\n1. Cleaning up database...")
-        Base.metadata.drop_all(bind=engine)
-        Base.metadata.create_all(bind=engine)
-
-        # 2. Load CSVs
-        print(f"\n2. Loading CSV data...")
-        with open(movies_path, encoding='utf-8') as f:
-            movies_raw = list(csv.DictReader(f))
-
-        with open(credits_path, encoding='utf-8') as f:
-            credits_raw = list(csv.DictReader(f))
-
-        credits_map = {row['movie_id']: row for row in credits_raw}
-
-        # 3. Insert Genres (All)
-        print("\n3. Extracting Genres...")
-        genres_set = set()
-        for row in movies_raw:
-            for g in parse_json_safe(row.get('genres', '[]')):
-                genres_set.add(g['name'])
-
-        genre_objs = {}
-        for g_name in genres_set:
-            genre = Genre(name=g_name, description="Imported from TMDB")
-            db.add(genre)
-            genre_objs[g_name] = genre
-        db.commit()
-        print(f"   Inserted {len(genre_objs)} genres.")
-
-        # 4. Insert Directors (ALL Directors from dataset - Fix for validation)
-        print("\n4. Extracting ALL Directors...")
-        directors_map = {}  # Name -> Director Object
-
-        # Iterate over ALL credits to capture all directors
-        for row in credits_raw:
-            crew = parse_json_safe(row['crew'])
-            for member in crew:
-                if member['job'] == 'Director':
-                    d_name = member['name']
-                    if d_name and d_name not in directors_map:
-                        director = Director(name=d_name, description="Imported from TMDB")
-                        db.add(director)
-                        directors_map[d_name] = director
-
-        db.commit()  # Commit to save all directors and generate IDs
-        print(f"   Inserted {len(directors_map)} directors (Validation Requirement > 1000).")
-
-        # 5. Insert Top 1000 Movies
-        print("\n5. Processing Top 1000 Movies...")
-
-        # Sort by popularity/vote_count
-        movies_raw.sort(key=lambda x: float(x['vote_count']) if x['vote_count'] else 0, reverse=True)
-
-        movies_limit = 1000
-        count = 0
-
-        for row in movies_raw:
-            if count >= movies_limit:
-                break
-
-            movie_id = row['id']
-            credit_row = credits_map.get(movie_id)
-            if not credit_row: continue
-
-            # Find Director name
-            crew = parse_json_safe(credit_row['crew'])
-            director_name = next((m['name'] for m in crew if m['job'] == 'Director'), None)
-
-            # Movie must have a director that we already inserted
-            if not director_name or director_name not in directors_map:
-                continue
-
-            director_obj = directors_map[director_name]
-
-            # Parse Year
-            release_date = row.get('release_date', '')
-            release_year = 2000
-            if release_date:
-                try:
-                    release_year = int(release_date.split('-')[0])
-                except:
-                    pass
-
-            # Cast
-            cast_list = parse_json_safe(credit_row['cast'])
-            top_cast = [c['name'] for c in cast_list[:3]]
-            cast_str = ", ".join(top_cast)
-
-            movie = Movie(
-                title=row['title'],
-                director_id=director_obj.id,
-                release_year=release_year,
-                cast=cast_str,
-                description="Imported from TMDB Dataset"
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    workers = workers or os.cpu_count() or 1
+    # Chunks being parsed or waiting to be consumed, so memory stays bounded
+    in_flight = workers * 2
+
+    with engine.connect() as conn, ProcessPoolExecutor(max_workers=workers) as pool:
+        try:
+            # 1. Cleanup
+            print("\n1. Cleaning up database...")
+            Base.metadata.drop_all(bind=engine)
+            Base.metadata.create_all(bind=engine)
+            seed_credits.drop(conn, checkfirst=True)
+            seed_credits.create(conn)
+            conn.commit()
+
+            genre_writer = BulkWriter(conn, Genre.__table__, ["id", "name", "description", "created_at", "updated_at"], batch_size)
+            credit_writer = BulkWriter(conn, seed_credits, ["tmdb_id", "director_name", "top_cast"], batch_size)
+            movie_writer = BulkWriter(
+                conn, Movie.__table__,
+                ["id", "title", "director_id", "release_year", "cast", "description",
+                 "ratings_count", "ratings_sum",
+                 *(f"rating_hist_{score}" for score in RATING_SCORES),
+                 "created_at", "updated_at"],
+                batch_size
             )
-
-            # Genres
-            for mg in parse_json_safe(row.get('genres', '[]')):
-                if mg['name'] in genre_objs:
-                    movie.genres.append(genre_objs[mg['name']])
-
-            db.add(movie)
-            count += 1
-
-        db.commit()
-        print(f"   Inserted {count} movies.")
-
-        # 6. Ratings
-        print("\n6. Generating Ratings...")
-        movies = db.query(Movie).all()
-        ratings_batch = []
-        for movie in movies:
-            for _ in range(random.randint(1, 40)):
-                ratings_batch.append(MovieRating(
-                    movie_id=movie.id,
-                    score=random.randint(1, 10),
-                    created_at=datetime.utcnow() - timedelta(days=random.randint(0, 1800))
+            link_writer = BulkWriter(
+                conn, movie_genres, ["movie_id", "genre_id"], batch_size,
+                before_flush=lambda: (genre_writer.flush(), movie_writer.flush())
+            )
+            rating_writer = BulkWriter(conn, MovieRating.__table__, ["id", "movie_id", "score", "created_at"], batch_size, before_flush=movie_writer.flush)
+            rollup_writer = BulkWriter(
+                conn, RatingRollup.__table__,
+                ["movie_id", "granularity", "bucket_start", "ratings_count", "ratings_sum"],
+                batch_size, before_flush=movie_writer.flush
+            )
+            rollups = RollupBuckets(now)
+
+            # 2. Directors: stream ALL credits into seed_credits, parsing crew/cast JSON
+            # in worker processes, then derive the directors from it in SQL
+            print("\n2. Streaming credits and inserting ALL directors...")
+            progress = Throughput("credits")
+            for tmdb_id, director_name, top_cast in bounded_map(pool, parse_credit, iter_csv(credits_path), in_flight):
+                progress.add()
+                if director_name:
+                    credit_writer.add((tmdb_id, director_name, top_cast))
+            credit_writer.flush()
+            progress.done()
+
+            directors = Director.__table__
+            conn.execute(insert(directors).from_select(
+                ["name", "description", "created_at", "updated_at"],
+                select(
+                    seed_credits.c.director_name, literal("Imported from TMDB"),
+                    literal(now, DateTime), literal(now, DateTime)
+                ).group_by(seed_credits.c.director_name).order_by(seed_credits.c.director_name)
+            ))
+            conn.execute(
+                update(seed_credits).values(director_id=directors.c.id)
+                .where(directors.c.name == seed_credits.c.director_name)
+            )
+            conn.commit()
+            directors_count = conn.execute(select(func.count()).select_from(directors)).scalar_one()
+            print(f"   Inserted {directors_count} directors (Validation Requirement > 1000).")
+
+            # 3. Movies (+ genres, genre links and generated ratings)
+            label = f"top {movies_limit} by vote_count" if movies_limit else "all"
+            print(f"\n3. Streaming movies ({label})...")
+            genre_ids = {}  # Name -> id
+
+            def ensure_genre(name):
+                if name not in genre_ids:
+                    genre_ids[name] = len(genre_ids) + 1
+                    genre_writer.add((genre_ids[name], name, "Imported from TMDB", now, now))
+                return genre_ids[name]
+
+            parsed = with_credits(conn, bounded_map(pool, parse_movie, iter_csv(movies_path), in_flight))
+            if movies_limit:
+                # Only the heap of the best `movies_limit` movies is held in memory;
+                # every genre is still registered, as before
+                def register_genres(stream):
+                    for m in stream:
+                        for name in m[0][4]:
+                            ensure_genre(name)
+                        yield m
+                parsed = heapq.nlargest(movies_limit, register_genres(parsed), key=lambda m: m[0][1])
+
+            movie_progress = Throughput("movies")
+            rating_progress = Throughput("ratings")
+            next_rating_id = 1
+            movie_id = 0
+            for (_, _, title, release_year, genre_names), director_id, cast_str in parsed:
+                movie_id += 1
+
+                # Aggregates are written with the movie row, so no recompute pass is needed
+                scores = [random.randint(1, 10) for _ in range(random.randint(1, max_ratings))]
+                movie_writer.add((
+                    movie_id, title, director_id, release_year, cast_str,
+                    "Imported from TMDB Dataset", len(scores), sum(scores),
+                    *(scores.count(score) for score in RATING_SCORES),
+                    now, now
                 ))
-
-        db.bulk_save_objects(ratings_batch)
-        db.commit()
-        print(f"   Inserted {len(ratings_batch)} ratings.")
-
-        print("\n" + "=" * 60)
-        print("Seeding Completed Successfully!")
-        print("=" * 60)
-
-    except Exception as e:
-        print(f"\nCRITICAL ERROR: {e}")
-        db.rollback()
-    finally:
-        db.close()
+                movie_progress.add()
+
+                for score in scores:
+                    created_at = now - timedelta(days=random.randint(0, 1800))
+                    rating_writer.add((next_rating_id, movie_id, score, created_at))
+                    next_rating_id += 1
+                    rollups.add(score, created_at)
+                for row in rollups.rows(movie_id):
+                    rollup_writer.add(row)
+                rating_progress.add(len(scores))
+
+                for name in dict.fromkeys(genre_names):
+                    link_writer.add((movie_id, ensure_genre(name)))
+
+            genre_writer.flush()
+            movie_writer.flush()
+            link_writer.flush()
+            rating_writer.flush()
+            rollup_writer.flush()
+            seed_credits.drop(conn)
+            conn.commit()
+            movie_progress.done()
+            rating_progress.done()
+            print(f"   Inserted {len(genre_ids)} genres.")
+
+            reset_sequences(conn)
+
+            print("\n" + "=" * 60)
+            print(f"Seeding Completed Successfully in {time.perf_counter() - started:.1f}s!")
+            print("=" * 60)
+
+        except Exception as e:
+            print(f"\nCRITICAL ERROR: {e}")
+            conn.rollback()
 
 
 if __name__ == "__main__":
-    seed_database()
+    parser = argparse.ArgumentParser(description="Load the TMDB 5000 dataset")
+    parser.add_argument("--limit", type=int, default=1000, help="Movies to load, best by vote_count (0 = all)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per COPY / multi-row INSERT")
+    parser.add_argument("--workers", type=int, default=None, help="JSON parsing processes (default: CPU count)")
+    parser.add_argument("--max-ratings", type=int, default=40, help="Random ratings generated per movie (1..N)")
+    args = parser.parse_args()
+    seed_database(
+        movies_limit=args.limit,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        max_ratings=args.max_ratings
+    )
@@ -0,0 +1,26 @@
+import os
+import tempfile
+
+# Settings are read at import time: point the app at a throwaway SQLite database first
+_DB_DIR = tempfile.mkdtemp(prefix="movie_rating_tests_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ["DB_SCHEMA_MODE"] = "create_all"
+os.environ["DB_POOL_WARMUP"] = "0"
+os.environ["CACHE_BACKEND"] = "local"
+os.environ["RATING_WRITE_BEHIND"] = "false"
+os.environ["LEADERBOARD_BACKGROUND_REFRESH"] = "false"
+os.environ["INTERNAL_API_TOKEN"] = "test-internal-token"
+os.environ.pop("DATABASE_REPLICA_URLS", None)
+os.environ.pop("DATABASE_ASYNC", None)
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    # Entering the client runs startup, which creates the schema
+    with TestClient(app) as test_client:
+        yield test_client
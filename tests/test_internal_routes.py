@@ -0,0 +1,17 @@
+import pytest
+
+from app.controllers import internal_controller
+
+TOKEN = {"X-Internal-Token": "test-internal-token"}
+
+
+@pytest.mark.parametrize("path", ["/internal/db/pool", "/internal/db/replicas", "/internal/cache"])
+def test_internal_routes_require_the_token(client, path):
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"X-Internal-Token": "wrong"}).status_code == 401
+    assert client.get(path, headers=TOKEN).status_code == 200
+
+
+def test_internal_routes_are_off_without_a_configured_token(client, monkeypatch):
+    monkeypatch.setattr(internal_controller, "INTERNAL_API_TOKEN", "")
+    assert client.get("/internal/cache", headers=TOKEN).status_code == 404
@@ -0,0 +1,19 @@
+def test_batch_reports_invalid_items_and_creates_the_rest(client):
+    genre_id = client.post("/api/v1/genres", json={"name": "Batch genre"}).json()["data"]["id"]
+    director_id = client.post("/api/v1/directors", json={"name": "Batch director"}).json()["data"]["id"]
+    valid = {"title": "Batch movie", "director_id": director_id, "release_year": 2001, "genres": [genre_id]}
+
+    response = client.post("/api/v1/movies/batch", json={"movies": [
+        valid,
+        dict(valid, release_year="soon"),
+        dict(valid, title=None),
+        dict(valid, genres=[999999]),
+    ]})
+
+    assert response.status_code == 201
+    data = response.json()["data"]
+    assert data["created"] == 1 and data["items"][0]["index"] == 0
+    assert [failure["index"] for failure in data["failures"]] == [1, 2, 3]
+    assert data["failures"][0]["error"].startswith("release_year:")
+    assert data["failures"][1]["error"].startswith("title:")
+    assert data["failures"][2]["error"] == "Genre with id 999999 not found"
@@ -0,0 +1,20 @@
+from app.cache.caches import movie_detail_cache
+
+
+def test_cached_detail_version_matches_the_version_lookup(client):
+    genre_id = client.post("/api/v1/genres", json={"name": "Detail genre"}).json()["data"]["id"]
+    director_id = client.post("/api/v1/directors", json={"name": "Detail director"}).json()["data"]["id"]
+    movie_id = client.post("/api/v1/movies", json={
+        "title": "Detail movie", "director_id": director_id, "release_year": 2010, "genres": [genre_id]
+    }).json()["data"]["id"]
+    client.post(f"/api/v1/movies/{movie_id}/ratings", json={"score": 8})
+
+    movie_detail_cache.invalidate(movie_id)
+    built = client.get(f"/api/v1/movies/{movie_id}")
+    assert built.status_code == 200
+    assert built.json()["data"]["ratings_count"] == 1
+
+    # Revalidation goes through the version lookup, which must agree with the cached document
+    movie_detail_cache.invalidate(movie_id)
+    revalidated = client.get(f"/api/v1/movies/{movie_id}", headers={"If-None-Match": built.headers["ETag"]})
+    assert revalidated.status_code == 304
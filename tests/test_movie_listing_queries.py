@@ -0,0 +1,55 @@
+import pytest
+
+from app.cache.caches import movie_count_cache
+from app.db.query_stats import query_budget
+
+MOVIES = 120
+
+
+@pytest.fixture(scope="module")
+def catalog(client):
+    """More movies than the largest page, spread over several directors and genres"""
+    genre_ids = [
+        client.post("/api/v1/genres", json={"name": f"Listing genre {i}"}).json()["data"]["id"]
+        for i in range(3)
+    ]
+    director_ids = [
+        client.post("/api/v1/directors", json={"name": f"Listing director {i}"}).json()["data"]["id"]
+        for i in range(4)
+    ]
+    movies = [
+        {
+            "title": f"Listing movie {i}",
+            "director_id": director_ids[i % len(director_ids)],
+            "release_year": 1990 + i % 30,
+            "genres": [genre_ids[i % 3], genre_ids[(i + 1) % 3]],
+        }
+        for i in range(MOVIES)
+    ]
+    response = client.post("/api/v1/movies/batch", json={"movies": movies})
+    assert response.status_code == 201
+    assert response.json()["data"]["created"] == MOVIES
+
+
+def listing_query_count(client, page_size: int) -> int:
+    """Statements issued by one listing page, with the memoized total cleared"""
+    movie_count_cache.clear()
+    response = client.get(f"/api/v1/movies?page_size={page_size}")
+    assert response.status_code == 200
+    items = response.json()["data"]["items"]
+    assert len(items) == page_size
+    assert all(item["director"] and item["genres"] for item in items)
+    return int(response.headers["X-DB-Query-Count"])
+
+
+def test_listing_query_count_does_not_grow_with_page_size(client, catalog):
+    assert listing_query_count(client, 10) == listing_query_count(client, 100)
+
+
+def test_listing_page_stays_within_query_budget(client, catalog):
+    # Total, page (with directors) and genres for the page
+    movie_count_cache.clear()
+    with query_budget(3):
+        response = client.get("/api/v1/movies?page_size=100")
+    assert response.status_code == 200
+    assert len(response.json()["data"]["items"]) == 100
@@ -0,0 +1,38 @@
+from sqlalchemy import insert
+
+from app.cache.caches import movie_count_cache
+from app.db.database import engine
+from app.models.movie import Movie
+
+
+def search(client, title):
+    movie_count_cache.clear()
+    response = client.get("/api/v1/movies", params={"title": title, "page_size": 100})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total_items"] == len(data["items"])
+    return sorted(item["title"] for item in data["items"])
+
+
+def test_title_search_sees_every_write(client):
+    genre_id = client.post("/api/v1/genres", json={"name": "Search genre"}).json()["data"]["id"]
+    director_id = client.post("/api/v1/directors", json={"name": "Search director"}).json()["data"]["id"]
+    movie = {"director_id": director_id, "release_year": 2005, "genres": [genre_id]}
+
+    first = client.post("/api/v1/movies", json=dict(movie, title="Quixotic Voyage")).json()["data"]["id"]
+    second = client.post("/api/v1/movies", json=dict(movie, title="Quixotic Return")).json()["data"]["id"]
+    assert search(client, "quixotic") == ["Quixotic Return", "Quixotic Voyage"]
+    # Short terms skip the trigram index
+    assert "Quixotic Voyage" in search(client, "Qu")
+
+    # Rows written outside the ORM are indexed too
+    with engine.begin() as conn:
+        conn.execute(insert(Movie.__table__), [
+            {"title": "Quixotic Core", "director_id": director_id, "release_year": 2006}
+        ])
+    assert search(client, "xotic c") == ["Quixotic Core"]
+
+    client.put(f"/api/v1/movies/{first}", json={"title": "Renamed Voyage"})
+    client.delete(f"/api/v1/movies/{second}")
+    assert search(client, "quixotic") == ["Quixotic Core"]
+    assert search(client, "renamed voy") == ["Renamed Voyage"]
@@ -0,0 +1,34 @@
+def test_bulk_ratings_report_invalid_items_by_index(client):
+    genre_id = client.post("/api/v1/genres", json={"name": "Bulk rating genre"}).json()["data"]["id"]
+    director_id = client.post("/api/v1/directors", json={"name": "Bulk rating director"}).json()["data"]["id"]
+    movie_id = client.post("/api/v1/movies", json={
+        "title": "Bulk rated movie", "director_id": director_id, "release_year": 2012, "genres": [genre_id]
+    }).json()["data"]["id"]
+
+    ratings = [
+        {"movie_id": movie_id, "score": 7},
+        {"movie_id": movie_id, "score": "great"},
+        {"movie_id": movie_id, "score": 11},
+        {"movie_id": 10 ** 6, "score": 5},
+        {"score": 5},
+        {"movie_id": movie_id, "score": 9},
+    ]
+    # More distinct ids than one IN query binds
+    ratings += [{"movie_id": 10 ** 6 + i, "score": 5} for i in range(1, 1201)]
+
+    response = client.post("/api/v1/ratings/bulk", json={"ratings": ratings})
+
+    assert response.status_code == 201
+    data = response.json()["data"]
+    assert data["received"] == len(ratings)
+    assert data["inserted"] == 2
+    failures = data["failures"]
+    assert [failure["index"] for failure in failures[:4]] == [1, 2, 3, 4]
+    assert failures[0]["error"].startswith("score:")
+    assert failures[1]["error"] == "Score must be an integer between 1 and 10"
+    assert failures[2]["error"] == f"Movie with id {10 ** 6} not found"
+    assert failures[3]["error"].startswith("movie_id:")
+    assert data["failed"] == len(ratings) - 2
+
+    movie = client.get(f"/api/v1/movies/{movie_id}").json()["data"]
+    assert movie["ratings_count"] == 2 and movie["average_rating"] == 8